@@ -1,8 +1,8 @@
-import fitz
+from page_cache import open_cached
 
 pdf_path = "/Users/alexlewis/Desktop/APPBUILDSANTIGRAVITY/MCB_Sales/A Supplier Pricing, Info & Brochures (Alex Website)/Creative External Blinds Pricing 07July2025.pdf"
 
-doc = fitz.open(pdf_path)
+doc = open_cached(pdf_path)
 
 print(f"Total Pages: {len(doc)}")
 
@@ -1,11 +1,11 @@
-import fitz  # PyMuPDF
+from page_cache import open_cached
 import sys
 import os
 
 def analyze_pdf(file_path):
     print(f"--- Analyzing {os.path.basename(file_path)} ---")
     try:
-        doc = fitz.open(file_path)
+        doc = open_cached(file_path)
         print(f"Pages: {len(doc)}")
         
         # Extract text from the first page
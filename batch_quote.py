@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Price a CSV of onsite measurements in one pass.
+
+Each row of the openings file is one opening:
+
+    room,width,drop,product,fabric,price_group,fullness,quantity,extras
+    Bed 1,1450,2100,Creative Recloth,,2,,1,Remote;Wall Bracket
+
+fabric resolves to its price group through the fabrics catalog (supplier and
+product category of the row's product); price_group gives a group code
+directly. extras are ';'-separated product_extras names. A blank quantity
+means 1. Products come from a
+products file (grid_export.py JSON Lines, external_grids.json, or compact
+grid_codec.py output).
+
+Rows are read in chunks, grouped by (product, price group, fullness) and each
+group is priced with one vectorised pricing.quote_batch() call. Priced line
+items are written in input order, with the bracket notes and warnings the
+quote tool shows:
+
+    python batch_quote.py job.csv --products external_grids.jsonl \\
+        --fabrics fabrics.csv --price-groups price_groups.csv --extras extras.csv -o job_priced.csv
+
+Output is CSV when -o ends in .csv, JSON Lines otherwise (default: stdout).
+"""
+
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+from collections import defaultdict
+from itertools import islice
+
+import numpy as np
+
+from bulk_load import read_rows
+from grid_codec import decode_pricing_data, read_products
+from pricing import GRID, batch_result, calculate_extra_price, calculate_price, quote_batch
+
+CHUNK_ROWS = 10000
+
+OUTPUT_FIELDS = [
+    "room", "product", "width", "drop", "quantity", "fabric", "price_group", "fullness",
+    "base_price", "extras", "extras_total", "unit_price", "line_total", "note", "warning",
+]
+
+
+def lookup_key(value):
+    """Lookup key: case and whitespace do not matter."""
+    return " ".join(str(value or "").split()).lower()
+
+
+class Catalog:
+    """Products, fabrics, price groups and extras, indexed for row lookups."""
+
+    def __init__(self, products, fabrics=(), price_groups=(), extras=()):
+        self.products = {}
+        for product in products:
+            product = dict(product, pricing_data=decode_pricing_data(product.get("pricing_data") or {}))
+            product.setdefault("pricing_type", GRID)
+            self.products[lookup_key(product["name"])] = product
+
+        self.fabrics = {}
+        for fabric in fabrics:
+            scope = (lookup_key(fabric.get("supplier")), lookup_key(fabric.get("product_category")))
+            self.fabrics[(scope, lookup_key(fabric["name"]))] = fabric
+            if fabric.get("brand"):
+                self.fabrics[(scope, lookup_key(f"{fabric['brand']} {fabric['name']}"))] = fabric
+
+        self.price_groups = {
+            (lookup_key(g.get("supplier")), lookup_key(g.get("category")), lookup_key(g["group_code"])): dict(
+                g, multiplier=float(g.get("multiplier") or 1.0))
+            for g in price_groups
+        }
+
+        self.extras = defaultdict(dict)
+        for extra in extras:
+            extra = dict(extra, price=float(extra.get("price") or 0))
+            self.extras[(lookup_key(extra.get("supplier")), lookup_key(extra.get("product_category")))][lookup_key(extra["name"])] = extra
+
+    def price_group(self, product, row):
+        """(price group dict or None, group code or None, warning or None) for a row."""
+        supplier, category = lookup_key(product.get("supplier")), lookup_key(product.get("category"))
+        code = row.get("price_group") or None
+        if not code and row.get("fabric"):
+            fabric = self.fabrics.get(((supplier, category), lookup_key(row["fabric"])))
+            if fabric is None:
+                return None, None, f"Unknown fabric: {row['fabric']}"
+            code = fabric.get("price_group")
+        if not code:
+            return None, None, None
+        # Fabrics store "Group 2" / "Grp 2" as often as "2"
+        code = str(code).strip()
+        for prefix in ("group", "grp"):
+            if code.lower().startswith(prefix):
+                code = code[len(prefix):].strip()
+        group = self.price_groups.get((supplier, category, lookup_key(code)))
+        return group or {"group_code": code, "multiplier": 1.0}, code, None
+
+    def extra(self, product, name):
+        return self.extras[(lookup_key(product.get("supplier")), lookup_key(product.get("category")))].get(lookup_key(name))
+
+
+def parse_measurement(value):
+    """Measurement from a CSV cell: int when whole, float otherwise, None if not a finite number."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def parse_quantity(value):
+    """(quantity, warning) from a CSV cell: 1 when blank, else a whole number of 0 or more."""
+    if value is None or not str(value).strip():
+        return 1, None
+    quantity = parse_measurement(value)
+    if not isinstance(quantity, int) or quantity < 0:
+        return 0, f"Quantity must be a whole number of 0 or more, not {value!r}"
+    return quantity, None
+
+
+def _resolve(catalog, row):
+    """(product, price group, code, warning) for a row."""
+    product = catalog.products.get(lookup_key(row.get("product")))
+    if product is None:
+        return None, None, None, f"Unknown product: {row.get('product')}"
+    group, code, warning = catalog.price_group(product, row)
+    return product, group, code, warning
+
+
+def price_chunk(catalog, rows):
+    """Priced line items for a list of opening rows, in the same order."""
+    results = [None] * len(rows)
+    batches = defaultdict(list)
+
+    for i, row in enumerate(rows):
+        product, group, code, warning = _resolve(catalog, row)
+        width, drop = parse_measurement(row.get("width")), parse_measurement(row.get("drop"))
+        quantity, quantity_warning = parse_quantity(row.get("quantity"))
+        if warning is None:
+            if width is None or width <= 0:
+                warning = "Width must be greater than 0"
+            elif drop is None or drop <= 0:
+                warning = "Drop must be greater than 0"
+            else:
+                warning = quantity_warning
+        results[i] = {"row": row, "product": product, "group": group, "code": code,
+                      "width": width, "drop": drop, "quantity": quantity, "warning": warning}
+        if warning is None:
+            key = (lookup_key(row.get("product")), code, row.get("fullness") or None)
+            batches[key].append(i)
+
+    for (_, _, fullness), indices in batches.items():
+        first = results[indices[0]]
+        product, group = first["product"], first["group"]
+        widths = np.array([results[i]["width"] for i in indices])
+        drops = np.array([results[i]["drop"] for i in indices])
+        if product["pricing_type"] == GRID:
+            quote = quote_batch(product, widths, drops, group, fullness)
+            for n, i in enumerate(indices):
+                results[i]["quote"] = batch_result(product, quote, n, widths, drops, group, fullness)
+        else:
+            for n, i in enumerate(indices):
+                results[i]["quote"] = calculate_price(product, widths[n], drops[n], group, fullness)
+
+    return [_line_item(catalog, r) for r in results]
+
+
+def _line_item(catalog, r):
+    row, product = r["row"], r["product"]
+    quote = r.get("quote") or {"price": 0, "warning": r["warning"]}
+    quantity = r["quantity"]
+    base_price = quote["price"]
+
+    extras, warnings = [], [quote["warning"]] if quote.get("warning") else []
+    names = (n.strip() for n in (row.get("extras") or "").split(";")) if product else ()
+    for name in filter(None, names):
+        extra = catalog.extra(product, name)
+        if extra is None:
+            warnings.append(f"Unknown extra: {name}")
+            continue
+        extras.append({"name": extra["name"],
+                       "price": round(calculate_extra_price(extra, base_price, r["width"] or 0, r["drop"] or 0), 2)})
+
+    extras_total = sum(e["price"] for e in extras)
+    unit_price = base_price + extras_total if not quote.get("warning") else 0
+    return {
+        "room": row.get("room"),
+        "product": product["name"] if product else row.get("product"),
+        "width": r["width"],
+        "drop": r["drop"],
+        "quantity": quantity,
+        "fabric": row.get("fabric") or None,
+        "price_group": r["code"],
+        "fullness": row.get("fullness") or None,
+        "base_price": round(base_price, 2),
+        "extras": extras,
+        "extras_total": round(extras_total, 2),
+        "unit_price": round(unit_price, 2),
+        "line_total": round(unit_price * quantity, 2),
+        "note": quote.get("note"),
+        "warning": "; ".join(warnings) or None,
+    }
+
+
+def price_openings(catalog, rows, chunk_rows=CHUNK_ROWS):
+    """Yield priced line items for an iterable of opening rows, chunk by chunk."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield from price_chunk(catalog, chunk)
+
+
+def write_line_items(items, out):
+    """Write items to out as CSV (.csv) or JSON Lines ('-' for stdout). Returns (count, total, warnings)."""
+    stream = sys.stdout if out == "-" else open(out, "w", newline="", encoding="utf-8")
+    as_csv = out.lower().endswith(".csv")
+    writer = csv.DictWriter(stream, OUTPUT_FIELDS) if as_csv else None
+    if writer:
+        writer.writeheader()
+    count, total, warnings = 0, 0.0, 0
+    try:
+        for item in items:
+            if writer:
+                writer.writerow(dict(item, extras=";".join(f"{e['name']}={e['price']:.2f}" for e in item["extras"])))
+            else:
+                stream.write(json.dumps(item, separators=(",", ":")) + "\n")
+            count += 1
+            total += item["line_total"]
+            warnings += item["warning"] is not None
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return count, total, warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price a CSV of openings against the catalog.")
+    parser.add_argument("openings", help="Openings CSV (room, width, drop, product, fabric/price_group, extras)")
+    parser.add_argument("--products", required=True, help="Products file (JSON array or JSON Lines)")
+    parser.add_argument("--fabrics", help="fabrics rows (.csv or .jsonl)")
+    parser.add_argument("--price-groups", help="price_groups rows (.csv or .jsonl)")
+    parser.add_argument("--extras", help="product_extras rows (.csv or .jsonl)")
+    parser.add_argument("-o", "--out", default="-", help="Output .csv or .jsonl (default: JSON Lines to stdout)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    catalog = Catalog(
+        read_products(args.products),
+        read_rows(args.fabrics) if args.fabrics else (),
+        read_rows(args.price_groups) if args.price_groups else (),
+        read_rows(args.extras) if args.extras else (),
+    )
+    with open(args.openings, newline="", encoding="utf-8-sig") as f:
+        count, total, warnings = write_line_items(price_openings(catalog, csv.DictReader(f)), args.out)
+
+    print(f"Priced {count} openings (total ${total:,.2f}, {warnings} with warnings) "
+          f"in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Benchmark the extraction pipeline stage by stage.
+
+Runs each extractor layout over a fixed, generated corpus of synthetic grid
+pages and times every stage separately:
+
+    open     fitz.open + loading each page
+    words    page.get_text("words", sort=True)
+    rows     row_clustering.cluster_rows
+    header   classify_tokens + find_header_row
+    grid     build_grid (extract_grid_groups for the grouped layout)
+    write    workbook_io.write_workbook of the extracted sheets
+
+Extractors model the layouts the process_* scripts handle: one grid per page
+(NBS batch books), split left/right grids (NBS rollers) and stacked price
+group grids (Creative external). Each reports pages/second and peak Python
+memory (tracemalloc, measured in a separate pass so it does not skew the
+timings). Results are JSON, keyed by commit, so two runs can be compared:
+
+    python bench_extraction.py                          # -> bench_results/<commit>.json
+    python bench_extraction.py --pages 200 --repeat 5
+    python bench_extraction.py --compare bench_results/abc123.json bench_results/def456.json
+
+--compare exits non-zero when an extractor lost more than --threshold of its
+pages/second.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import fitz
+
+from grid_extraction import (build_grid, classify_tokens, extract_grid_groups, find_header_row,
+                             grid_to_dataframe, words_to_arrays)
+from row_clustering import cluster_rows
+from workbook_io import write_workbook
+
+CORPUS_VERSION = 1
+RESULTS_DIR = "bench_results"
+STAGES = ["open", "words", "rows", "header", "grid", "write"]
+
+# Split grids are cut at this x, as process_nbs_rollers_deep.py does
+SPLIT_X = 425
+
+WIDTHS = list(range(600, 3001, 200))
+DROPS = list(range(1000, 3001, 200))
+
+
+def _draw_grid(page, x, y, widths, drops, rng, col_width=26, row_height=13):
+    """Width header then one drop row per drop, prices rising with size."""
+    for c, w in enumerate(widths):
+        page.insert_text((x + (c + 1) * col_width, y), str(w), fontsize=7)
+    for r, d in enumerate(drops, start=1):
+        page.insert_text((x, y + r * row_height), str(d), fontsize=7)
+        for c, w in enumerate(widths):
+            price = 80 + w // 20 + d // 25 + rng.randint(0, 9)
+            page.insert_text((x + (c + 1) * col_width, y + r * row_height), f"${price}", fontsize=7)
+    return y + (len(drops) + 1) * row_height
+
+
+def build_corpus(path, pages_per_layout, seed=0):
+    """Write the synthetic corpus: pages_per_layout pages of each layout, in blocks."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for n in range(pages_per_layout):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((40, 40), f"Roller Blind - Blockout  Grid {n + 1}", fontsize=11)
+        _draw_grid(page, 40, 80, WIDTHS, DROPS, rng)
+    for n in range(pages_per_layout):
+        page = doc.new_page(width=842, height=595)
+        page.insert_text((40, 30), f"Roller Blinds  Page {n + 1}", fontsize=11)
+        _draw_grid(page, 30, 70, WIDTHS[:12], DROPS, rng, col_width=29)
+        _draw_grid(page, SPLIT_X + 10, 70, WIDTHS[:12], DROPS, rng, col_width=29)
+    for n in range(pages_per_layout):
+        page = doc.new_page(width=595, height=842)
+        y = 40
+        for group in range(1, 5):
+            page.insert_text((40, y), f"Zip-Group-0{group}", fontsize=9)
+            y = _draw_grid(page, 40, y + 18, WIDTHS, DROPS[:8], rng) + 20
+    doc.save(path)
+    doc.close()
+
+
+def corpus_path(pages_per_layout):
+    """Build the corpus on first use; it is deterministic, so it is reused."""
+    path = os.path.join(tempfile.gettempdir(), f"mcb_bench_corpus_v{CORPUS_VERSION}_{pages_per_layout}.pdf")
+    if not os.path.exists(path):
+        build_corpus(path, pages_per_layout)
+    return path
+
+
+def _single(words, timings):
+    """One grid per page (the NBS batch books)."""
+    return [grid for grid in [_staged_grid(words, timings)] if grid is not None]
+
+
+def _split(words, timings):
+    """Left and right grids (NBS rollers)."""
+    left = [w for w in words if w[2] < SPLIT_X]
+    right = [w for w in words if w[0] > SPLIT_X]
+    return [grid for grid in (_staged_grid(left, timings), _staged_grid(right, timings)) if grid is not None]
+
+
+def _grouped(words, timings):
+    """Stacked Group-NN grids (Creative external)."""
+    boxes, text = words_to_arrays(words)
+    start = time.perf_counter()
+    spans = cluster_rows(boxes)
+    timings["rows"] += time.perf_counter() - start
+    start = time.perf_counter()
+    is_int, _, values = classify_tokens(text[spans.order])
+    find_header_row(spans.row_ids, is_int, values, len(spans.starts))
+    timings["header"] += time.perf_counter() - start
+    start = time.perf_counter()
+    groups = extract_grid_groups(words)
+    timings["grid"] += time.perf_counter() - start
+    return [grid for _, grid in groups]
+
+
+def _staged_grid(words, timings):
+    """extract_grid, with each stage timed into timings."""
+    boxes, text = words_to_arrays(words)
+    if len(text) == 0:
+        return None
+    start = time.perf_counter()
+    spans = cluster_rows(boxes)
+    timings["rows"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    is_int, is_number, values = classify_tokens(text[spans.order])
+    header, widths = find_header_row(spans.row_ids, is_int, values, len(spans.starts))
+    timings["header"] += time.perf_counter() - start
+    if header < 0:
+        return None
+
+    start = time.perf_counter()
+    grid = build_grid(spans.row_ids, is_number, values, header, widths)
+    timings["grid"] += time.perf_counter() - start
+    return grid
+
+
+# name -> (layout block in the corpus, extractor)
+EXTRACTORS = {
+    "single_grid": (0, _single),
+    "split_grids": (1, _split),
+    "grouped_grids": (2, _grouped),
+}
+
+
+def run_extractor(pdf_path, pages, extract, out_dir):
+    """Run one extractor over pages; returns ({stage: seconds}, grids found)."""
+    timings = dict.fromkeys(STAGES, 0.0)
+
+    start = time.perf_counter()
+    doc = fitz.open(pdf_path)
+    loaded = [doc[i] for i in pages]
+    timings["open"] = time.perf_counter() - start
+
+    sheets = {}
+    for i, page in zip(pages, loaded):
+        start = time.perf_counter()
+        words = page.get_text("words", sort=True)
+        timings["words"] += time.perf_counter() - start
+        for n, grid in enumerate(extract(words, timings), start=1):
+            sheets[f"P{i + 1} Grid {n}"] = grid
+    doc.close()
+
+    start = time.perf_counter()
+    out = os.path.join(out_dir, "bench.xlsx")
+    if os.path.exists(out):
+        os.remove(out)
+    with contextlib.redirect_stdout(io.StringIO()):
+        write_workbook(out, {name: grid_to_dataframe(grid) for name, grid in sheets.items()})
+    timings["write"] = time.perf_counter() - start
+    return timings, len(sheets)
+
+
+def peak_memory(pdf_path, pages, extract, out_dir):
+    """Peak Python allocation (bytes) of one extractor run."""
+    tracemalloc.start()
+    try:
+        run_extractor(pdf_path, pages, extract, out_dir)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def benchmark(pages_per_layout=50, repeat=3):
+    """Results dict for every extractor (best of repeat runs per stage)."""
+    pdf_path = corpus_path(pages_per_layout)
+    results = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "pymupdf": fitz.VersionBind,
+        "corpus": {"version": CORPUS_VERSION, "pages_per_extractor": pages_per_layout},
+        "extractors": {},
+    }
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name, (block, extract) in EXTRACTORS.items():
+            pages = list(range(block * pages_per_layout, (block + 1) * pages_per_layout))
+            runs = [run_extractor(pdf_path, pages, extract, out_dir) for _ in range(repeat)]
+            stages = {stage: min(timings[stage] for timings, _ in runs) for stage in STAGES}
+            total = sum(stages.values())
+            results["extractors"][name] = {
+                "pages": len(pages),
+                "grids": runs[0][1],
+                "stages": {stage: round(seconds, 6) for stage, seconds in stages.items()},
+                "total_seconds": round(total, 6),
+                "pages_per_second": round(len(pages) / total, 2) if total else None,
+                "peak_memory_bytes": peak_memory(pdf_path, pages, extract, out_dir),
+            }
+    results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return results
+
+
+def compare(base, head, threshold):
+    """Print a per-extractor, per-stage comparison; returns the extractors that regressed."""
+    regressed = []
+    print(f"{'extractor':15} {'stage':8} {base['commit']:>12} {head['commit']:>12}  change")
+    for name, new in head["extractors"].items():
+        old = base["extractors"].get(name)
+        if old is None:
+            continue
+        for stage in STAGES:
+            before, after = old["stages"][stage], new["stages"][stage]
+            change = f"{after / before - 1:+.0%}" if before else ""
+            print(f"{name:15} {stage:8} {before * 1000:10.2f}ms {after * 1000:10.2f}ms  {change}")
+        before, after = old["pages_per_second"], new["pages_per_second"]
+        print(f"{name:15} {'pages/s':8} {before:12.1f} {after:12.1f}  {after / before - 1:+.0%}")
+        if after < before * (1 - threshold):
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline per stage.")
+    parser.add_argument("--pages", type=int, default=50, help="Synthetic pages per extractor (default: 50)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per extractor; best time per stage is kept")
+    parser.add_argument("-o", "--out", help=f"Results JSON (default: {RESULTS_DIR}/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="Compare two results files")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Pages/second loss that counts as a regression (default: 0.2)")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+        with open(args.compare[1]) as f:
+            head = json.load(f)
+        regressed = compare(base, head, args.threshold)
+        if regressed:
+            print(f"Regressed: {', '.join(regressed)}")
+            return 1
+        return 0
+
+    results = benchmark(args.pages, args.repeat)
+    for name, r in results["extractors"].items():
+        stages = " ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in r["stages"].items())
+        print(f"{name:15} {r['pages_per_second']:8.1f} pages/s  peak {r['peak_memory_bytes'] / 2**20:6.1f} MiB  "
+              f"{r['grids']} grids  {stages}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Bulk-load extraction output into the products, product_extras and fabrics tables.
+
+Catalog data used to reach the database as hand-written INSERT ... VALUES
+migrations and single-row UPDATE statements. This loader takes extraction
+output (JSON Lines from grid_export.py, or CSV / JSON Lines rows for extras
+and fabrics) and upserts it per table in two set-based statements:
+
+    1. COPY the rows into a temporary staging table shaped like the target
+       (duplicates on the natural key collapse to the last row).
+    2. UPDATE matching rows FROM the staging table, then INSERT the rest.
+
+Rows are matched on their natural key, with plain equality so Postgres can
+hash-join the staging table against the target. Key columns that may be
+NULL are compared as coalesce(column, ''), the expression the unique indexes
+of --init-schema are built on:
+
+    products        supplier, category, name
+    product_extras  coalesce(supplier, ''), product_category, name
+    fabrics         supplier, coalesce(product_category, ''), name
+
+Everything runs in one transaction: a failed load leaves the tables as they
+were. Loaded rows are marked is_active = true.
+
+    python bulk_load.py --products external_grids.jsonl --extras extras.csv
+    python bulk_load.py --dsn postgresql://localhost/scratch --init-schema --fabrics fabrics.csv
+
+The connection string comes from --dsn or DATABASE_URL. --init-schema creates
+minimal copies of the three tables, for a local throwaway Postgres only.
+Requires psycopg (v3).
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from itertools import chain
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+# nullable_keys: natural key columns that may be NULL (matched through coalesce)
+TableSpec = namedtuple("TableSpec", ["table", "keys", "columns", "json_columns", "nullable_keys"])
+
+TABLES = {
+    "products": TableSpec(
+        "products",
+        ("supplier", "category", "name"),
+        ("supplier", "category", "name", "pricing_type", "pricing_data"),
+        ("pricing_data",),
+        (),
+    ),
+    "product_extras": TableSpec(
+        "product_extras",
+        ("supplier", "product_category", "name"),
+        ("supplier", "product_category", "name", "extra_category", "price", "price_type", "notes"),
+        (),
+        ("supplier",),
+    ),
+    "fabrics": TableSpec(
+        "fabrics",
+        ("supplier", "product_category", "name"),
+        ("supplier", "product_category", "name", "brand", "price_group", "category"),
+        (),
+        ("product_category",),
+    ),
+}
+
+# Minimal tables for a throwaway database (--init-schema); production uses the Supabase schema
+LOCAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    supplier text NOT NULL,
+    category text NOT NULL,
+    name text NOT NULL,
+    pricing_type text NOT NULL DEFAULT 'grid',
+    pricing_data jsonb,
+    quote_config jsonb,
+    is_active boolean DEFAULT true
+);
+CREATE TABLE IF NOT EXISTS product_extras (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    supplier text,
+    product_category text NOT NULL,
+    extra_category text,
+    name text NOT NULL,
+    price numeric,
+    price_type text,
+    notes text,
+    is_nett boolean DEFAULT false,
+    is_active boolean DEFAULT true
+);
+CREATE TABLE IF NOT EXISTS fabrics (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    supplier text NOT NULL,
+    brand text,
+    name text NOT NULL,
+    price_group text,
+    category text,
+    product_category text,
+    is_active boolean DEFAULT true
+);
+CREATE UNIQUE INDEX IF NOT EXISTS products_natural_key ON products (supplier, category, name);
+CREATE UNIQUE INDEX IF NOT EXISTS product_extras_natural_key
+    ON product_extras ((coalesce(supplier, '')), product_category, name);
+CREATE UNIQUE INDEX IF NOT EXISTS fabrics_natural_key ON fabrics (supplier, (coalesce(product_category, '')), name);
+"""
+
+
+def read_rows(path):
+    """Rows (dicts) from a .csv file or a JSON Lines file, read lazily."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _key_expr(spec, alias, key):
+    column = f"{alias}.{key}" if alias else key
+    return f"coalesce({column}, '')" if key in spec.nullable_keys else column
+
+
+def _key_match(spec, left, right):
+    return " AND ".join(f"{_key_expr(spec, left, k)} = {_key_expr(spec, right, k)}" for k in spec.keys)
+
+
+def merge_statements(spec, columns, stage):
+    """SQL for: dedupe the staging table, update matches, insert the rest."""
+    cols = ", ".join(columns)
+    partition = ", ".join(_key_expr(spec, None, k) for k in spec.keys)
+    updates = ", ".join([f"{c} = s.{c}" for c in columns if c not in spec.keys] + ["is_active = true"])
+    return [
+        # Last row wins when the input repeats a natural key
+        f"DELETE FROM {stage} s USING (SELECT _seq, row_number() OVER "
+        f"(PARTITION BY {partition} ORDER BY _seq DESC) AS n FROM {stage}) d "
+        f"WHERE s._seq = d._seq AND d.n > 1",
+        f"UPDATE {spec.table} t SET {updates} FROM {stage} s "
+        f"WHERE {_key_match(spec, 't', 's')}",
+        f"INSERT INTO {spec.table} ({cols}, is_active) SELECT {cols}, true FROM {stage} s "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {spec.table} t WHERE {_key_match(spec, 't', 's')})",
+    ]
+
+
+def load_table(cur, spec, rows):
+    """
+    COPY rows into a staging table and merge them into spec.table.
+    Returns (rows staged, rows updated, rows inserted).
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0, 0, 0
+
+    missing = [k for k in spec.keys if k not in first]
+    if missing:
+        raise ValueError(f"{spec.table}: rows are missing natural key column(s) {', '.join(missing)}")
+    # Only columns the input provides are written; the rest keep their current values
+    columns = [c for c in spec.columns if c in first]
+
+    stage = f"_stage_{spec.table}"
+    cur.execute(
+        f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+        f"SELECT {', '.join(columns)} FROM {spec.table} WITH NO DATA"
+    )
+    cur.execute(f"ALTER TABLE {stage} ADD COLUMN _seq bigserial")
+
+    staged = 0
+    with cur.copy(f"COPY {stage} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in chain([first], rows):
+            values = []
+            for c in columns:
+                value = row.get(c)
+                if c in spec.json_columns and value is not None and not isinstance(value, str):
+                    value = json.dumps(value, separators=(",", ":"))
+                elif value == "":
+                    value = None
+                values.append(value)
+            copy.write_row(values)
+            staged += 1
+    # A fresh temp table has no statistics; without them the planner guesses its size
+    cur.execute(f"ANALYZE {stage}")
+
+    dedupe, update, insert = merge_statements(spec, columns, stage)
+    cur.execute(dedupe)
+    cur.execute(update)
+    updated = cur.rowcount
+    cur.execute(insert)
+    inserted = cur.rowcount
+    return staged, updated, inserted
+
+
+def bulk_load(dsn, sources, init_schema=False):
+    """
+    Load {table name: iterable of row dicts} in one transaction.
+    Returns {table name: (staged, updated, inserted)}.
+    """
+    if psycopg is None:
+        raise RuntimeError("bulk_load needs psycopg: pip install 'psycopg[binary]'")
+
+    results = {}
+    with psycopg.connect(dsn) as conn:
+        with conn.transaction(), conn.cursor() as cur:
+            if init_schema:
+                cur.execute(LOCAL_SCHEMA)
+            for name, rows in sources.items():
+                results[name] = load_table(cur, TABLES[name], rows)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-upsert products, product_extras and fabrics.")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Postgres connection string")
+    parser.add_argument("--products", help="Products JSON Lines (grid_export.py output)")
+    parser.add_argument("--extras", help="product_extras rows (.csv or .jsonl)")
+    parser.add_argument("--fabrics", help="fabrics rows (.csv or .jsonl)")
+    parser.add_argument("--init-schema", action="store_true", help="Create minimal tables (throwaway databases only)")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("Set --dsn or DATABASE_URL")
+    sources = {
+        name: read_rows(path)
+        for name, path in (("products", args.products), ("product_extras", args.extras), ("fabrics", args.fabrics))
+        if path
+    }
+    if not sources:
+        parser.error("Nothing to load: give --products, --extras and/or --fabrics")
+
+    start = time.perf_counter()
+    try:
+        results = bulk_load(args.dsn, sources, args.init_schema)
+    except Exception as e:
+        print(f"Load failed, nothing was changed: {e}")
+        return 1
+
+    for name, (staged, updated, inserted) in results.items():
+        print(f"{name}: {staged} rows staged, {updated} updated, {inserted} inserted")
+    print(f"Committed in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Cross-supplier comparison: price every opening against every equivalent product.
+
+An equivalence mapping (JSON) names interchangeable ranges:
+
+    {"Roller Blockout": ["NBS Roller Blind - Blockout", "Creative Internal Blinds - Roller"],
+     "External Straight Drop": ["Creative Straight Drop (Crank/Strap)", "Creative Veue Straight Drop"]}
+
+and each row of the openings CSV says which range it wants:
+
+    room,width,drop,range,price_group,fullness
+    Bed 1,1450,2100,Roller Blockout,2,
+
+Every product's grids are stacked into one padded array, so the whole
+openings x products matrix is priced in a single broadcast lookup (next
+highest bracket on both axes, price group multipliers applied). A product is
+a candidate when it belongs to the opening's range and the size is on its
+grid. The report gives the cheapest and second-cheapest candidate per opening:
+
+    python compare_products.py openings.csv --products products.jsonl --ranges ranges.json \\
+        --price-groups price_groups.csv -o comparison.csv --matrix matrix.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from batch_quote import Catalog, lookup_key, parse_measurement
+from bulk_load import read_rows
+from grid_codec import read_products
+from pricing import GRID, active_grid, calculate_price, grid_array
+
+StackedGrids = namedtuple("StackedGrids", ["names", "width_bounds", "drop_bounds", "prices", "variants"])
+
+CHUNK_ROWS = 4096
+
+
+def _padded_bounds(steps, size):
+    """Running maximum of steps, padded with +inf to size (so a count of bounds < value bisects)."""
+    out = np.full(size, np.inf)
+    if len(steps):
+        out[:len(steps)] = np.maximum.accumulate(np.asarray(steps, dtype=float))
+    return out
+
+
+def stack_grids(catalog, products, variants):
+    """
+    Stack the active grid of every product for every (price group, fullness)
+    variant into prices[product, variant, drop, width], +inf where a product
+    has no price. Steps are padded with +inf bounds and every cell past a
+    product's last step is +inf, so an out-of-range opening prices at +inf.
+    """
+    grids = [p["pricing_data"] for p in products]
+    max_w = max((len(g.get("width_steps") or []) for g in grids), default=0)
+    max_d = max((len(g.get("drop_steps") or []) for g in grids), default=0)
+
+    width_bounds = np.stack([_padded_bounds(g.get("width_steps") or [], max_w) for g in grids])
+    drop_bounds = np.stack([_padded_bounds(g.get("drop_steps") or [], max_d) for g in grids])
+    # One extra row/column so lookups past the widest/deepest product stay in bounds
+    prices = np.full((len(products), len(variants), max_d + 1, max_w + 1), np.inf)
+
+    for p, product in enumerate(products):
+        if product.get("pricing_type") != GRID:
+            continue
+        for v, (code, fullness) in enumerate(variants):
+            group, _, _ = catalog.price_group(product, {"price_group": code})
+            selected = active_grid(product, group, fullness)
+            if selected.warning:
+                continue
+            cells = grid_array(selected.grid)
+            if not selected.drop_major:
+                cells = cells.T
+            # Rows or columns beyond the product's own steps are never looked up
+            n_drops, n_widths = len(product["pricing_data"]["drop_steps"]), len(product["pricing_data"]["width_steps"])
+            rows, cols = min(cells.shape[0], n_drops), min(cells.shape[1], n_widths)
+            block = cells[:rows, :cols] * selected.multiplier
+            # calculatePrice's "|| 0" prices a missing cell at 0; for a comparison that means "not offered"
+            block[~(block > 0)] = np.inf
+            prices[p, v, :rows, :cols] = block
+
+    return StackedGrids([p["name"] for p in products], width_bounds, drop_bounds, prices, variants)
+
+
+def price_matrix(stacked, widths, drops, variant_index):
+    """
+    [openings, products] prices in one broadcast lookup, +inf where a product
+    cannot price the opening.
+    """
+    widths = np.asarray(widths, dtype=float)
+    drops = np.asarray(drops, dtype=float)
+    # Number of bounds below the value == bisect_left == the "next highest" index
+    w_idx = (stacked.width_bounds[None, :, :] < widths[:, None, None]).sum(axis=2)
+    d_idx = (stacked.drop_bounds[None, :, :] < drops[:, None, None]).sum(axis=2)
+    products = np.arange(len(stacked.names))[None, :]
+    return stacked.prices[products, np.asarray(variant_index)[:, None], d_idx, w_idx]
+
+
+def cheapest_two(matrix, eligible):
+    """(first index, first price, second index, second price) per row; -1 / inf where none."""
+    masked = np.where(eligible, matrix, np.inf)
+    if masked.shape[1] < 2:
+        masked = np.pad(masked, ((0, 0), (0, 2 - masked.shape[1])), constant_values=np.inf)
+    order = np.argpartition(masked, 1, axis=1)[:, :2]
+    pair = np.take_along_axis(masked, order, axis=1)
+    swap = pair[:, 1] < pair[:, 0]
+    order[swap] = order[swap][:, ::-1]
+    pair[swap] = pair[swap][:, ::-1]
+    order[~np.isfinite(pair)] = -1
+    return order[:, 0], pair[:, 0], order[:, 1], pair[:, 1]
+
+
+class Comparison:
+    """Openings priced against every product of an equivalence mapping."""
+
+    def __init__(self, catalog, ranges, variants):
+        names = list(dict.fromkeys(name for members in ranges.values() for name in members))
+        missing = [name for name in names if lookup_key(name) not in catalog.products]
+        if missing:
+            raise ValueError(f"Products not in the catalog: {', '.join(missing)}")
+        self.products = [catalog.products[lookup_key(name)] for name in names]
+        self.ranges = {lookup_key(r): np.array([name in members for name in names]) for r, members in ranges.items()}
+        self.variants = {v: i for i, v in enumerate(variants)}
+        self.stacked = stack_grids(catalog, self.products, list(variants))
+        # Non-grid products (sqm) are priced per opening
+        self.loose = [p for p, product in enumerate(self.products) if product.get("pricing_type") != GRID]
+        self.catalog = catalog
+
+    def compare(self, rows):
+        """(matrix, eligible mask, cheapest_two result) for a list of opening rows."""
+        widths = np.array([parse_measurement(r.get("width")) or 0 for r in rows], dtype=float)
+        drops = np.array([parse_measurement(r.get("drop")) or 0 for r in rows], dtype=float)
+        variant = [self.variants[(r.get("price_group") or None, r.get("fullness") or None)] for r in rows]
+        eligible = np.stack([self.ranges.get(lookup_key(r.get("range")), np.zeros(len(self.products), bool))
+                             for r in rows]) if rows else np.zeros((0, len(self.products)), bool)
+
+        matrix = price_matrix(self.stacked, widths, drops, variant)
+        for p in self.loose:
+            for i, row in enumerate(rows):
+                group, _, _ = self.catalog.price_group(self.products[p], row)
+                result = calculate_price(self.products[p], widths[i], drops[i], group, row.get("fullness") or None)
+                matrix[i, p] = result["price"] if result["price"] > 0 and not result.get("warning") else np.inf
+        eligible &= widths[:, None] > 0
+        eligible &= drops[:, None] > 0
+        return matrix, eligible, cheapest_two(matrix, eligible)
+
+
+def _money(value):
+    return round(float(value), 2) if np.isfinite(value) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cheapest equivalent product per opening.")
+    parser.add_argument("openings", help="Openings CSV (room, width, drop, range, price_group, fullness)")
+    parser.add_argument("--products", required=True, help="Products file (JSON array or JSON Lines)")
+    parser.add_argument("--ranges", required=True, help="Equivalence mapping JSON: {range: [product names]}")
+    parser.add_argument("--price-groups", help="price_groups rows (.csv or .jsonl)")
+    parser.add_argument("-o", "--out", default="-", help="Comparison CSV (default: stdout)")
+    parser.add_argument("--matrix", help="Also write the full openings x products price matrix (CSV)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    catalog = Catalog(read_products(args.products),
+                      price_groups=read_rows(args.price_groups) if args.price_groups else ())
+    with open(args.ranges, encoding="utf-8") as f:
+        ranges = json.load(f)
+    with open(args.openings, newline="", encoding="utf-8-sig") as f:
+        openings = list(csv.DictReader(f))
+    variants = dict.fromkeys((r.get("price_group") or None, r.get("fullness") or None) for r in openings)
+    try:
+        comparison = Comparison(catalog, ranges, variants)
+    except ValueError as e:
+        parser.error(str(e))
+    names = [p["name"] for p in comparison.products]
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    matrix_out = open(args.matrix, "w", newline="", encoding="utf-8") if args.matrix else None
+    try:
+        writer = csv.writer(out)
+        writer.writerow(["room", "width", "drop", "range", "price_group",
+                         "cheapest", "cheapest_price", "second", "second_price", "saving"])
+        matrix_writer = csv.writer(matrix_out) if matrix_out else None
+        if matrix_writer:
+            matrix_writer.writerow(["room", "width", "drop", "range", *names])
+
+        for offset in range(0, len(openings), CHUNK_ROWS):
+            rows = openings[offset:offset + CHUNK_ROWS]
+            matrix, eligible, (first, first_price, second, second_price) = comparison.compare(rows)
+            for i, row in enumerate(rows):
+                cheap, runner = _money(first_price[i]), _money(second_price[i])
+                writer.writerow([row.get("room"), row.get("width"), row.get("drop"), row.get("range"),
+                                 row.get("price_group"),
+                                 names[first[i]] if first[i] >= 0 else "", cheap,
+                                 names[second[i]] if second[i] >= 0 else "", runner,
+                                 round(runner - cheap, 2) if cheap is not None and runner is not None else None])
+                if matrix_writer:
+                    matrix_writer.writerow([row.get("room"), row.get("width"), row.get("drop"), row.get("range"),
+                                            *(_money(v) if e else None for v, e in zip(matrix[i], eligible[i]))])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if matrix_out:
+            matrix_out.close()
+
+    print(f"Compared {len(openings)} openings x {len(names)} products in {time.perf_counter() - start:.2f}s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Dump the text of supplier PDFs to *_text.txt files, in parallel.
+
+Each dump keeps the usual layout, one block per page:
+
+    --- Page N ---
+    <page.get_text("text")>
+    <blank line>
+
+and gets a sidecar index (<dump>.index.json) with the byte offset of every
+page block and of every section heading found in it ("Roman Blinds - Fabric
+Grouping", outline entries from doc.get_toc(), ...), so readers can seek
+straight to a page or a section instead of scanning the whole file:
+
+    text = read_page_text("creative_internal_text.txt", 14)
+    for section in find_sections("creative_internal_text.txt", "Fabric Grouping"):
+        print(section["title"], section["page"])
+
+Usage:
+
+    python dump_text.py                      # every book in DUMPS
+    python dump_text.py book.pdf other.pdf   # any PDFs -> <name>_text.txt
+    python dump_text.py --reindex *_text.txt # index existing dumps only
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from page_cache import atomic_write, file_hash, open_cached
+
+BASE_PATH = "A Supplier Pricing, Info & Brochures (Alex Website)"
+
+# (source PDF, dump file) for every book the other scripts read
+DUMPS = [
+    ("Creative Internal Blinds Pricing 07July2025.pdf", "creative_internal_text.txt"),
+    ("Creative External Blinds Pricing 07July2025.pdf", "external_blinds_text.txt"),
+    ("Creative Curtains Pricing Jun25.pdf", "creative_curtains_text.txt"),
+    ("Creative Doors Fly Screen & Security Door Pricing 2024.pdf", "flyscreen_security_text.txt"),
+    ("Creative Doors Invisi-Gard Security Door Pricing 2024.pdf", "invisi_gard_text.txt"),
+    ("NBS Honeycomb Blinds (Arena) Pricing Mar2025.pdf", "nbs_honeycomb_text.txt"),
+    ("NBS Roller Blinds (Blockout & Screens) Mar2025.pdf", "nbs_roller_blinds_text.txt"),
+    ("NBS Plantation Shutters Pricing (PVC, Timber & Aluminium) Mar2025.pdf", "nbs_shutters_text.txt"),
+    ("NBS Aluminium Venetians 25mm & 50mm Pricing Mar2025.pdf", "nbs_alu_venetians_text.txt"),
+    ("NBS PVC Venetian (Tuscany) Pricing Mar2025.pdf", "nbs_pvc_venetians_text.txt"),
+    ("NBS Woodlike Venetians (Urbanwood) Mar2025.pdf", "nbs_woodlike_venetians_text.txt"),
+    ("Tate Volitakis Installation Rates Pricing 01Nov2025.pdf", "tate_volitakis_text.txt"),
+]
+
+# "Roman Blinds - Fabric Grouping", "Roller - Fabric Grouping  (July 2025)", ...
+HEADING_PATTERN = re.compile(r"^[A-Za-z][\w&/()'.,+ ]*?\s+-\s+[A-Za-z][\w&/()'.,+ ]*$")
+MAX_HEADING_LENGTH = 80
+
+INDEX_SUFFIX = ".index.json"
+
+PAGE_MARKER = re.compile(rb"^--- Page (\d+) ---\n$")
+
+
+def is_heading(line):
+    line = line.strip()
+    return len(line) <= MAX_HEADING_LENGTH and HEADING_PATTERN.match(line) is not None
+
+
+def _normalize(title):
+    """Lower-case with runs of whitespace collapsed ('Panel Glides -  Fabric' == 'Panel Glides - Fabric')."""
+    return " ".join(title.split()).lower()
+
+
+def index_path(text_path):
+    return text_path + INDEX_SUFFIX
+
+
+def dump_pdf(pdf_path, output_path):
+    """
+    Write the text dump of one PDF and its sidecar index.
+    Returns (output_path, page count, section count).
+    """
+    pages = []
+    sections = []
+    offset = 0
+    chunks = []
+
+    with open_cached(pdf_path) as doc:
+        toc_pages = {}
+        for _, title, page in doc.get_toc():
+            toc_pages.setdefault(page, []).append(title.strip())
+
+        for i, page in enumerate(doc):
+            marker = f"--- Page {i+1} ---\n".encode("utf-8")
+            page_start = offset
+            chunks.append(marker)
+            offset += len(marker)
+
+            for title in toc_pages.get(i + 1, []):
+                sections.append({"title": title, "page": i + 1, "offset": page_start, "source": "toc"})
+
+            # Split on "\n" only, exactly as index_dump() reads the file back
+            for data in io.BytesIO(page.get_text("text").encode("utf-8")):
+                line = data.decode("utf-8")
+                if is_heading(line):
+                    sections.append({"title": line.strip(), "page": i + 1, "offset": offset, "source": "text"})
+                chunks.append(data)
+                offset += len(data)
+
+            chunks.append(b"\n\n")
+            offset += 2
+            pages.append({"page": i + 1, "offset": page_start, "length": offset - page_start})
+
+    atomic_write(output_path, b"".join(chunks))
+    index = {
+        "source": os.path.basename(pdf_path),
+        "source_sha256": file_hash(pdf_path),
+        "pages": pages,
+        "sections": sections,
+    }
+    atomic_write(index_path(output_path), json.dumps(index, indent=1).encode("utf-8"))
+    return output_path, len(pages), len(sections)
+
+
+def index_dump(text_path):
+    """
+    Build the sidecar index for an existing dump from its page markers
+    (no PDF needed, so no outline entries). Returns (page count, section count).
+    """
+    pages = []
+    sections = []
+    offset = 0
+    with open(text_path, "rb") as f:
+        for data in f:
+            match = PAGE_MARKER.match(data)
+            if match:
+                if pages:
+                    pages[-1]["length"] = offset - pages[-1]["offset"]
+                pages.append({"page": int(match.group(1)), "offset": offset, "length": 0})
+            elif pages and is_heading(data.decode("utf-8")):
+                sections.append({"title": data.decode("utf-8").strip(), "page": pages[-1]["page"],
+                                 "offset": offset, "source": "text"})
+            offset += len(data)
+    if pages:
+        pages[-1]["length"] = offset - pages[-1]["offset"]
+
+    index = {"source": None, "source_sha256": None, "pages": pages, "sections": sections}
+    atomic_write(index_path(text_path), json.dumps(index, indent=1).encode("utf-8"))
+    return len(pages), len(sections)
+
+
+# --- Readers ---
+
+def load_dump_index(text_path):
+    with open(index_path(text_path), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_page_text(text_path, page, index=None):
+    """Text of one page (1-based) of a dump, without its '--- Page N ---' marker."""
+    index = index or load_dump_index(text_path)
+    entry = index["pages"][page - 1]
+    with open(text_path, "rb") as f:
+        f.seek(entry["offset"])
+        block = f.read(entry["length"]).decode("utf-8")
+    return block.split("\n", 1)[1][:-2]
+
+
+def read_pages_text(text_path, first, last, index=None):
+    """Raw dump text (markers included) from the start of page first to the end of page last."""
+    index = index or load_dump_index(text_path)
+    start = index["pages"][first - 1]["offset"]
+    end_entry = index["pages"][last - 1]
+    with open(text_path, "rb") as f:
+        f.seek(start)
+        return f.read(end_entry["offset"] + end_entry["length"] - start).decode("utf-8")
+
+
+def find_sections(text_path, query, index=None):
+    """Section headings whose title contains query (case and spacing insensitive)."""
+    index = index or load_dump_index(text_path)
+    query = _normalize(query)
+    return [s for s in index["sections"] if query in _normalize(s["title"])]
+
+
+def _dump_job(pdf_path, output_path):
+    """Worker: never raises, returns (output_path, ok, detail)."""
+    try:
+        _, n_pages, n_sections = dump_pdf(pdf_path, output_path)
+        return output_path, True, f"{n_pages} pages, {n_sections} headings"
+    except Exception as e:
+        return output_path, False, str(e)
+
+
+def dump_all(jobs, workers=None):
+    """Dump [(pdf, output)] on a process pool. Returns the number of failures."""
+    failures = 0
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_dump_job, pdf, out) for pdf, out in jobs]
+        for future in as_completed(futures):
+            output_path, ok, detail = future.result()
+            if ok:
+                print(f"Text dumped to {output_path} ({detail})")
+            else:
+                failures += 1
+                print(f"Error writing {output_path}: {detail}")
+    return failures
+
+
+def _default_output(pdf_path, output_dir):
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    slug = re.sub(r"[^a-z0-9]+", "_", stem.lower()).strip("_")
+    return os.path.join(output_dir, f"{slug}_text.txt")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dump PDF text with a page/section offset index.")
+    parser.add_argument("pdfs", nargs="*", help="PDFs to dump (default: every book in DUMPS)")
+    parser.add_argument("--output-dir", default=".", help="Where dumps of ad-hoc PDFs go")
+    parser.add_argument("--workers", type=int, default=None, help="Pool size (default: number of cores)")
+    parser.add_argument("--reindex", nargs="+", metavar="DUMP",
+                        help="Only (re)build the sidecar index of existing dump files")
+    args = parser.parse_args()
+
+    if args.reindex:
+        for text_path in args.reindex:
+            n_pages, n_sections = index_dump(text_path)
+            print(f"Indexed {text_path} ({n_pages} pages, {n_sections} headings)")
+        return 0
+
+    if args.pdfs:
+        jobs = [(pdf, _default_output(pdf, args.output_dir)) for pdf in args.pdfs]
+    else:
+        jobs = [(os.path.join(BASE_PATH, pdf), out) for pdf, out in DUMPS]
+
+    return 1 if dump_all(jobs, args.workers) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
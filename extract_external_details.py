@@ -1,7 +1,7 @@
-import fitz
+from page_cache import open_cached
 
 pdf_path = "/Users/alexlewis/Desktop/APPBUILDSANTIGRAVITY/MCB_Sales/A Supplier Pricing, Info & Brochures (Alex Website)/Creative External Blinds Pricing 07July2025.pdf"
-doc = fitz.open(pdf_path)
+doc = open_cached(pdf_path)
 
 print("Checking for Group-02...")
 for i, page in enumerate(doc):
@@ -1,7 +1,7 @@
-import fitz
+from page_cache import open_cached
 
 pdf_path = "/Users/alexlewis/Desktop/APPBUILDSANTIGRAVITY/MCB_Sales/A Supplier Pricing, Info & Brochures (Alex Website)/Creative External Blinds Pricing 07July2025.pdf"
-doc = fitz.open(pdf_path)
+doc = open_cached(pdf_path)
 
 # Pages: Recloth (7/page 8), Auto (9/page 10), Straight (11/page 12), Fixed (13/page 14), Wire (15/page 16)
 # Note: 0-indexed. Page 8 is index 7.
@@ -2,23 +2,73 @@
 """
 Fabric Database Audit Script
 Parses all fabric grouping tables from Creative Internal Blinds PDF text,
-queries the Supabase DB, and produces a full discrepancy report.
+reads the DB fabrics and produces a full discrepancy report.
+
+DB fabrics are streamed from the live fabrics table or from an export:
+
+    python fabric_audit.py                                    # DATABASE_URL, else fabrics_snapshot.csv
+    python fabric_audit.py --source postgresql://.../postgres
+    python fabric_audit.py --source fabrics_export.parquet
+
+To try it against a local Postgres stand-in, load the snapshot into a
+throwaway database first:
+
+    python bulk_load.py --dsn postgresql://localhost/scratch --init-schema --fabrics fabrics_snapshot.csv
+    python fabric_audit.py --source postgresql://localhost/scratch
 """
 
+import argparse
 import os
 import re
-import json
 from collections import defaultdict
+from itertools import chain
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+except ImportError:
+    psycopg = None
+
+from bulk_load import read_rows
+from fabric_matcher import DEFAULT_THRESHOLD, FabricMatcher
 
 # --- CONFIGURATION ---
 TEXT_FILE = "creative_internal_text.txt"
 CURTAINS_TEXT_FILE = "creative_curtains_text.txt"
 
-# Supabase DB data (pre-fetched) - we'll embed the DB data directly
-# since we can compare without a live connection
+# Text dump page markers and grouping table titles ("Roller - Fabric Grouping  (July 2025)")
+PAGE_MARKER = re.compile(r'^--- Page \d+ ---$')
+GROUPING_TITLE = re.compile(r'^(?P<product>.+?)\s+-\s+Fabric Grouping\b')
+
+# Report names of tables whose title names the product differently
+SECTION_NAMES = {'Roller': 'Roller Blinds'}
+
+# DB fabrics come from the live fabrics table (a Postgres connection string,
+# --source or DATABASE_URL) or from an exported snapshot (.csv/.jsonl/.parquet).
+# fabrics_snapshot.csv is the last export checked into the repo.
+SNAPSHOT_FILE = "fabrics_snapshot.csv"
+SUPPLIER = "Creative"
+INTERNAL_CATEGORY = "Internal Blinds"
+CURTAINS_CATEGORY = "Curtains"
+
+# Rows fetched per round trip from the server-side cursor / Parquet batch
+FETCH_ROWS = 2000
+
+# Runner-up fuzzy matches listed under a NAME DIFFER warning
+MAX_ALTERNATIVES = 4
 
 # --- PDF PARSING ---
 
+def is_fabric_type(text):
+    """A fabric type is a word, not a number ('Block Out', 'Screen')."""
+    return bool(re.match(r'^[A-Za-z][A-Za-z /-]*$', text))
+
+
+def is_width(text):
+    """Roll width in metres ('3.0', '2.8')."""
+    return bool(re.match(r'^\d+(\.\d+)?$', text))
+
+
 def parse_fabric_grouping_table(lines, start_idx, end_idx):
     """
     Parse a fabric grouping table from PDF text lines.
@@ -26,7 +76,7 @@ def parse_fabric_grouping_table(lines, start_idx, end_idx):
     The format is blocks of 6 lines repeating:
     No. (number)
     Group (number)
-    Fabric Type (Screen/Light Filter/Block Out/Sheer)
+    Fabric Type (Screen/Light Filter/Block Out/Sheer/...)
     Fabric Name
     Supplier
     Width (m)
@@ -56,7 +106,7 @@ def parse_fabric_grouping_table(lines, start_idx, end_idx):
         
         # We found a row number. Next lines should be:
         # Group, Fabric Type, Fabric Name, Supplier, Width
-        if i + 5 > end_idx:
+        if i + 5 >= end_idx:
             break
             
         try:
@@ -70,9 +120,9 @@ def parse_fabric_grouping_table(lines, start_idx, end_idx):
         supplier = lines[i + 4].strip()
         width = lines[i + 5].strip()
         
-        # Validate - fabric_type should be one of the known types
-        valid_types = ['Screen', 'Light Filter', 'Block Out', 'Sheer']
-        if fabric_type not in valid_types:
+        # Validate the block's shape rather than a list of known fabric types,
+        # so a new type in a new edition still parses
+        if not is_fabric_type(fabric_type) or not is_width(width):
             i += 1
             continue
         
@@ -90,90 +140,74 @@ def parse_fabric_grouping_table(lines, start_idx, end_idx):
     return fabrics
 
 
-def find_table_boundaries(lines):
-    """Find the start and end lines of each fabric grouping table."""
-    tables = []
+def section_name(product):
+    """Report name of a grouping table from the product in its title ('Roller' -> 'Roller Blinds')."""
+    product = re.sub(r'\s+', ' ', product).strip()
+    return SECTION_NAMES.get(product, product)
+
+
+def is_table_header(lines, i):
+    """True when lines[i] starts a 'No. Group Fabric Type' header (on one line or one word per line)."""
+    stripped = lines[i].strip()
+    if stripped.startswith('No. Group'):
+        return True
+    return stripped == 'No.' and i + 1 < len(lines) and lines[i + 1].strip() == 'Group'
+
+
+def parse_page(page_lines):
+    """
+    (grouping title or None, fabric rows) of one page of the text dump.
     
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if 'Roller - Fabric Grouping' in stripped or \
-           'Roller Blinds - Fabric Grouping' in stripped:
-            # The actual data starts on page 14 (before this line in the text)
-            # Search backwards for 'No. Group Fabric Type' header
-            tables.append(('Roller Blinds', i))
-        elif 'Roman Blinds - Fabric Grouping' in stripped:
-            tables.append(('Roman Blinds', i))
-        elif 'Panel Glides -  Fabric Grouping' in stripped or \
-             'Panel Glides - Fabric Grouping' in stripped:
-            tables.append(('Panel Glides', i))
+    Rows are read from the first table header on; a page without a header
+    has no rows. The title can be printed anywhere on the page (Roller and
+    Panel Glides put it at the foot).
+    """
+    title = None
+    header = None
+    for i, line in enumerate(page_lines):
+        match = GROUPING_TITLE.match(line.strip())
+        if match and title is None:
+            title = section_name(match.group('product'))
+        if header is None and is_table_header(page_lines, i):
+            header = i
+    
+    if header is None:
+        return title, []
+    return title, parse_fabric_grouping_table(page_lines, header, len(page_lines))
+
+
+def iter_fabric_groupings(filepath):
+    """
+    Yield (section, fabric) for every fabric grouping row of a text dump, in
+    one pass, holding one page at a time.
     
-    return tables
+    A page belongs to the grouping table whose title it prints; a page with
+    no title continues the table of the page before it. Rows found before
+    any title are reported under section None.
+    """
+    section = None
+    page = []
+    with open(filepath, 'r') as f:
+        for line in chain(f, [None]):
+            # A page marker (or the end of the file) closes the buffered page
+            if line is not None and not PAGE_MARKER.match(line):
+                page.append(line)
+                continue
+            title, rows = parse_page(page)
+            section = title or section
+            for fabric in rows:
+                yield section, fabric
+            page = []
 
 
 def parse_all_tables(filepath):
-    """Parse all fabric grouping tables from the text file."""
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-    
-    # The Roller Blinds data actually starts at the header before line 1134
-    # Let's find the "No. Group Fabric Type" headers
-    header_indices = []
-    for i, line in enumerate(lines):
-        if line.strip() == 'No. Group Fabric Type':
-            header_indices.append(i)
-    
-    # Find the fabric grouping section titles
-    section_titles = {}
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if 'Roller - Fabric Grouping' in stripped:
-            section_titles[i] = 'Roller Blinds'
-        elif 'Roman Blinds - Fabric Grouping' in stripped:
-            section_titles[i] = 'Roman Blinds'
-        elif 'Panel Glides' in stripped and 'Fabric Grouping' in stripped:
-            section_titles[i] = 'Panel Glides'
-    
-    # Map headers to their section
-    # The Roller section has data that spans the headers before "Roller - Fabric Grouping" 
-    # line 1134 AND after it (pages 14-17)
-    # Roman section starts at line 3795
-    # Panel Glides section starts at line 5293
-    
+    """Parse all fabric grouping tables from the text file: {section: [fabric]} in book order."""
     results = {}
-    
-    # Roller Blinds - from first "No. Group" header near page 14 to Roman section
-    # Looking at the data, the first fabric entry starts at line ~932 (page 14 header)
-    # and the roller grouping title is at 1134 but data continues after it too
-    roller_start = None
-    roman_start = None
-    panel_start = None
-    
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped == 'No. Group Fabric Type':
-            # Check context to figure out which section this belongs to
-            if roller_start is None and i < 3795:
-                roller_start = i
-            elif roman_start is None and i > 3790 and i < 5290:
-                roman_start = i
-            elif panel_start is None and i > 5290:
-                panel_start = i
-    
-    # Parse each section
-    if roller_start:
-        roller_end = 3795 if roman_start else len(lines)
-        roller_fabrics = parse_fabric_grouping_table(lines, roller_start, roller_end)
-        results['Roller Blinds'] = roller_fabrics
-    
-    if roman_start:
-        roman_end = 5293 if panel_start else len(lines)
-        roman_fabrics = parse_fabric_grouping_table(lines, roman_start, roman_end) 
-        results['Roman Blinds'] = roman_fabrics
-    
-    if panel_start:
-        panel_fabrics = parse_fabric_grouping_table(lines, panel_start, len(lines))
-        results['Panel Glides'] = panel_fabrics
-    
+    for section, fabric in iter_fabric_groupings(filepath):
+        if section is None:
+            print(f"Warning: fabric row {fabric['row']} ('{fabric['name']}') precedes any grouping title")
+            continue
+        results.setdefault(section, []).append(fabric)
     return results
 
 
@@ -196,153 +230,59 @@ def parse_curtains_fabrics(filepath):
     return {'headers_found': fabrics}
 
 
-# --- DB DATA (embedded from Supabase query) ---
-# This is the full fabric data from the DB for Creative Internal Blinds
-
-DB_FABRICS = [
-    # Group 1
-    {"name": "Bancoora B/O", "price_group": "1", "brand": "4-Families"},
-    {"name": "Chatsworth LF", "price_group": "1", "brand": "Shaw"},
-    {"name": "Focus B/O", "price_group": "1", "brand": "Texstyle"},
-    {"name": "Focus Roller", "price_group": "1", "brand": "Texstyle"},
-    {"name": "Kleenscreen", "price_group": "1", "brand": "Texstyle"},
-    {"name": "Sanctuary LF", "price_group": "1", "brand": "Texstyle"},
-    {"name": "Vibe B/O", "price_group": "1", "brand": "Shaw"},
-    {"name": "Vibe Roller", "price_group": "1", "brand": "Shaw"},
-    # Group 2
-    {"name": "Aventus 10%", "price_group": "2", "brand": "Shaw"},
-    {"name": "Aventus 5%", "price_group": "2", "brand": "Shaw"},
-    {"name": "Balmoral B/O Roller", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Balmoral LF", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Barbados B/O", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Cascata B/O", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Dakota", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Dawn", "price_group": "2", "brand": "Uniline"},
-    {"name": "Duo B/O", "price_group": "2", "brand": "Shaw"},
-    {"name": "Duo B/O (new)", "price_group": "2", "brand": "Shaw"},
-    {"name": "Duo Screen", "price_group": "2", "brand": "Shaw"},
-    {"name": "Evolution", "price_group": "2", "brand": "Uniline"},
-    {"name": "Hampton Blockout", "price_group": "2", "brand": "Uniline"},
-    {"name": "Jersey B/O", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Josh/ Banes B/O", "price_group": "2", "brand": "CWSB"},
-    {"name": "Karma Roller", "price_group": "2", "brand": "Shaw"},
-    {"name": "Kew B/O", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Le Reve B/O", "price_group": "2", "brand": "Shaw"},
-    {"name": "Le Reve LF", "price_group": "2", "brand": "Shaw"},
-    {"name": "Mandalay", "price_group": "2", "brand": "Uniline"},
-    {"name": "Mantra B/O", "price_group": "2", "brand": "Shaw"},
-    {"name": "Mantra LF", "price_group": "2", "brand": "Shaw"},
-    {"name": "Metro Shade B/O", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Metro Shade LF", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Miami B/O Foam Backed", "price_group": "2", "brand": "Uniline"},
-    {"name": "Modena/ Valdes B/O", "price_group": "2", "brand": "CWSB"},
-    {"name": "New Palm Beach B/O", "price_group": "2", "brand": "Shaw"},
-    {"name": "New Palm Beach LF", "price_group": "2", "brand": "Shaw"},
-    {"name": "One Block", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Pacific/ Samos B/O", "price_group": "2", "brand": "CWSB"},
-    {"name": "Pearlised", "price_group": "2", "brand": "Uniline"},
-    {"name": "Sanctuary B/O", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Sierra B/O", "price_group": "2", "brand": "Uniline"},
-    {"name": "Sirocco Blockout", "price_group": "2", "brand": "Uniline"},
-    {"name": "Sirocco LF", "price_group": "2", "brand": "Uniline"},
-    {"name": "Skye B/O", "price_group": "2", "brand": "Shaw"},
-    {"name": "Skye LF", "price_group": "2", "brand": "Shaw"},
-    {"name": "Solitaire B/O Roller", "price_group": "2", "brand": "Texstyle"},
-    {"name": "Sunset", "price_group": "2", "brand": "Uniline"},
-    {"name": "Tapestry B/O", "price_group": "2", "brand": "Uniline"},
-    {"name": "Tapestry LF", "price_group": "2", "brand": "Uniline"},
-    {"name": "Vibe Roller Metallic", "price_group": "2", "brand": "Shaw"},
-    {"name": "Vivid Block", "price_group": "2", "brand": "Texstyle"},
-    # Group 3
-    {"name": "Avilla B/O", "price_group": "3", "brand": "H.Douglas"},
-    {"name": "Barrier Reef B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Belice B/O", "price_group": "3", "brand": "Uniline"},
-    {"name": "Boston B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Broome Blind B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Buxton B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Chatsworth B/O", "price_group": "3", "brand": "Shaw"},
-    {"name": "Chester B/O", "price_group": "3", "brand": "H.Douglas"},
-    {"name": "Concord B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Daintree B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Gala B/O", "price_group": "3", "brand": "Texstyle"},
-    {"name": "Husk II Sheer Blind", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Icon FR", "price_group": "3", "brand": "Shaw"},
-    {"name": "Linesque B/O", "price_group": "3", "brand": "Shaw"},
-    {"name": "Mercury II B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Petra B/O", "price_group": "3", "brand": "H.Douglas"},
-    {"name": "Plaza Plus Roller", "price_group": "3", "brand": "H.Douglas"},
-    {"name": "Sensory Sheer Blind", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Sydney B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Thredbo B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Thredbo LF", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Tuscany Blind B/O", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Tuscany Blind LF", "price_group": "3", "brand": "Wilsons"},
-    {"name": "Uluru LF", "price_group": "3", "brand": "Wilsons"},
-    # Group 4
-    {"name": "Baltic Plus LF", "price_group": "4", "brand": "H.Douglas"},
-    # Builder
-    {"name": "Kleenscreen (Builder Range)", "price_group": "builder", "brand": "Texstyle"},
-    {"name": "Quest Blockout", "price_group": "builder", "brand": "Shaw"},
-    {"name": "Quest", "price_group": "Builder Range", "brand": "Shaw"},
-]
-
-# DB Curtains fabrics
-DB_CURTAINS = [
-    {"name": "Alsace", "price_group": "1", "brand": "Slender Morris"},
-    {"name": "Aspen", "price_group": "1", "brand": "Hoad"},
-    {"name": "Bali", "price_group": "1", "brand": "Nettex"},
-    {"name": "Cannes", "price_group": "1", "brand": "Nettex"},
-    {"name": "Coco", "price_group": "1", "brand": "Nettex"},
-    {"name": "Dynamo (3P lining)", "price_group": "1", "brand": "Nettex"},
-    {"name": "Flaxen", "price_group": "1", "brand": "Hoad"},
-    {"name": "Horizon", "price_group": "1", "brand": "Nettex"},
-    {"name": "Icon", "price_group": "1", "brand": "Hoad"},
-    {"name": "Lucern", "price_group": "1", "brand": "Nettex"},
-    {"name": "Mikado", "price_group": "1", "brand": "Nettex"},
-    {"name": "Milan", "price_group": "1", "brand": "Slender Morris"},
-    {"name": "Monaco", "price_group": "1", "brand": "Slender Morris"},
-    {"name": "Montreaux", "price_group": "1", "brand": "Nettex"},
-    {"name": "Omni", "price_group": "1", "brand": "Charles Parsons"},
-    {"name": "Osaka", "price_group": "1", "brand": "Nettex"},
-    {"name": "Ski", "price_group": "1", "brand": "Hoad"},
-    {"name": "Sumo", "price_group": "1", "brand": "Nettex"},
-    {"name": "Verne", "price_group": "1", "brand": "Nettex"},
-    {"name": "Vevey", "price_group": "1", "brand": "Nettex"},
-    # Duplicates with 'Group X' format
-    {"name": "Horizon", "price_group": "Group 1", "brand": "Nettex"},
-    {"name": "Galaxy", "price_group": "Group 2", "brand": "Hoad"},
-    # Group 2
-    {"name": "Altitude", "price_group": "2", "brand": "Nettex"},
-    {"name": "Astra", "price_group": "2", "brand": "Hoad"},
-    {"name": "Belmont", "price_group": "2", "brand": "Hoad"},
-    {"name": "Cloud", "price_group": "2", "brand": "Hoad"},
-    {"name": "Easton", "price_group": "2", "brand": "Basford"},
-    {"name": "Epic", "price_group": "2", "brand": "Nettex"},
-    {"name": "euphoric", "price_group": "2", "brand": "Nettex"},
-    {"name": "Galaxy", "price_group": "2", "brand": "Nettex"},
-    {"name": "Galaxy", "price_group": "2", "brand": "Hoad"},
-    {"name": "Horizon", "price_group": "2", "brand": "Hoad"},
-    {"name": "Mondo", "price_group": "2", "brand": "Hoad"},
-    {"name": "Odin", "price_group": "2", "brand": "Basford"},
-    {"name": "Summer", "price_group": "2", "brand": "Hoad"},
-    {"name": "Venus", "price_group": "2", "brand": "Hoad"},
-    {"name": "Virgo", "price_group": "2", "brand": "Hoad"},
-    # Group 3-5
-    {"name": "Daintree", "price_group": "3", "brand": "Hoad"},
-    {"name": "Genoa", "price_group": "3", "brand": "Warwick"},
-    {"name": "Gianna", "price_group": "3", "brand": "Warwick"},
-    {"name": "Sicily", "price_group": "3", "brand": "Warwick"},
-    {"name": "Verona", "price_group": "3", "brand": "Hoad"},
-    {"name": "Chios", "price_group": "4", "brand": "Warwick"},
-    {"name": "Corfu", "price_group": "4", "brand": "Warwick"},
-    {"name": "Mossman", "price_group": "4", "brand": "Hoad"},
-    {"name": "Burano", "price_group": "5", "brand": "Warwick"},
-    {"name": "Encore", "price_group": "5", "brand": "Hoad"},
-    {"name": "Lafayette", "price_group": "5", "brand": "Nettex"},
-    {"name": "Napoleon", "price_group": "5", "brand": "Nettex"},
-    {"name": "Sencha", "price_group": "5", "brand": "James Dunlop"},
-    {"name": "Weylands", "price_group": "5", "brand": "Basford"},
-]
+# --- DB DATA ---
+
+def read_fabrics(source, supplier, product_category):
+    """
+    Yield fabric rows {name, price_group, brand} for one supplier and product
+    category, lazily, from:
+    
+    - a Postgres connection string (the live fabrics table, read through a
+      server-side cursor FETCH_ROWS at a time; active fabrics only)
+    - a .csv or .jsonl export (bulk_load.py's fabrics columns)
+    - a .parquet export (needs pyarrow)
+    
+    Exports without supplier / product_category columns are taken as they are.
+    """
+    if source.startswith(('postgres://', 'postgresql://')):
+        rows = _read_fabrics_table(source, supplier, product_category)
+    elif source.lower().endswith('.parquet'):
+        rows = _read_parquet(source)
+    else:
+        rows = read_rows(source)
+    
+    for row in rows:
+        if row.get('supplier', supplier) != supplier or row.get('product_category', product_category) != product_category:
+            continue
+        yield {
+            'name': row['name'],
+            'price_group': str(row.get('price_group') or ''),
+            'brand': row.get('brand') or '',
+        }
+
+
+def _read_fabrics_table(dsn, supplier, product_category):
+    if psycopg is None:
+        raise RuntimeError("Reading the fabrics table needs psycopg: pip install 'psycopg[binary]'")
+    with psycopg.connect(dsn) as conn:
+        # A named cursor is a server-side cursor: rows arrive FETCH_ROWS at a time
+        with conn.cursor(name='fabric_audit', row_factory=dict_row) as cur:
+            cur.itersize = FETCH_ROWS
+            cur.execute(
+                "SELECT supplier, product_category, name, price_group, brand FROM fabrics"
+                " WHERE supplier = %s AND product_category = %s AND is_active IS NOT FALSE ORDER BY name",
+                (supplier, product_category),
+            )
+            yield from cur
+
+
+def _read_parquet(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Reading Parquet needs pyarrow: pip install pyarrow") from None
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=FETCH_ROWS):
+        yield from batch.to_pylist()
 
 
 def normalize_name(name):
@@ -353,42 +293,62 @@ def normalize_name(name):
     return n
 
 
-def compare_roller_with_db(pdf_roller, db_fabrics):
-    """Compare Roller Blinds grouping from PDF with DB data."""
+def compare_roller_with_db(pdf_roller, db_fabrics, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare Roller Blinds grouping from PDF with DB data.
+    
+    db_fabrics is any iterable of DB rows (read_fabrics) and is read once;
+    only the PDF side is indexed. Names without an exact match are matched by
+    trigram similarity (fabric_matcher); candidates scoring below threshold
+    don't count.
+    """
     issues = []
     
-    # Build lookup from PDF
+    # Build lookup and trigram index from PDF
     pdf_lookup = {}
     for f in pdf_roller:
         pdf_lookup[normalize_name(f['name'])] = f
-    
-    # Build lookup from DB
-    db_lookup = {}
-    for f in db_fabrics:
-        db_lookup[normalize_name(f['name'])] = f
+    pdf_matcher = FabricMatcher(pdf_lookup)
+    
+    # One pass over the DB: fuzzy candidates for each PDF name, and DB
+    # fabrics close to no PDF name at all. A name the DB repeats is matched
+    # once, and its last row wins (check_duplicates reports the repeat).
+    db_rows = {}
+    near = defaultdict(list)
+    extra_in_db = []
+    for db_data in db_fabrics:
+        db_name = normalize_name(db_data['name'])
+        seen = db_name in db_rows
+        db_rows[db_name] = db_data
+        if seen:
+            continue
+        matches = pdf_matcher.candidates(db_name, threshold, limit=None)
+        for m in matches:
+            if m.name != db_name:
+                near[m.name].append(m._replace(name=db_name))
+        if not matches and db_name not in pdf_lookup:
+            extra_in_db.append(db_name)
     
     # Check each PDF fabric against DB
     for pdf_name, pdf_data in sorted(pdf_lookup.items()):
         pdf_group = str(pdf_data['group'])
         
-        # Try to find in DB (exact match first, then fuzzy)
-        db_entry = db_lookup.get(pdf_name)
+        # Exact match first, then the best-scoring fuzzy candidates
+        db_entry = db_rows.get(pdf_name)
         
         if not db_entry:
-            # Try fuzzy matching
-            best_match = None
-            for db_name in db_lookup:
-                # Check if one is substring of the other
-                if pdf_name.lower() in db_name.lower() or db_name.lower() in pdf_name.lower():
-                    best_match = db_name
-                    break
+            # Ties keep DB order
+            candidates = sorted(near[pdf_name], key=lambda m: (-m.score, -m.dice))
             
-            if best_match:
-                db_entry = db_lookup[best_match]
+            if candidates:
+                best_match = candidates[0]
+                db_entry = db_rows[best_match.name]
                 issues.append({
                     'type': 'NAME_MISMATCH',
                     'pdf_name': pdf_name,
-                    'db_name': best_match,
+                    'db_name': best_match.name,
+                    'score': best_match.score,
+                    'alternatives': candidates[1:MAX_ALTERNATIVES + 1],
                     'pdf_group': pdf_group,
                     'db_group': db_entry['price_group'],
                     'severity': 'WARNING'
@@ -414,27 +374,50 @@ def compare_roller_with_db(pdf_roller, db_fabrics):
                 'severity': 'ERROR'
             })
     
-    # Check for DB fabrics not in PDF
-    for db_name, db_data in sorted(db_lookup.items()):
-        if db_name not in pdf_lookup:
-            # Check fuzzy
-            found = False
-            for pdf_name in pdf_lookup:
-                if pdf_name.lower() in db_name.lower() or db_name.lower() in pdf_name.lower():
-                    found = True
-                    break
-            if not found:
-                issues.append({
-                    'type': 'EXTRA_IN_DB',
-                    'db_name': db_name,
-                    'db_group': db_data['price_group'],
-                    'db_brand': db_data['brand'],
-                    'severity': 'WARNING'
-                })
-    
+    # DB fabrics not in PDF
+    for db_name in sorted(extra_in_db):
+        issues.append({
+            'type': 'EXTRA_IN_DB',
+            'db_name': db_name,
+            'db_group': db_rows[db_name]['price_group'],
+            'db_brand': db_rows[db_name]['brand'],
+            'severity': 'WARNING'
+        })
     return issues
 
 
+def build_fabric_index(tables):
+    """
+    Inverted index over the grouping tables: normalized fabric name ->
+    {product: group}, products in table order (a repeated name keeps its
+    last group, as in the table lookups it replaces).
+    """
+    index = defaultdict(dict)
+    for product_type, fabrics in tables.items():
+        for f in fabrics:
+            index[normalize_name(f['name'])][product_type] = f['group']
+    return index
+
+
+def compare_across_products(fabric_index):
+    """
+    One pass over build_fabric_index output. Returns (cross_diffs,
+    unique_by_product): [(name, {product: group})] for fabrics sold in
+    several products under different groups, sorted by name, and
+    {product: {name: group}} for fabrics only one product lists.
+    """
+    cross_diffs = []
+    unique_by_product = defaultdict(dict)
+    for name in sorted(fabric_index):
+        groups_by_product = fabric_index[name]
+        if len(groups_by_product) == 1:
+            (product_type, group), = groups_by_product.items()
+            unique_by_product[product_type][name] = group
+        elif len(set(groups_by_product.values())) > 1:
+            cross_diffs.append((name, groups_by_product))
+    return cross_diffs, unique_by_product
+
+
 def check_format_issues(fabrics, label):
     """Check for format inconsistencies in price_group values."""
     issues = []
@@ -464,12 +447,15 @@ def check_format_issues(fabrics, label):
 
 def check_duplicates(fabrics, label):
     """Check for duplicate fabric entries."""
-    issues = []
     seen = defaultdict(list)
     for f in fabrics:
-        key = f['name'].lower()
-        seen[key].append(f)
-    
+        seen[f['name'].lower()].append(f)
+    return duplicate_issues(seen, label)
+
+
+def duplicate_issues(seen, label):
+    """Duplicate issues from rows grouped by lower-cased name."""
+    issues = []
     for name_lower, entries in seen.items():
         if len(entries) > 1:
             groups = [e['price_group'] for e in entries]
@@ -487,8 +473,24 @@ def check_duplicates(fabrics, label):
     return issues
 
 
-def generate_report():
-    """Generate the full audit report."""
+def scan_db_fabrics(rows, label, format_issues, seen):
+    """
+    Pass DB rows through unchanged while running the per-row checks, so one
+    read of the table feeds every section of the report: format issues are
+    appended to format_issues and rows grouped by lower-cased name in seen
+    (for duplicate_issues).
+    """
+    for f in rows:
+        format_issues.extend(check_format_issues([f], label))
+        seen[f['name'].lower()].append(f)
+        yield f
+
+
+def generate_report(source=SNAPSHOT_FILE, threshold=DEFAULT_THRESHOLD):
+    """
+    Generate the full audit report against the DB fabrics in source (see
+    read_fabrics). Each product category's rows are read once.
+    """
     print("=" * 80)
     print("FABRIC DATABASE AUDIT REPORT")
     print("=" * 80)
@@ -511,7 +513,12 @@ def generate_report():
     print("=" * 80)
     
     roller_fabrics = all_tables.get('Roller Blinds', [])
-    issues = compare_roller_with_db(roller_fabrics, DB_FABRICS)
+    # Format issues and duplicates are collected as the compare reads the rows
+    format_issues = []
+    internal_names = defaultdict(list)
+    internal_rows = scan_db_fabrics(read_fabrics(source, SUPPLIER, INTERNAL_CATEGORY), 'Internal Blinds',
+                                    format_issues, internal_names)
+    issues = compare_roller_with_db(roller_fabrics, internal_rows, threshold)
     
     if not issues:
         print("✅ No discrepancies found!")
@@ -534,7 +541,10 @@ def generate_report():
                     extra = ""
                     if issue['pdf_group'] != issue['db_group'].replace('Group ', ''):
                         extra = f" ⚠️  ALSO GROUP DIFF: PDF={issue['pdf_group']}, DB={issue['db_group']}"
-                    print(f"   🟡 NAME DIFFER: PDF='{issue['pdf_name']}' vs DB='{issue['db_name']}'{extra}")
+                    print(f"   🟡 NAME DIFFER: PDF='{issue['pdf_name']}' vs DB='{issue['db_name']}' ({issue['score']:.2f}){extra}")
+                    if issue['alternatives']:
+                        others = ", ".join(f"'{m.name}' ({m.score:.2f})" for m in issue['alternatives'])
+                        print(f"      also close: {others}")
                 elif issue['type'] == 'EXTRA_IN_DB':
                     print(f"   🟡 NOT IN PDF (Roller): DB has '{issue['db_name']}' in group {issue['db_group']} ({issue['db_brand']})")
     
@@ -544,30 +554,8 @@ def generate_report():
     print("2. CROSS-PRODUCT GROUP DIFFERENCES (Roller vs Roman vs Panel)")
     print("=" * 80)
     
-    # Build lookups for each product type
-    product_lookups = {}
-    for product_type, fabrics in all_tables.items():
-        lookup = {}
-        for f in fabrics:
-            lookup[normalize_name(f['name'])] = f['group']
-        product_lookups[product_type] = lookup
-    
-    # Find fabrics that appear in multiple products with different groups
-    all_fabric_names = set()
-    for lookup in product_lookups.values():
-        all_fabric_names.update(lookup.keys())
-    
-    cross_diffs = []
-    for name in sorted(all_fabric_names):
-        groups_by_product = {}
-        for product_type, lookup in product_lookups.items():
-            if name in lookup:
-                groups_by_product[product_type] = lookup[name]
-        
-        if len(groups_by_product) > 1:
-            unique_groups = set(groups_by_product.values())
-            if len(unique_groups) > 1:
-                cross_diffs.append((name, groups_by_product))
+    fabric_index = build_fabric_index(all_tables)
+    cross_diffs, unique_by_product = compare_across_products(fabric_index)
     
     if cross_diffs:
         print(f"\n⚠️  {len(cross_diffs)} fabrics have DIFFERENT groups across product types:")
@@ -579,23 +567,22 @@ def generate_report():
     
     # Fabrics only in specific products
     print(f"\n📋 Fabrics UNIQUE to each product type:")
-    for product_type, lookup in product_lookups.items():
-        unique = set(lookup.keys())
-        for other_type, other_lookup in product_lookups.items():
-            if other_type != product_type:
-                unique -= set(other_lookup.keys())
+    for product_type in all_tables:
+        unique = unique_by_product.get(product_type)
         if unique:
             print(f"\n   {product_type} only ({len(unique)}):")
             for name in sorted(unique):
-                print(f"     - {name} (Group {lookup[name]})")
+                print(f"     - {name} (Group {unique[name]})")
     
     print()
     print("=" * 80)
     print("3. FORMAT INCONSISTENCIES IN DB")
     print("=" * 80)
     
-    format_issues = check_format_issues(DB_FABRICS, 'Internal Blinds')
-    format_issues.extend(check_format_issues(DB_CURTAINS, 'Curtains'))
+    curtain_names = defaultdict(list)
+    for _ in scan_db_fabrics(read_fabrics(source, SUPPLIER, CURTAINS_CATEGORY), 'Curtains',
+                             format_issues, curtain_names):
+        pass
     
     if format_issues:
         print(f"\n⚠️  {len(format_issues)} format issues found:")
@@ -609,8 +596,8 @@ def generate_report():
     print("4. DUPLICATE FABRIC ENTRIES IN DB")
     print("=" * 80)
     
-    dup_issues = check_duplicates(DB_FABRICS, 'Internal Blinds')
-    dup_issues.extend(check_duplicates(DB_CURTAINS, 'Curtains'))
+    dup_issues = duplicate_issues(internal_names, 'Internal Blinds')
+    dup_issues.extend(duplicate_issues(curtain_names, 'Curtains'))
     
     if dup_issues:
         print(f"\n⚠️  {len(dup_issues)} duplicate issues found:")
@@ -647,5 +634,16 @@ def generate_report():
     print()
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Audit DB fabric groups against the supplier fabric grouping tables.")
+    parser.add_argument("--source", default=os.environ.get("DATABASE_URL") or SNAPSHOT_FILE,
+                        help="Postgres connection string, or a .csv/.jsonl/.parquet export of the fabrics table "
+                             f"(default: DATABASE_URL, else {SNAPSHOT_FILE})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Lowest fuzzy-match score that counts as the same fabric (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+    generate_report(args.source, args.threshold)
+
+
 if __name__ == '__main__':
-    generate_report()
+    main()
@@ -0,0 +1,127 @@
+"""
+Fuzzy fabric-name matching over a trigram index.
+
+Supplier price books and the fabrics table rarely spell a fabric the same
+way: 'Dawn B/O' vs 'Dawn', 'Palm Beach B/O' vs 'New Palm Beach B/O'. A name
+is split into lower-case words; fabric-type words (B/O, Block(out), LF,
+Screen, Sheer) and numbers (openness '3%') are set aside as markers and the
+remaining stem is indexed by padded word trigrams, the way pg_trgm does
+('  dawn '). A query only touches the posting lists of its own trigrams, so
+lookups stay fast however many fabrics are indexed, and candidates are
+ranked by similarity instead of accepted at the first substring hit:
+
+    matcher = FabricMatcher(db_names)
+    matcher.candidates("Duo B/O")   # [Match('Duo B/O (new)', 0.9, 0.667), ...]
+    matcher.best("Duo B/O")         # best Match at or above the threshold, or None
+
+Similarity is the Dice coefficient of the stems' trigrams, raised to 0.9 when
+every trigram of the shorter stem is in the longer one (so 'Miami B/O' still
+finds 'Miami B/O Foam Backed'). Names whose markers disagree
+('Barrier Reef LF' vs 'Barrier Reef B/O', 'Aventus 3%' vs 'Aventus 5%') are
+different fabrics and never match. A marker stated by one name only counts
+as a disagreement when the other name has words of its own ('Vivid Shade' vs
+'Vivid Block' conflict; 'Dawn' vs 'Dawn B/O' does not).
+"""
+
+import re
+from collections import namedtuple
+
+import numpy as np
+
+# score ranks candidates; dice (plain trigram similarity) breaks ties between them
+Match = namedtuple("Match", ["name", "score", "dice"])
+
+# Similarity below which a candidate is not considered the same fabric
+DEFAULT_THRESHOLD = 0.6
+
+# Score of a stem wholly contained in the other (an exact stem match scores 1)
+CONTAINED_SCORE = 0.9
+
+# Fabric-type words, by the marker they stand for
+TYPE_WORDS = {"bo": "bo", "block": "bo", "blockout": "bo", "lf": "lf", "screen": "screen", "sheer": "sheer"}
+
+
+def name_words(name):
+    """Lower-case words of a fabric name; 'B/O' reads as one word ('Duo B/O (new)' -> duo, bo, new)."""
+    return re.findall(r"[a-z0-9%]+", name.lower().replace("/", ""))
+
+
+def split_name(name):
+    """(stem trigrams, markers) of a fabric name; markers are (type words, numbers)."""
+    grams = set()
+    types, numbers = set(), set()
+    for word in name_words(name):
+        if word in TYPE_WORDS:
+            types.add(TYPE_WORDS[word])
+        elif any(c.isdigit() for c in word):
+            numbers.add(word)
+        else:
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams, (frozenset(types), frozenset(numbers))
+
+
+def names_conflict(a, b):
+    """
+    True when two split_name results name different fabrics: both state a
+    fabric type (or a number) and they differ, or only one states it and the
+    other has stem words the first lacks (which may be its own designation).
+    """
+    (a_grams, a_markers), (b_grams, b_markers) = a, b
+    for x, y in zip(a_markers, b_markers):
+        if x and y and x != y:
+            return True
+        if x and not y and not b_grams <= a_grams:
+            return True
+        if y and not x and not a_grams <= b_grams:
+            return True
+    return False
+
+
+class FabricMatcher:
+    """Trigram index over a fixed list of fabric names."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        gram_ids = {}
+        postings = []
+        sizes = []
+        self._split = []
+        for n, name in enumerate(self.names):
+            grams, markers = split_name(name)
+            sizes.append(len(grams))
+            self._split.append((frozenset(grams), markers))
+            for gram in grams:
+                if gram not in gram_ids:
+                    gram_ids[gram] = len(postings)
+                    postings.append([])
+                postings[gram_ids[gram]].append(n)
+        self._gram_ids = gram_ids
+        self._postings = [np.array(p, dtype=np.int64) for p in postings]
+        self._sizes = np.array(sizes, dtype=float)
+
+    def candidates(self, name, threshold=DEFAULT_THRESHOLD, limit=5):
+        """Up to limit (None: all) Matches scoring at least threshold, best first."""
+        split = split_name(name)
+        grams = split[0]
+        lists = [self._postings[self._gram_ids[g]] for g in grams if g in self._gram_ids]
+        if not lists:
+            return []
+        # Names sharing at least one trigram, and how many each shares
+        rows, shared = np.unique(np.concatenate(lists), return_counts=True)
+        sizes = self._sizes[rows]
+        dice = 2 * shared / (len(grams) + sizes)
+        contained = shared == np.minimum(len(grams), sizes)
+        scores = np.where(contained, np.maximum(dice, CONTAINED_SCORE), dice)
+
+        keep = scores >= threshold
+        keep[keep] = [not names_conflict(split, self._split[r]) for r in rows[keep]]
+        rows, scores, dice = rows[keep], scores[keep], dice[keep]
+        # Ties go to the closer overall spelling, then to index order
+        order = np.lexsort((rows, -dice, -scores))[:limit]
+        return [Match(self.names[rows[i]], round(float(scores[i]), 3), round(float(dice[i]), 3)) for i in order]
+
+    def best(self, name, threshold=DEFAULT_THRESHOLD):
+        """The best Match at or above threshold, or None."""
+        matches = self.candidates(name, threshold, limit=1)
+        return matches[0] if matches else None
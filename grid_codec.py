@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Compact encoding for GridPricingData.
+
+external_grids.json and products.pricing_data store every price as a JSON
+float in nested lists. This codec packs the same data as typed arrays of
+integer cents behind a fixed header, optionally delta-encodes the cells
+(prices rise slowly along a row, so the deltas are small) and deflates the
+result. The cells of every group are stored as one array, row after row, and
+each cell is stored as its difference from the cell before it, so decoding is
+a single cumulative sum however many groups a product has:
+
+    header   "<4sBBHHHII" magic b"MCBG", version, flags, n_widths, n_drops,
+             n_groups, n_rows (all groups), n_cells (all groups)
+    steps    int32 cents [n_widths] width_steps, then [n_drops] drop_steps
+    cells    int32 cents [n_cells], row after row (differences when FLAG_DELTA)
+    rows     uint16 [n_rows] row lengths
+    missing  bitmask over the cells (null prices)
+    groups   per group: key length (uint16) + utf-8 key, rows in the group (uint16)
+
+The whole payload is zlib-compressed. In JSON it travels base64-encoded:
+
+    {"encoding": "mcb-grid/2", "data": "...", "notes": ...}
+
+(keys other than width_steps, drop_steps, grids and grid are kept as they are).
+decode_pricing_data() gives back exactly the original structure, including
+float vs int literals and ragged rows. The app decodes the same payload with
+decodePricingData() in mcb-quote-tool/src/lib/gridCodec.ts. In Python, decoding
+is about as fast as json.loads of the original. In the browser, reading the
+inflated bytes beats JSON.parse, but base64 and inflate cost more than that
+saves: there the gain is size, not parse time.
+
+    python grid_codec.py validate mcb-quote-tool/external_grids.json
+    python grid_codec.py encode external_grids.jsonl -o external_grids.compact.jsonl
+"""
+
+import argparse
+import base64
+import json
+import math
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+ENCODING = "mcb-grid/2"
+MAGIC = b"MCBG"
+VERSION = 2
+HEADER = struct.Struct("<4sBBHHHII")
+GROUP_KEY = struct.Struct("<H")
+
+FLAG_DELTA = 1
+FLAG_FLOATS = 2        # source wrote whole numbers as floats (131.0)
+FLAG_SINGLE_GRID = 4   # pricing_data used "grid" rather than "grids"
+
+STEP_KEYS = ("width_steps", "drop_steps", "grids", "grid")
+
+# validate() times each parse this many times and keeps the fastest
+TIMING_REPEATS = 5
+
+
+def _to_cents(values):
+    """int32 cents for a list of numbers (None -> 0); raises if a value has fractions of a cent."""
+    cents = np.zeros(len(values), dtype=np.int64)
+    for i, v in enumerate(values):
+        if v is None:
+            continue
+        c = round(v * 100)
+        if c / 100 != v:
+            raise ValueError(f"{v!r} is not a whole number of cents")
+        cents[i] = c
+    if len(cents) and (cents.max() > np.iinfo(np.int32).max or cents.min() < np.iinfo(np.int32).min):
+        raise ValueError("price out of int32 cents range")
+    return cents.astype(np.int32)
+
+
+def _from_cents(cents, floats):
+    """Numbers for int cents: whole amounts as int (or float when floats), the rest as float."""
+    if floats:
+        return (cents / 100).tolist()
+    values = (cents // 100).tolist()
+    fractions = cents % 100
+    if fractions.any():
+        for i in np.flatnonzero(fractions).tolist():
+            values[i] = int(cents[i]) / 100
+    return values
+
+
+def _whole_floats(pricing_data):
+    """
+    True when whole amounts were written as floats (131.0, as in
+    external_grids.json), False when as ints (grid_export.py output).
+    """
+    kinds = set()
+
+    def walk(value):
+        if isinstance(value, list):
+            for v in value:
+                walk(v)
+        elif isinstance(value, dict):
+            for v in value.values():
+                walk(v)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and value == int(value):
+            kinds.add(type(value))
+
+    for key in STEP_KEYS:
+        walk(pricing_data.get(key))
+    if len(kinds) > 1:
+        raise ValueError("whole amounts are written both as ints and as floats")
+    return float in kinds
+
+
+def encode_grid_bytes(pricing_data, delta=True):
+    """Pack the steps and grids of a GridPricingData dict into compressed bytes."""
+    single = "grids" not in pricing_data and "grid" in pricing_data
+    grids = {"": pricing_data["grid"]} if single else pricing_data.get("grids") or {}
+    widths = _to_cents(pricing_data.get("width_steps") or [])
+    drops = _to_cents(pricing_data.get("drop_steps") or [])
+
+    flags = (FLAG_DELTA if delta else 0) | (FLAG_FLOATS if _whole_floats(pricing_data) else 0)
+    flags |= FLAG_SINGLE_GRID if single else 0
+
+    rows = [row for group in grids.values() for row in group]
+    lengths = np.array([len(r) for r in rows], dtype=np.uint16)
+    flat = [v for r in rows for v in r]
+    missing = np.array([v is None for v in flat], dtype=bool)
+    cells = _to_cents(flat)
+    if delta:
+        cells = np.diff(cells.astype(np.int64), prepend=0)
+        if len(cells) and (cells.max() > np.iinfo(np.int32).max or cells.min() < np.iinfo(np.int32).min):
+            raise ValueError("price differences out of int32 cents range")
+        cells = cells.astype(np.int32)
+
+    parts = [HEADER.pack(MAGIC, VERSION, flags, len(widths), len(drops), len(grids), len(rows), len(cells)),
+             widths.tobytes(), drops.tobytes(), cells.tobytes(), lengths.tobytes(), np.packbits(missing).tobytes()]
+    for key, group in grids.items():
+        key_bytes = key.encode("utf-8")
+        parts += [GROUP_KEY.pack(len(key_bytes)), key_bytes, GROUP_KEY.pack(len(group))]
+    return zlib.compress(b"".join(parts), 9)
+
+
+def decode_grid_bytes(data):
+    """Inverse of encode_grid_bytes: {"width_steps", "drop_steps", "grids" or "grid"}."""
+    raw = zlib.decompress(data)
+    magic, version, flags, n_widths, n_drops, n_groups, n_rows, n_cells = HEADER.unpack_from(raw, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not an {ENCODING} payload")
+    floats = bool(flags & FLAG_FLOATS)
+    pos = HEADER.size
+
+    def take(dtype, count):
+        nonlocal pos
+        arr = np.frombuffer(raw, dtype=dtype, count=count, offset=pos)
+        pos += arr.nbytes
+        return arr
+
+    steps = _from_cents(take(np.int32, n_widths + n_drops), floats)
+    cells = take(np.int32, n_cells)
+    cells = np.cumsum(cells, dtype=np.int64) if flags & FLAG_DELTA else cells.astype(np.int64)
+    lengths = take(np.uint16, n_rows)
+    bitmask = raw[pos:pos + (n_cells + 7) // 8]
+    pos += len(bitmask)
+
+    values = _from_cents(cells, floats)
+    if bitmask.strip(b"\0"):
+        missing = np.unpackbits(np.frombuffer(bitmask, dtype=np.uint8), count=n_cells)
+        for i in np.flatnonzero(missing).tolist():
+            values[i] = None
+
+    ends = np.cumsum(lengths, dtype=np.int64).tolist()
+    rows = [values[start:end] for start, end in zip([0] + ends, ends)]
+
+    grids, row = {}, 0
+    for _ in range(n_groups):
+        (key_len,) = GROUP_KEY.unpack_from(raw, pos)
+        key = raw[pos + 2:pos + 2 + key_len].decode("utf-8")
+        (group_rows,) = GROUP_KEY.unpack_from(raw, pos + 2 + key_len)
+        pos += 4 + key_len
+        grids[key] = rows[row:row + group_rows]
+        row += group_rows
+
+    out = {"width_steps": steps[:n_widths], "drop_steps": steps[n_widths:]}
+    if flags & FLAG_SINGLE_GRID:
+        out["grid"] = grids[""]
+    else:
+        out["grids"] = grids
+    return out
+
+
+def encode_pricing_data(pricing_data, delta=True):
+    """Compact JSON-ready form of a GridPricingData dict."""
+    compact = {"encoding": ENCODING,
+               "data": base64.b64encode(encode_grid_bytes(pricing_data, delta)).decode("ascii")}
+    compact.update((k, v) for k, v in pricing_data.items() if k not in STEP_KEYS)
+    return compact
+
+
+def decode_pricing_data(compact):
+    """GridPricingData dict from encode_pricing_data() output (other dicts pass through)."""
+    if compact.get("encoding") != ENCODING:
+        return compact
+    pricing_data = decode_grid_bytes(base64.b64decode(compact["data"]))
+    pricing_data.update((k, v) for k, v in compact.items() if k not in ("encoding", "data"))
+    return pricing_data
+
+
+def _same(a, b):
+    """Structural equality that also tells 131 from 131.0 and NaN from NaN."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and math.isnan(a):
+        return math.isnan(b)
+    return a == b
+
+
+def _pricing_key_order(pricing_data):
+    """The decoder emits steps first; compare against the same key order."""
+    order = [k for k in STEP_KEYS if k in pricing_data] + [k for k in pricing_data if k not in STEP_KEYS]
+    return {k: pricing_data[k] for k in order}
+
+
+def _best_time(func, arg):
+    best = math.inf
+    for _ in range(TIMING_REPEATS):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def validate(products, delta=True):
+    """
+    Round-trip every product's pricing_data through the codec.
+    Returns (failures, json bytes, compact json bytes, json parse s, decode s);
+    parse times are the best of TIMING_REPEATS runs per product.
+    """
+    failures = []
+    json_bytes = compact_bytes = 0
+    json_time = decode_time = 0.0
+    for product in products:
+        pricing_data = decode_pricing_data(product["pricing_data"])
+        try:
+            compact = encode_pricing_data(pricing_data, delta)
+        except ValueError as e:
+            failures.append((product.get("name"), str(e)))
+            continue
+
+        original_text = json.dumps(pricing_data)
+        compact_text = json.dumps(compact)
+        json_bytes += len(original_text)
+        compact_bytes += len(compact_text)
+
+        json_time += _best_time(json.loads, original_text)
+        decode_time += _best_time(lambda text: decode_pricing_data(json.loads(text)), compact_text)
+        decoded = decode_pricing_data(json.loads(compact_text))
+
+        if not _same(decoded, _pricing_key_order(pricing_data)):
+            failures.append((product.get("name"), "decoded data differs"))
+    return failures, json_bytes, compact_bytes, json_time, decode_time
+
+
+def read_products(path):
+    """Products from a JSON array file or a JSON Lines file."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact GridPricingData encoding.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("validate", "Prove encode/decode round-trips a products file"),
+                            ("encode", "Write products with compact pricing_data as JSON Lines")):
+        cmd = commands.add_parser(name, help=help_text)
+        cmd.add_argument("products", help="JSON array or JSON Lines of products with pricing_data")
+        cmd.add_argument("--no-delta", action="store_true", help="Store cells without row-wise deltas")
+    commands.choices["encode"].add_argument("-o", "--out", default="-", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    products = read_products(args.products)
+    delta = not args.no_delta
+
+    if args.command == "validate":
+        failures, json_bytes, compact_bytes, json_time, decode_time = validate(products, delta)
+        print(f"{len(products) - len(failures)}/{len(products)} products round-trip exactly")
+        print(f"pricing_data JSON: {json_bytes} bytes, compact: {compact_bytes} bytes "
+              f"({compact_bytes / max(json_bytes, 1):.1%})")
+        print(f"parse: json {json_time * 1000:.2f} ms, compact decode {decode_time * 1000:.2f} ms")
+        for name, reason in failures:
+            print(f"  FAILED {name}: {reason}")
+        return 1 if failures else 0
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        for product in products:
+            product = dict(product, pricing_data=encode_pricing_data(product["pricing_data"], delta))
+            out.write(json.dumps(product, separators=(",", ":")) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Export extracted price grids straight to the app's GridPricingData shape.
+
+The route to the products table used to be PDF -> DataFrame -> Products/*.xlsx
+-> hand-assembled JSON. This writes one JSON document per product, one per
+line (JSON Lines), directly from the extraction engine:
+
+    {"name": ..., "supplier": ..., "category": ..., "pricing_type": "grid",
+     "pricing_data": {"width_steps": [...], "drop_steps": [...],
+                      "grids": {"1": [[...], ...], "2": ...}}}
+
+grids are keyed by price group and laid out [drop][width], as pricing.ts
+reads them. Products are extracted and written one at a time, so memory does
+not grow with the size of the book. orjson is used when installed.
+
+    python grid_export.py creative-external -o external_grids.jsonl
+    python grid_export.py --pdf book.pdf --supplier NBS --category "Roller Blinds" -o -
+"""
+
+import argparse
+import json
+import math
+import sys
+
+import metrics
+import tracing
+from grid_extraction import extract_grid_groups
+from page_index import PRICE_GRID, load_page_index
+from page_reader import read_pages
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BASE_PATH = "A Supplier Pricing, Info & Brochures (Alex Website)"
+
+# Books with known product names, by grid page (0-based page index); the map
+# is checked against the page index and the export stops if they differ
+EXPORTS = {
+    "creative-external": {
+        "pdf_path": f"{BASE_PATH}/Creative External Blinds Pricing 07July2025.pdf",
+        "supplier": "Creative",
+        "category": "External Blinds",
+        "strict": True,
+        "pages": {
+            7: "Creative Recloth",
+            9: "Creative Auto Awning",
+            11: "Creative Straight Drop (Crank/Strap)",
+            13: "Creative Fixed Guide (Spring)",
+            15: "Creative Wire Guide (Crank)",
+            18: "Creative Veue Zipscreen",
+            20: "Creative Veue Straight Drop",
+            22: "Creative Zipscreen Extreme",
+        },
+        # Page 24 (xZip-HB) has a grid but is not exported
+        "skipped_pages": [23],
+    },
+}
+
+
+def dumps(document):
+    """One compact JSON line (bytes, newline included)."""
+    if orjson is not None:
+        return orjson.dumps(document, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _number(value):
+    """Plain int for whole numbers, None for NaN, float otherwise."""
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def pricing_data(groups):
+    """
+    GridPricingData for [(group key, Grid)] sharing one set of widths.
+    Groups whose drops differ are laid out on the union of all drops, with
+    null where a group has no row for a drop.
+    """
+    width_steps = [_number(w) for w in groups[0][1].width_steps]
+    drop_steps = sorted({_number(d) for _, grid in groups for d in grid.drop_steps})
+
+    grids = {}
+    for key, grid in groups:
+        rows = {_number(d): [_number(p) for p in row] for d, row in zip(grid.drop_steps, grid.prices)}
+        grids[key] = [rows.get(d, [None] * len(width_steps)) for d in drop_steps]
+    return {"width_steps": width_steps, "drop_steps": drop_steps, "grids": grids}
+
+
+def product_documents(pdf_path, supplier, category, pages=None, skipped_pages=(), strict=False):
+    """
+    Yield one product document per price-grid page of pdf_path. With pages
+    ({page index: product name}) only those pages are read, after checking
+    that they are exactly the grid pages of the book (skipped_pages aside);
+    without it every grid page is read and named by its page number.
+    """
+    index = load_page_index(pdf_path)
+    if pages is None:
+        pages = {p: f"{supplier} Grid Page {p + 1}" for p in index.pages(PRICE_GRID)}
+        if pages:
+            metrics.inc("mcb_ingest_fallbacks_total", len(pages), kind="generated_name")
+    else:
+        index.check_pages(PRICE_GRID, pages, skipped_pages)
+    for view in read_pages(pdf_path, sorted(pages)):
+        name = pages[view.number]
+        groups = extract_grid_groups(view.words, strict=strict)
+        if not groups:
+            print(f"  No grid extracted for {name} (page {view.number + 1})", file=sys.stderr)
+            continue
+
+        data = pricing_data(groups)
+        for key, grid in groups:
+            if len(grid.drop_steps) != len(data["drop_steps"]):
+                print(f"  Warning: {name} group {key} has {len(grid.drop_steps)} of "
+                      f"{len(data['drop_steps'])} drops", file=sys.stderr)
+
+        yield {
+            "name": name,
+            "supplier": supplier,
+            "category": category,
+            "pricing_type": "grid",
+            "pricing_data": data,
+        }
+
+
+def write_jsonl(documents, out):
+    """Write documents to out ('-' for stdout) as they are produced. Returns the count."""
+    stream = sys.stdout.buffer if out == "-" else open(out, "wb")
+    count = 0
+    try:
+        for document in documents:
+            with tracing.span("write.jsonl", product=document.get("name")):
+                stream.write(dumps(document))
+            count += 1
+    finally:
+        if out == "-":
+            stream.flush()
+        else:
+            stream.close()
+    return count
+
+
+def export(pdf_path, supplier, category, out, pages=None, skipped_pages=(), strict=False):
+    count = write_jsonl(product_documents(pdf_path, supplier, category, pages, skipped_pages, strict), out)
+    print(f"Exported {count} products to {'stdout' if out == '-' else out}", file=sys.stderr)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export price grids as GridPricingData JSON Lines.")
+    parser.add_argument("book", nargs="?", choices=sorted(EXPORTS), help="A known book")
+    parser.add_argument("--pdf", help="Any price book (instead of a known book)")
+    parser.add_argument("--supplier", help="Supplier for --pdf")
+    parser.add_argument("--category", help="Category for --pdf")
+    parser.add_argument("--strict", action="store_true", help="Require a price for every width (--pdf)")
+    parser.add_argument("-o", "--out", default="-", help="Output .jsonl file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.book:
+        export(out=args.out, **EXPORTS[args.book])
+    elif args.pdf and args.supplier and args.category:
+        export(args.pdf, args.supplier, args.category, args.out, strict=args.strict)
+    else:
+        parser.error("Give a known book or --pdf with --supplier and --category")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Shared price-grid extraction engine.
+
+Every supplier script used to carry its own copy of the width-header / drop-row
+parser. This module replaces them with one implementation that works on a
+page's word boxes as NumPy arrays:
+
+    1. Words are grouped into visual rows (row_clustering.cluster_rows).
+    2. Tokens are classified as numeric in bulk (no per-token try/except).
+    3. The width header is the first row with more than 5 plain integers in
+       non-decreasing order.
+    4. Every later row holding at least one number per width column is a
+       price row: first number is the drop, the rest are prices.
+
+The result is a Grid of (width_steps, drop_steps, prices) where prices is a
+2D [drop][width] matrix (NaN where a row was short).
+
+extract_grid_groups() splits a page holding several stacked grids (one per
+price group) into one Grid per group. extract_grids_parallel() runs the same extraction over many pages of one PDF
+on a process pool (page_reader.map_pages_parallel).
+"""
+
+import re
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+import metrics
+import tracing
+from page_reader import map_pages_parallel
+from row_clustering import DEFAULT_ROW_TOLERANCE, cluster_rows
+
+# Minimum number of plain integers a row needs to count as the width header
+MIN_HEADER_WIDTHS = 6
+
+Grid = namedtuple("Grid", ["width_steps", "drop_steps", "prices"])
+
+# "Group-01", "Zip-Group-02", "XZip_Group-03", "GROUP 4"
+GROUP_LABEL = re.compile(r"Group[-_\s]*0*(\d+)", re.IGNORECASE)
+
+
+def words_to_arrays(words):
+    """
+    Convert PyMuPDF word tuples (x0, y0, x1, y1, text, ...) into
+    a float (n, 4) box array and a str (n,) text array.
+    """
+    if not words:
+        return np.empty((0, 4), dtype=float), np.empty(0, dtype=str)
+    boxes = np.array([w[:4] for w in words], dtype=float)
+    text = np.array([w[4] for w in words], dtype=str)
+    return boxes, text
+
+
+def classify_tokens(text):
+    """
+    Classify tokens in bulk.
+
+    Returns (is_int, is_number, values):
+      is_int    -- token is a plain integer as printed (width header candidates)
+      is_number -- token parses as a number once '$' and ',' are stripped
+      values    -- truncated integer value of each numeric token (0 elsewhere)
+    """
+    values = np.zeros(len(text), dtype=np.int64)
+    if len(text) == 0:
+        return np.zeros(0, dtype=bool), np.zeros(0, dtype=bool), values
+
+    is_int = np.char.isdecimal(text)
+
+    clean = np.char.replace(np.char.replace(text, "$", ""), ",", "")
+    is_number = (np.char.count(clean, ".") <= 1) & np.char.isdecimal(np.char.replace(clean, ".", ""))
+
+    if is_number.any():
+        values[is_number] = np.trunc(clean[is_number].astype(float)).astype(np.int64)
+    return is_int, is_number, values
+
+
+def find_header_row(row_ids, is_int, values, n_rows):
+    """
+    Find the width header: the first row with more than 5 plain integers
+    that never decrease left to right. Returns (row_index, widths) or (-1, None).
+    """
+    int_rows = row_ids[is_int]
+    int_vals = values[is_int]
+    counts = np.bincount(int_rows, minlength=n_rows)
+
+    same_row = int_rows[1:] == int_rows[:-1]
+    decreasing = same_row & (int_vals[1:] < int_vals[:-1])
+    ordered = np.ones(n_rows, dtype=bool)
+    ordered[int_rows[1:][decreasing]] = False
+
+    candidates = np.flatnonzero((counts >= MIN_HEADER_WIDTHS) & ordered)
+    if len(candidates) == 0:
+        return -1, None
+
+    header = candidates[0]
+    return header, int_vals[int_rows == header]
+
+
+def extract_grid(words, strict=False, row_tolerance=DEFAULT_ROW_TOLERANCE):
+    """
+    Extract the first price grid from a list of PyMuPDF word tuples.
+
+    With strict=True a price row must carry a drop plus a price for every
+    width column; otherwise a row needs at least as many numbers as there
+    are widths and short rows are padded with NaN. row_tolerance is the
+    y distance (points) within which words are treated as one row.
+
+    Returns a Grid, or None when no width header / price rows are found.
+    """
+    with tracing.span("grid.detect", words=len(words)) as s:
+        grid = _extract_grid(words, strict, row_tolerance)
+        s.set(rows=0 if grid is None else len(grid.drop_steps), widths=0 if grid is None else len(grid.width_steps))
+    return grid
+
+
+def _extract_grid(words, strict, row_tolerance):
+    boxes, text = words_to_arrays(words)
+    if len(text) == 0:
+        return None
+
+    spans = cluster_rows(boxes, row_tolerance)
+    row_ids = spans.row_ids
+    is_int, is_number, values = classify_tokens(text[spans.order])
+    n_rows = len(spans.starts)
+
+    header, widths = find_header_row(row_ids, is_int, values, n_rows)
+    if header < 0:
+        metrics.inc("mcb_ingest_grid_rejections_total", reason="no_header")
+        return None
+    grid = build_grid(row_ids, is_number, values, header, widths, strict)
+    if grid is None:
+        metrics.inc("mcb_ingest_grid_rejections_total", reason="no_price_rows")
+        return None
+    metrics.inc("mcb_ingest_grids_total")
+    if not strict and metrics.enabled():
+        padded = int(np.isnan(grid.prices).any(axis=1).sum())
+        if padded:
+            metrics.inc("mcb_ingest_fallbacks_total", padded, kind="short_row_padded")
+    return grid
+
+
+def build_grid(row_ids, is_number, values, header, widths, strict=False):
+    """
+    Assemble the Grid below a width header found by find_header_row, from
+    clustered row ids and classify_tokens output. Returns None when no row
+    below the header qualifies as a price row.
+    """
+    n_rows = int(row_ids[-1]) + 1 if len(row_ids) else 0
+    n_widths = len(widths)
+
+    # Numeric tokens below the header, still in (row, x) order
+    body = is_number & (row_ids > header)
+    num_rows = row_ids[body]
+    num_vals = values[body]
+
+    counts = np.bincount(num_rows, minlength=n_rows)
+    needed = n_widths + 1 if strict else n_widths
+    accepted = np.flatnonzero(counts >= needed)
+    if len(accepted) == 0:
+        return None
+
+    keep = np.isin(num_rows, accepted)
+    num_rows = num_rows[keep]
+    num_vals = num_vals[keep]
+
+    # Position of each number within its row: 0 = drop, 1..n = prices
+    rank = np.arange(len(num_rows)) - np.searchsorted(num_rows, num_rows)
+    out_row = np.searchsorted(accepted, num_rows)
+
+    drops = num_vals[rank == 0]
+    prices = np.full((len(accepted), n_widths), np.nan)
+    cell = (rank >= 1) & (rank <= n_widths)
+    prices[out_row[cell], rank[cell] - 1] = num_vals[cell]
+
+    return Grid(widths, drops, prices)
+
+
+def extract_grid_groups(words, strict=False, row_tolerance=DEFAULT_ROW_TOLERANCE):
+    """
+    Extract every price grid on a page that repeats the first grid's width
+    header (Creative External prints Group-01..04 one under another).
+
+    Returns [(group key, Grid)] in page order. The key is the number of the
+    nearest 'Group-NN' label above each header, else the grid's position
+    on the page (1-based).
+    """
+    with tracing.span("grid.groups", words=len(words)) as s:
+        groups = _extract_grid_groups(words, strict, row_tolerance)
+        s.set(groups=len(groups))
+    return groups
+
+
+def _extract_grid_groups(words, strict, row_tolerance):
+    boxes, text = words_to_arrays(words)
+    if len(text) == 0:
+        return []
+
+    spans = cluster_rows(boxes, row_tolerance)
+    ordered_text = text[spans.order]
+    is_int, _, values = classify_tokens(ordered_text)
+    n_rows = len(spans.starts)
+
+    header, widths = find_header_row(spans.row_ids, is_int, values, n_rows)
+    if header < 0:
+        return []
+
+    # A row holding exactly the same integers starts the next grid
+    headers = [
+        r for r in range(header, n_rows)
+        if np.array_equal(values[spans.starts[r]:spans.ends[r]][is_int[spans.starts[r]:spans.ends[r]]], widths)
+    ]
+    bounds = headers + [n_rows]
+
+    groups = []
+    label_from = 0
+    for position, (start, end) in enumerate(zip(bounds, bounds[1:]), start=1):
+        key = None
+        for r in range(label_from, start + 1):
+            match = GROUP_LABEL.search(" ".join(ordered_text[spans.starts[r]:spans.ends[r]]))
+            if match:
+                key = str(int(match.group(1)))
+        label_from = start + 1
+        if key is None or key in dict(groups):
+            metrics.inc("mcb_ingest_fallbacks_total", kind="group_key_position")
+            key = str(position)
+
+        section = [words[i] for i in spans.order[spans.starts[start]:spans.ends[end - 1]]]
+        grid = extract_grid(section, strict=strict, row_tolerance=row_tolerance)
+        if grid is not None:
+            groups.append((key, grid))
+    return groups
+
+
+def grid_to_dataframe(grid):
+    """Lay a Grid out as the 'Drop' + one-column-per-width sheet the Products/ workbooks use."""
+    with tracing.span("grid.dataframe", rows=len(grid.drop_steps)):
+        df = pd.DataFrame(grid.prices, columns=[int(w) for w in grid.width_steps])
+        # A width no row reached a price for gets no column, as before
+        df = df.dropna(axis=1, how="all")
+        for col in df.columns:
+            if not df[col].isna().any():
+                df[col] = df[col].astype(np.int64)
+        df.insert(0, "Drop", grid.drop_steps.astype(np.int64))
+    return df
+
+
+def get_grid_from_words(words, strict=False, row_tolerance=DEFAULT_ROW_TOLERANCE):
+    """DataFrame of the first price grid found in words, or None."""
+    grid = extract_grid(words, strict=strict, row_tolerance=row_tolerance)
+    if grid is None:
+        return None
+    return grid_to_dataframe(grid)
+
+
+def get_grid_from_page(page, strict=False, row_tolerance=DEFAULT_ROW_TOLERANCE):
+    """DataFrame of the first price grid found on a PyMuPDF page, or None."""
+    return get_grid_from_words(page.get_text("words", sort=True), strict=strict, row_tolerance=row_tolerance)
+
+
+def _page_grid(view, strict, row_tolerance):
+    """Worker: grid DataFrame for one PageView, or None."""
+    return get_grid_from_words(view.words, strict=strict, row_tolerance=row_tolerance)
+
+
+def extract_grids_parallel(pdf_path, page_numbers=None, workers=None, strict=False,
+                           row_tolerance=DEFAULT_ROW_TOLERANCE):
+    """
+    Extract grids from many pages of one PDF in parallel.
+
+    Returns {page_index: DataFrame} for the pages where a grid was found.
+    See page_reader.map_pages_parallel for how pages are split over workers.
+    """
+    func = partial(_page_grid, strict=strict, row_tolerance=row_tolerance)
+    found = map_pages_parallel(pdf_path, func, page_numbers, workers)
+    return {i: df for i, df in found.items() if df is not None}
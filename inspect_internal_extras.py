@@ -1,4 +1,4 @@
-import fitz
+from page_cache import open_cached
 import os
 
 pdf_path = "A Supplier Pricing, Info & Brochures (Alex Website)/Creative Internal Blinds Pricing 07July2025.pdf"
@@ -13,7 +13,7 @@ if not os.path.exists(pdf_path):
     pass
 
 try:
-    doc = fitz.open(pdf_path)
+    doc = open_cached(pdf_path)
     print(f"Opened {pdf_path} - {len(doc)} pages")
     
     for i, page in enumerate(doc):
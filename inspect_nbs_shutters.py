@@ -1,8 +1,8 @@
-import fitz
+from page_cache import open_cached
 import sys
 
 def inspect_rest(file_path):
-    doc = fitz.open(file_path)
+    doc = open_cached(file_path)
     for i in range(5, len(doc)):
         print(f"\n--- Page {i+1} ---")
         text = page = doc[i].get_text("text")
@@ -1,8 +1,8 @@
-import fitz
+from page_cache import open_cached
 import sys
 
 def inspect_page_4(file_path):
-    doc = fitz.open(file_path)
+    doc = open_cached(file_path)
     page = doc[3] # Page 4 is index 3
     
     # Text with simple layout preservation assumption (sort=True)
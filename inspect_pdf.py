@@ -1,10 +1,10 @@
-import fitz
+from page_cache import open_cached
 import sys
 import os
 
 def inspect_pdf_structure(file_path):
     print(f"--- Inspecting {os.path.basename(file_path)} ---")
-    doc = fitz.open(file_path)
+    doc = open_cached(file_path)
     
     for i, page in enumerate(doc):
         print(f"\n--- Page {i+1} ---")
@@ -1,8 +1,8 @@
-import fitz
+from page_cache import open_cached
 
 def inspect_page6():
     path = "A Supplier Pricing, Info & Brochures (Alex Website)/NBS Roller Blinds (Blockout & Screens) Mar2025.pdf"
-    doc = fitz.open(path)
+    doc = open_cached(path)
     page = doc[5] # Page 6
     words = page.get_text("words", sort=True)
     
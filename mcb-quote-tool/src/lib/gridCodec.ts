@@ -0,0 +1,138 @@
+/**
+ * Compact GridPricingData decoder
+ * Reads the "mcb-grid/2" payload written by grid_codec.py:
+ * { encoding: 'mcb-grid/2', data: <base64 deflate>, ...other keys }
+ *
+ * Payload layout (little-endian, see grid_codec.py):
+ *   header   magic 'MCBG', version u8, flags u8, nWidths u16, nDrops u16,
+ *            nGroups u16, nRows u32, nCells u32
+ *   steps    i32 cents [nWidths + nDrops]
+ *   cells    i32 cents [nCells], row after row (differences when FLAG_DELTA)
+ *   rows     u16 [nRows] row lengths
+ *   missing  bitmask over the cells (null prices), most significant bit first
+ *   groups   per group: key length u16 + utf-8 key, rows in the group u16
+ */
+
+import type { GridPricingData } from '../features/quoting/types';
+
+export const GRID_ENCODING = 'mcb-grid/2';
+
+const MAGIC = 'MCBG';
+const VERSION = 2;
+const HEADER_SIZE = 20;
+
+const FLAG_DELTA = 1;
+const FLAG_SINGLE_GRID = 4;
+
+export interface CompactPricingData {
+    encoding: string;
+    data: string;
+    [key: string]: unknown;
+}
+
+export function isCompactPricingData(value: unknown): value is CompactPricingData {
+    return typeof value === 'object' && value !== null && (value as CompactPricingData).encoding === GRID_ENCODING;
+}
+
+function base64ToBytes(text: string): Uint8Array {
+    const binary = atob(text);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes;
+}
+
+async function inflate(bytes: Uint8Array): Promise<Uint8Array> {
+    // zlib stream ('deflate' in the Compression Streams API)
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'));
+    return new Uint8Array(await new Response(stream).arrayBuffer());
+}
+
+/**
+ * Decode an inflated payload into width_steps, drop_steps and grids (or grid).
+ */
+export function decodeGridBytes(raw: Uint8Array): GridPricingData {
+    const view = new DataView(raw.buffer, raw.byteOffset, raw.byteLength);
+    const magic = String.fromCharCode(raw[0], raw[1], raw[2], raw[3]);
+    if (magic !== MAGIC || raw[4] !== VERSION) {
+        throw new Error(`Not an ${GRID_ENCODING} payload`);
+    }
+    const flags = raw[5];
+    const nWidths = view.getUint16(6, true);
+    const nDrops = view.getUint16(8, true);
+    const nGroups = view.getUint16(10, true);
+    const nRows = view.getUint32(12, true);
+    const nCells = view.getUint32(16, true);
+    let pos = HEADER_SIZE;
+
+    const steps: number[] = new Array(nWidths + nDrops);
+    for (let i = 0; i < steps.length; i++, pos += 4) {
+        steps[i] = view.getInt32(pos, true) / 100;
+    }
+
+    // Cells are differences from the previous cell: a running sum restores them
+    const delta = (flags & FLAG_DELTA) !== 0;
+    const cells: (number | null)[] = new Array(nCells);
+    let cents = 0;
+    for (let i = 0; i < nCells; i++, pos += 4) {
+        const value = view.getInt32(pos, true);
+        cents = delta ? cents + value : value;
+        cells[i] = cents / 100;
+    }
+
+    const lengths: number[] = new Array(nRows);
+    for (let i = 0; i < nRows; i++, pos += 2) {
+        lengths[i] = view.getUint16(pos, true);
+    }
+
+    for (let i = 0; i < nCells; i++) {
+        if ((raw[pos + (i >> 3)] >> (7 - (i & 7))) & 1) {
+            cells[i] = null;
+        }
+    }
+    pos += (nCells + 7) >> 3;
+
+    const rows: (number | null)[][] = [];
+    let start = 0;
+    for (const length of lengths) {
+        rows.push(cells.slice(start, start + length));
+        start += length;
+    }
+
+    const decoder = new TextDecoder();
+    const grids: Record<string, (number | null)[][]> = {};
+    let row = 0;
+    for (let g = 0; g < nGroups; g++) {
+        const keyLength = view.getUint16(pos, true);
+        const key = decoder.decode(raw.subarray(pos + 2, pos + 2 + keyLength));
+        const groupRows = view.getUint16(pos + 2 + keyLength, true);
+        pos += 4 + keyLength;
+        grids[key] = rows.slice(row, row + groupRows);
+        row += groupRows;
+    }
+
+    const data: Record<string, unknown> = {
+        width_steps: steps.slice(0, nWidths),
+        drop_steps: steps.slice(nWidths),
+    };
+    if (flags & FLAG_SINGLE_GRID) {
+        data.grid = grids[''];
+    } else {
+        data.grids = grids;
+    }
+    return data as unknown as GridPricingData;
+}
+
+/**
+ * GridPricingData from a compact pricing_data value; anything else is returned unchanged.
+ */
+export async function decodePricingData(pricingData: unknown): Promise<unknown> {
+    if (!isCompactPricingData(pricingData)) return pricingData;
+
+    const result: Record<string, unknown> = { ...decodeGridBytes(await inflate(base64ToBytes(pricingData.data))) };
+    for (const [key, value] of Object.entries(pricingData)) {
+        if (key !== 'encoding' && key !== 'data') result[key] = value;
+    }
+    return result;
+}
@@ -0,0 +1,250 @@
+"""
+Ingestion metrics in the Prometheus textfile format.
+
+Scheduled runs write one .prom file (for node_exporter's textfile collector,
+or just for diffing against the previous run):
+
+    python process_all.py --metrics /var/lib/node_exporter/ingest.prom
+    MCB_METRICS=ingest.prom python process_nbs_batch3.py
+
+Counters and histograms carry supplier and edition labels, taken from the
+file name of the document being read (page_store.supplier_of / edition_of).
+Grids found while page_index classifies pages carry phase="classify":
+
+    mcb_ingest_pages_total                pages decoded
+    mcb_ingest_pages_skipped              pages no extractor reads (labelled brochure)
+    mcb_ingest_grids_total                price grids extracted
+    mcb_ingest_grid_rejections_total      grid candidates rejected, by reason
+    mcb_ingest_extras_total               extras rows extracted
+    mcb_ingest_fallbacks_total            fallbacks taken, by kind
+    mcb_ingest_stage_seconds              stage durations (every tracing span), histogram
+    mcb_ingest_jobs_total                 process_all jobs by status
+    mcb_ingest_job_seconds                duration of each process_all job
+
+Like tracing, every process keeps its own registry and writes a snapshot to
+<file>.parts/<pid>.json on flush(); the main process merges them at exit.
+"""
+
+import atexit
+import contextlib
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+
+import tracing
+
+METRICS_ENV = "MCB_METRICS"
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0)
+
+HELP = {
+    "mcb_ingest_pages_total": ("counter", "Pages decoded (page index classification included)."),
+    "mcb_ingest_pages_skipped": ("gauge", "Pages of a document no extractor reads."),
+    "mcb_ingest_grids_total": ("counter", "Price grids extracted."),
+    "mcb_ingest_grid_rejections_total": ("counter", "Grid candidates rejected by the extraction heuristics."),
+    "mcb_ingest_extras_total": ("counter", "Extras rows extracted."),
+    "mcb_ingest_fallbacks_total": ("counter", "Fallbacks taken during extraction."),
+    "mcb_ingest_stage_seconds": ("histogram", "Duration of each ingestion stage."),
+    "mcb_ingest_jobs_total": ("counter", "process_all jobs by status."),
+    "mcb_ingest_job_seconds": ("gauge", "Duration of each process_all job."),
+    "mcb_ingest_run_seconds": ("gauge", "Duration of the whole run."),
+    "mcb_ingest_last_run_timestamp_seconds": ("gauge", "Unix time the run finished."),
+}
+
+_path = None
+_document = {}
+_counters = {}
+_gauges = {}
+_histograms = {}
+
+
+def _key(name, labels):
+    merged = dict(_document)
+    merged.update((k, str(v)) for k, v in labels.items() if v is not None)
+    return name, tuple(sorted(merged.items()))
+
+
+def enabled():
+    return _path is not None
+
+
+def set_document(path):
+    """Label what follows with the supplier and edition of the document at path."""
+    if _path is None:
+        return
+    from page_store import edition_of, supplier_of
+
+    filename = os.path.basename(path)
+    _document.clear()
+    _document.update(supplier=supplier_of(filename), edition=edition_of(filename) or "unknown")
+
+
+@contextlib.contextmanager
+def labelled(**labels):
+    """Add labels to everything recorded inside the block."""
+    saved = dict(_document)
+    _document.update((k, str(v)) for k, v in labels.items())
+    try:
+        yield
+    finally:
+        _document.clear()
+        _document.update(saved)
+
+
+def inc(name, value=1, **labels):
+    """Add value to a counter."""
+    if _path is not None:
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name, value, **labels):
+    if _path is not None:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(name, value, **labels):
+    """Record one observation in a histogram."""
+    if _path is None:
+        return
+    # [cumulative bucket counts, sum, count]
+    histogram = _histograms.setdefault(_key(name, labels), [[0] * len(BUCKETS), 0.0, 0])
+    for i, bound in enumerate(BUCKETS):
+        if value <= bound:
+            histogram[0][i] += 1
+    histogram[1] += value
+    histogram[2] += 1
+
+
+def _stage_observer(name, seconds, args):
+    observe("mcb_ingest_stage_seconds", seconds, stage=name)
+
+
+def _parts_dir(path):
+    return f"{path}.parts"
+
+
+def _snapshot():
+    def rows(table):
+        return [[name, list(labels), value] for (name, labels), value in table.items()]
+    return {
+        "counters": rows(_counters),
+        "gauges": rows(_gauges),
+        "histograms": [[name, list(labels), *histogram] for (name, labels), histogram in _histograms.items()],
+    }
+
+
+def flush():
+    """Write this process's metrics so far to its part file (replacing the last snapshot)."""
+    if _path is None or not (_counters or _gauges or _histograms):
+        return
+    os.makedirs(_parts_dir(_path), exist_ok=True)
+    part = os.path.join(_parts_dir(_path), f"{os.getpid()}.json")
+    with open(f"{part}.tmp", "w") as f:
+        json.dump(_snapshot(), f)
+    os.replace(f"{part}.tmp", part)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(counters, gauges, histograms):
+    """Prometheus text exposition of merged metrics."""
+    by_name = {}
+    for (name, labels), value in sorted({**counters, **gauges}.items()):
+        by_name.setdefault(name, []).append(f"{name}{_labels(labels)} {_number(value)}")
+    # Series sorted by labels; a histogram's buckets stay in ascending order
+    for (name, labels), (counts, total, count) in sorted(histograms.items()):
+        lines = by_name.setdefault(name, [])
+        for bound, n in zip(BUCKETS, counts):
+            lines.append(f"{name}_bucket{_labels(labels, [('le', repr(bound))])} {n}")
+        lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_labels(labels)} {total!r}")
+        lines.append(f"{name}_count{_labels(labels)} {count}")
+
+    out = []
+    for name in sorted(by_name):
+        kind, help_text = HELP.get(name, ("untyped", name))
+        out += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *by_name[name]]
+    return "\n".join(out) + "\n"
+
+
+def finish():
+    """Flush, merge every process's snapshot and write the textfile."""
+    if _path is None:
+        return
+    _document.clear()
+    set_gauge("mcb_ingest_last_run_timestamp_seconds", round(time.time(), 3))
+    flush()
+
+    counters, gauges, histograms = {}, {}, {}
+    for part in sorted(glob.glob(os.path.join(_parts_dir(_path), "*.json"))):
+        with open(part) as f:
+            snapshot = json.load(f)
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, value in snapshot["gauges"]:
+            gauges[(name, tuple(map(tuple, labels)))] = value
+        for name, labels, counts, total, count in snapshot["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            old_counts, old_total, old_count = histograms.get(key, ([0] * len(BUCKETS), 0.0, 0))
+            histograms[key] = ([a + b for a, b in zip(old_counts, counts)], old_total + total,
+                               old_count + count)
+
+    tmp = f"{_path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render(counters, gauges, histograms))
+    os.replace(tmp, _path)
+    shutil.rmtree(_parts_dir(_path), ignore_errors=True)
+    print(f"Metrics: {_path}", file=sys.stderr)
+
+
+def _enable(path):
+    global _path
+    _path = path
+    tracing.add_observer(_stage_observer)
+
+
+def start(path):
+    """
+    Collect metrics in this process and every process it starts (through
+    MCB_METRICS); the textfile is written to path at exit.
+    """
+    _enable(os.path.abspath(path))
+    os.environ[METRICS_ENV] = _path
+    shutil.rmtree(_parts_dir(_path), ignore_errors=True)
+    atexit.register(finish)
+
+
+def _after_fork():
+    # A forked worker starts from an empty registry; its parent reports its own counts
+    for table in (_counters, _gauges, _histograms):
+        table.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+if os.environ.get(METRICS_ENV) and _path is None:
+    if multiprocessing.parent_process() is None:
+        start(os.environ[METRICS_ENV])
+    else:
+        _enable(os.environ[METRICS_ENV])
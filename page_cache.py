@@ -0,0 +1,213 @@
+"""
+Persistent cache of PyMuPDF page extraction results.
+
+Every script used to re-run page.get_text("words") / get_text("text") on the
+same PDFs. open_cached() returns a drop-in stand-in for fitz.open() whose
+pages answer get_text() from an on-disk cache and only decode the PDF on a
+miss. Entries are keyed by:
+
+    sha256 of the PDF bytes / PyMuPDF version / page index / extraction mode
+
+so editing a PDF, upgrading PyMuPDF or asking for a different mode never
+returns a stale result. Layout:
+
+    .page_cache/<sha[:2]>/<sha>/<pymupdf version>/
+        meta.json                 page count
+        0007.words-sorted.npz     boxes float64 (n, 4), ids int32 (n, 3), utf-8 text
+        0007.text.z               zlib-compressed utf-8 text
+
+Set MCB_PAGE_CACHE to move the cache, or delete the directory to clear it.
+Options the cache does not understand (clip=, textpage=, "dict", ...) fall
+through to the real page.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+
+import fitz
+import numpy as np
+
+import metrics
+import tracing
+
+CACHE_DIR = os.environ.get("MCB_PAGE_CACHE", ".page_cache")
+
+CACHED_OPTIONS = ("text", "words")
+
+_hash_memo = {}
+
+
+def file_hash(path):
+    """sha256 of a file's contents, memoized per (path, size, mtime) for this process."""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _hash_memo:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+def atomic_write(path, data):
+    """Write bytes via a temp file + rename so parallel workers never see partial files."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def encode_words(words):
+    """Pack word tuples into compact arrays (returned as a dict for np.savez)."""
+    boxes = np.array([w[:4] for w in words], dtype=np.float64).reshape(-1, 4)
+    ids = np.array([w[5:8] for w in words], dtype=np.int32).reshape(-1, 3)
+    text = "\x00".join(w[4] for w in words).encode("utf-8")
+    return {"boxes": boxes, "ids": ids, "text": np.frombuffer(text, dtype=np.uint8)}
+
+
+def decode_words(arrays):
+    """Inverse of encode_words: back to fitz-style (x0, y0, x1, y1, text, block, line, word)."""
+    boxes = arrays["boxes"].tolist()
+    if not boxes:
+        return []
+    ids = arrays["ids"].tolist()
+    text = arrays["text"].tobytes().decode("utf-8").split("\x00")
+    return [(*b, t, *i) for b, t, i in zip(boxes, text, ids)]
+
+
+def store_words(path, words):
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp, **encode_words(words))
+    os.replace(tmp, path)
+
+
+def store_text(path, text):
+    atomic_write(path, zlib.compress(text.encode("utf-8")))
+
+
+class CachedPage:
+    """Stands in for a fitz.Page; only get_text() is served from the cache."""
+
+    def __init__(self, document, number):
+        self.parent = document
+        self.number = number
+
+    def _path(self, mode, ext):
+        return os.path.join(self.parent.cache_path, f"{self.number:04d}.{mode}.{ext}")
+
+    def get_text(self, option="text", sort=False, **kwargs):
+        if option not in CACHED_OPTIONS or kwargs:
+            return self.parent.real_page(self.number).get_text(option, sort=sort, **kwargs)
+
+        mode = f"{option}-sorted" if sort else option
+        if option == "words":
+            path = self._path(mode, "npz")
+            if os.path.exists(path):
+                with np.load(path) as arrays:
+                    return decode_words(arrays)
+            words = self.parent.real_page(self.number).get_text("words", sort=sort)
+            store_words(path, words)
+            return words
+
+        path = self._path(mode, "z")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        text = self.parent.real_page(self.number).get_text("text", sort=sort)
+        store_text(path, text)
+        return text
+
+    def text_and_words(self, sort=True):
+        """
+        Page text and words together. On a miss both come from a single
+        TextPage, so the page is decoded once and both cache entries are filled.
+        """
+        text_path = self._path("text", "z")
+        words_path = self._path("words-sorted" if sort else "words", "npz")
+        if os.path.exists(text_path) and os.path.exists(words_path):
+            return self.get_text("text"), self.get_text("words", sort=sort)
+
+        page = self.parent.real_page(self.number)
+        textpage = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+        text = page.get_text("text", textpage=textpage)
+        words = page.get_text("words", textpage=textpage, sort=sort)
+        store_text(text_path, text)
+        store_words(words_path, words)
+        return text, words
+
+    def __getattr__(self, name):
+        # Anything else (rect, get_images, ...) comes from the real page
+        return getattr(self.parent.real_page(self.number), name)
+
+
+class CachedDocument:
+    """
+    Stands in for a fitz.Document: len(), indexing and iteration yield
+    CachedPage objects. The PDF is only opened when a page misses the cache.
+    """
+
+    def __init__(self, path, cache_dir=None):
+        self.name = path
+        sha = file_hash(path)
+        self.cache_path = os.path.join(cache_dir or CACHE_DIR, sha[:2], sha, fitz.VersionBind)
+        os.makedirs(self.cache_path, exist_ok=True)
+        self._doc = None
+
+        meta_path = os.path.join(self.cache_path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.page_count = json.load(f)["page_count"]
+        else:
+            self.page_count = len(self._real_doc())
+            atomic_write(meta_path, json.dumps({"page_count": self.page_count}).encode())
+
+    def _real_doc(self):
+        if self._doc is None:
+            with tracing.span("pdf.open", file=os.path.basename(self.name)):
+                self._doc = fitz.open(self.name)
+        return self._doc
+
+    def real_page(self, number):
+        return self._real_doc()[number]
+
+    def __len__(self):
+        return self.page_count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.page_count
+        if not 0 <= index < self.page_count:
+            raise IndexError(f"page {index} not in document")
+        return CachedPage(self, index)
+
+    def __iter__(self):
+        return (CachedPage(self, i) for i in range(self.page_count))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getattr__(self, name):
+        # Anything else (get_toc, metadata, ...) comes from the real document
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._real_doc(), name)
+
+    def close(self):
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+
+def open_cached(path, cache_dir=None):
+    """Drop-in replacement for fitz.open(path) backed by the page cache."""
+    metrics.set_document(path)
+    with tracing.span("document.open", file=os.path.basename(path)) as s:
+        doc = CachedDocument(path, cache_dir)
+        s.set(pages=doc.page_count)
+    return doc
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Page-classification index for supplier price books.
+
+Extractors used to hard-code page indices (range(5, 14), range(3, 8), a list
+of (page, product) pairs), so a new edition with one extra page broke them.
+This module labels every page of a PDF once from cheap features:
+
+    - whether a width x drop price grid is found (whole page or either half)
+    - share of numeric tokens, count of '$' tokens and '%' tokens
+    - keywords in the page text and in its outline section (doc.get_toc())
+
+and stores the result next to the page cache entries of that PDF
+(.page_cache/<sha[:2]>/<sha>/<pymupdf version>/page_index.v<N>.<code hash>.json),
+so it is rebuilt only when the PDF, PyMuPDF, INDEX_VERSION or the source of
+the classifier (CLASSIFIER_MODULES) changes. Extractors ask for the pages
+they need:
+
+    index = load_page_index(pdf_path)
+    for view in read_pages(pdf_path, index.pages(PRICE_GRID)):
+        ...
+
+Inspect an index from the command line:
+
+    python page_index.py "path/to/book.pdf" [--rebuild]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+import metrics
+from grid_extraction import classify_tokens, extract_grid
+from page_cache import atomic_write, file_hash, open_cached
+from page_reader import map_pages_parallel
+
+PRICE_GRID = "price_grid"
+EXTRAS_TABLE = "extras_table"
+FABRIC_GROUPING = "fabric_grouping"
+RULES_TEXT = "rules_text"
+BROCHURE = "brochure"
+MOTOR_LIST = "motor_list"
+
+LABELS = [PRICE_GRID, EXTRAS_TABLE, FABRIC_GROUPING, RULES_TEXT, BROCHURE, MOTOR_LIST]
+
+# Bump when the stored format changes so stored indexes are rebuilt
+INDEX_VERSION = 1
+
+# Modules whose source decides the labels; their hash is part of the index
+# file name, so editing the classifier or grid detection rebuilds indexes
+CLASSIFIER_MODULES = ["page_index.py", "grid_extraction.py", "row_clustering.py"]
+
+# Pages with fewer words than this are covers, dividers or pictures
+MIN_CONTENT_WORDS = 15
+# A page of $-prefixed numbers (curtain width/price tables) is a price grid
+MIN_GRID_DOLLARS = 20
+MIN_GRID_NUMERIC_SHARE = 0.4
+# Fabric grouping rows are mostly numbers (No., group, width)
+MIN_FABRIC_NUMERIC_SHARE = 0.2
+# Priced option lists
+MIN_EXTRAS_DOLLARS = 5
+MIN_MOTOR_MENTIONS = 3
+
+RULE_KEYWORDS = ["extra", "surcharge", "add", "deduct", "warranty", "terms", "conditions",
+                 "measurement", "minimum", "maximum", "gst"]
+
+
+def _has_grid(view):
+    """True when a price grid is found on the page or on either half of it."""
+    if not view.words:
+        return False
+    with metrics.labelled(phase="classify"):
+        if extract_grid(view.words) is not None:
+            return True
+        # Two grids side by side (NBS rollers) defeat the whole-page header check
+        boxes = view.boxes
+        middle = (boxes[:, 0].min() + boxes[:, 2].max()) / 2
+        return extract_grid(view.left_of(middle)) is not None or extract_grid(view.right_of(middle)) is not None
+
+
+def page_features(view):
+    """Cheap per-page features used by classify_page (JSON-serialisable)."""
+    text = np.array([w[4] for w in view.words], dtype=str)
+    _, is_number, _ = classify_tokens(text)
+    lower = view.text.lower()
+    return {
+        "words": len(view.words),
+        "numeric_share": round(float(is_number.mean()), 3) if len(text) else 0.0,
+        "dollars": int(np.char.count(text, "$").astype(bool).sum()) if len(text) else 0,
+        "percents": int(np.char.count(text, "%").astype(bool).sum()) if len(text) else 0,
+        "has_grid": _has_grid(view),
+        "fabric_header": "fabric" in lower and "group" in lower,
+        "motor_mentions": len(re.findall(r"\bmotor", lower)),
+        "rule_keywords": sum(1 for k in RULE_KEYWORDS if re.search(rf"\b{k}", lower)),
+    }
+
+
+def classify_page(features, section=""):
+    """Label one page from its features and the title of its outline section."""
+    section = (section or "").lower()
+    if features["words"] < MIN_CONTENT_WORDS:
+        return BROCHURE
+    if features["has_grid"]:
+        return PRICE_GRID
+    if features["motor_mentions"] >= MIN_MOTOR_MENTIONS or "motor" in section:
+        return MOTOR_LIST
+    if features["dollars"] >= MIN_GRID_DOLLARS and features["numeric_share"] >= MIN_GRID_NUMERIC_SHARE:
+        return PRICE_GRID
+    if features["fabric_header"] or ("fabric" in section and "group" in section):
+        if features["dollars"] < MIN_EXTRAS_DOLLARS and features["numeric_share"] >= MIN_FABRIC_NUMERIC_SHARE:
+            return FABRIC_GROUPING
+    if features["dollars"] >= MIN_EXTRAS_DOLLARS:
+        return EXTRAS_TABLE
+    if features["rule_keywords"] >= 2 or features["percents"]:
+        return RULES_TEXT
+    return BROCHURE
+
+
+def sections_from_toc(toc, page_count):
+    """Title of the outline entry covering each page ('' before the first entry)."""
+    sections = [""] * page_count
+    for _, title, page in sorted(toc, key=lambda entry: entry[2]):
+        # page is 1-based; -1 marks entries without a target
+        if 1 <= page <= page_count:
+            for i in range(page - 1, page_count):
+                sections[i] = title.strip()
+    return sections
+
+
+class PageIndex:
+    """Labels, outline sections and features for every page of one PDF."""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def label(self, page):
+        return self.entries[page]["label"]
+
+    def section(self, page):
+        return self.entries[page]["section"]
+
+    def pages(self, *labels):
+        """Page indexes (0-based, ascending) carrying any of the given labels."""
+        return [e["page"] for e in self.entries if e["label"] in labels]
+
+    def check_pages(self, label, expected, ignored=()):
+        """
+        Raise ValueError unless the pages carrying label are exactly expected
+        plus ignored (pages known to carry it that are not read). Extractors
+        that map pages to product names call this so that a new edition or a
+        misclassified page stops the run instead of shifting every name.
+        """
+        found = set(self.pages(label))
+        missing = sorted(set(expected) - found)
+        extra = sorted(found - set(expected) - set(ignored))
+        if missing or extra:
+            raise ValueError(
+                f"{label} pages differ from the page map: "
+                f"not labelled {[p + 1 for p in missing]}, unexpected {[p + 1 for p in extra]}")
+
+
+def classifier_hash():
+    """Short hash of the CLASSIFIER_MODULES sources."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in CLASSIFIER_MODULES:
+        digest.update(file_hash(os.path.join(here, name)).encode())
+    return digest.hexdigest()[:12]
+
+
+def _index_path(doc):
+    return os.path.join(doc.cache_path, f"page_index.v{INDEX_VERSION}.{classifier_hash()}.json")
+
+
+def build_page_index(pdf_path, workers=None):
+    """Classify every page of pdf_path (features are computed in parallel)."""
+    features = map_pages_parallel(pdf_path, page_features, workers=workers)
+    with open_cached(pdf_path) as doc:
+        sections = sections_from_toc(doc.get_toc(), len(doc))
+    entries = [
+        {"page": i, "label": classify_page(features[i], sections[i]), "section": sections[i],
+         "features": features[i]}
+        for i in sorted(features)
+    ]
+    return PageIndex(entries)
+
+
+def load_page_index(pdf_path, workers=None, rebuild=False):
+    """The stored index for pdf_path, building and storing it on first use."""
+    with open_cached(pdf_path) as doc:
+        path = _index_path(doc)
+    if not rebuild and os.path.exists(path):
+        with open(path) as f:
+            index = PageIndex(json.load(f)["pages"])
+    else:
+        index = build_page_index(pdf_path, workers)
+        atomic_write(path, json.dumps({"version": INDEX_VERSION, "pages": index.entries}, indent=1).encode())
+    metrics.set_gauge("mcb_ingest_pages_skipped", sum(e["label"] == BROCHURE for e in index.entries))
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the page-classification index of supplier PDFs.")
+    parser.add_argument("pdfs", nargs="+", help="PDF files")
+    parser.add_argument("--rebuild", action="store_true", help="Reclassify even if an index is stored")
+    args = parser.parse_args()
+
+    for pdf_path in args.pdfs:
+        index = load_page_index(pdf_path, rebuild=args.rebuild)
+        print(f"\n{os.path.basename(pdf_path)}")
+        for e in index.entries:
+            f = e["features"]
+            print(f"  P{e['page'] + 1:<4} {e['label']:<16} words={f['words']:<5} "
+                  f"numeric={f['numeric_share']:<6} $={f['dollars']:<4} {e['section']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Fused single-pass page reader.
+
+The same PDF used to be walked several times: once for get_text("text"),
+again for get_text("words", sort=True), then the word list was re-filtered for
+header bands and left/right halves. read_pages() decodes each page once (one
+TextPage, via the page cache) and hands every consumer a PageView holding the
+text, the words and cheap region views over them.
+
+map_pages_parallel() runs a per-page function over a PDF on a process pool,
+each worker reading its own run of pages. Its default pool size is
+MCB_PAGE_WORKERS when set (process_all sets it in its own workers so that
+jobs running side by side do not each start a pool of every core).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import metrics
+import tracing
+from page_cache import open_cached
+
+PAGE_WORKERS_ENV = "MCB_PAGE_WORKERS"
+
+
+def default_workers():
+    """Pool size when none is given: MCB_PAGE_WORKERS, else the number of cores."""
+    return int(os.environ.get(PAGE_WORKERS_ENV) or 0) or os.cpu_count() or 1
+
+
+class PageView:
+    """Everything extracted from one page in a single decode."""
+
+    def __init__(self, number, text, words):
+        self.number = number
+        self.text = text
+        self.words = words
+        self._boxes = None
+
+    @property
+    def boxes(self):
+        """(n, 4) float array of word boxes, built on first use."""
+        if self._boxes is None:
+            self._boxes = np.array([w[:4] for w in self.words], dtype=float).reshape(-1, 4)
+        return self._boxes
+
+    def _select(self, mask):
+        return [self.words[i] for i in np.flatnonzero(mask)]
+
+    def region(self, x0=-np.inf, y0=-np.inf, x1=np.inf, y1=np.inf):
+        """Words lying entirely inside the rectangle."""
+        b = self.boxes
+        return self._select((b[:, 0] >= x0) & (b[:, 1] >= y0) & (b[:, 2] <= x1) & (b[:, 3] <= y1))
+
+    def left_of(self, x):
+        """Words ending left of x (the left half of a split grid page)."""
+        return self._select(self.boxes[:, 2] < x)
+
+    def right_of(self, x):
+        """Words starting right of x."""
+        return self._select(self.boxes[:, 0] > x)
+
+    def above(self, y, words=None):
+        """Words whose top is above y, optionally from a pre-filtered list."""
+        if words is None:
+            return self._select(self.boxes[:, 1] < y)
+        return [w for w in words if w[1] < y]
+
+
+def read_page(page):
+    """Build a PageView from a cached or plain PyMuPDF page with one decode."""
+    with tracing.span("page.text", page=page.number + 1) as s:
+        if hasattr(page, "text_and_words"):
+            text, words = page.text_and_words(sort=True)
+        else:
+            textpage = page.get_textpage()
+            text = page.get_text("text", textpage=textpage)
+            words = page.get_text("words", textpage=textpage, sort=True)
+        s.set(words=len(words))
+    metrics.inc("mcb_ingest_pages_total")
+    return PageView(page.number, text, words)
+
+
+def read_pages(pdf_path, page_numbers=None):
+    """Yield a PageView for each requested page (all pages by default)."""
+    with open_cached(pdf_path) as doc:
+        if page_numbers is None:
+            page_numbers = range(len(doc))
+        for i in page_numbers:
+            if i < len(doc):
+                yield read_page(doc[i])
+
+
+def _map_page_run(pdf_path, page_numbers, func):
+    """Worker: apply func to each PageView in a run of pages."""
+    results = {view.number: func(view) for view in read_pages(pdf_path, page_numbers)}
+    tracing.flush()
+    metrics.flush()
+    return results
+
+
+def map_pages_parallel(pdf_path, func, page_numbers=None, workers=None):
+    """
+    Apply func(PageView) to pages of a PDF on a process pool and return
+    {page_index: result}. func must be picklable (a module-level function or
+    a functools.partial of one). Pages are split into contiguous runs, one per
+    worker (default_workers() when not given); with workers=1 everything runs
+    in the calling process.
+    """
+    if page_numbers is None:
+        with open_cached(pdf_path) as doc:
+            page_numbers = range(len(doc))
+    page_numbers = list(page_numbers)
+    workers = max(1, min(workers or default_workers(), len(page_numbers)))
+
+    if workers == 1:
+        return _map_page_run(pdf_path, page_numbers, func)
+
+    size = -(-len(page_numbers) // workers)
+    chunks = [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_map_page_run, pdf_path, c, func) for c in chunks]
+        for future in futures:
+            results.update(future.result())
+    return results
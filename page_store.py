@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Full-text page store for the supplier library (SQLite FTS5).
+
+Finding "which pages mention Zero Gravity" used to mean re-opening every PDF
+and testing substrings page by page. `ingest` loads the text of every page of
+every supplier PDF into a local FTS5 table once; `query` then answers from the
+index with ranked hits and snippets.
+
+    python page_store.py ingest                      # every PDF under BASE_PATH
+    python page_store.py ingest path/to/book.pdf ...
+    python page_store.py query "zero gravity"
+    python page_store.py query "surcharge OR extra" --supplier NBS --limit 5
+
+Queries use FTS5 syntax (phrases in quotes, OR/NOT, prefix*). Documents whose
+bytes have not changed since the last ingest are skipped. The database lives
+in supplier_pages.db (set MCB_PAGE_STORE to move it).
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from page_cache import file_hash, open_cached
+
+BASE_PATH = "A Supplier Pricing, Info & Brochures (Alex Website)"
+
+DB_PATH = os.environ.get("MCB_PAGE_STORE", "supplier_pages.db")
+
+# Checked in order; anything else uses the first word of the file name
+SUPPLIERS = ["Creative", "NBS", "Shutter Tech", "Tate Volitakis"]
+
+# "07July2025", "Mar2025", "Jun25", "01Sept2023", or a bare year
+EDITION_PATTERN = re.compile(
+    r"\d{0,2}(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\d{2,4}|\b(?:19|20)\d{2}\b")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    filename TEXT UNIQUE NOT NULL,
+    supplier TEXT NOT NULL,
+    edition TEXT,
+    sha256 TEXT NOT NULL,
+    page_count INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+    text,
+    supplier UNINDEXED,
+    edition UNINDEXED,
+    filename UNINDEXED,
+    page UNINDEXED,
+    document_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def supplier_of(filename):
+    for supplier in SUPPLIERS:
+        if filename.startswith(supplier):
+            return supplier
+    return filename.split()[0]
+
+
+def edition_of(filename):
+    """Last date-like token in the file name ('Mar2025'), or None."""
+    matches = EDITION_PATTERN.findall(os.path.splitext(filename)[0])
+    return matches[-1] if matches else None
+
+
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _page_texts(pdf_path):
+    """Worker: text of every page of one PDF (through the page cache)."""
+    with open_cached(pdf_path) as doc:
+        return [page.get_text("text") for page in doc]
+
+
+def ingest(pdf_paths, db_path=DB_PATH, workers=None, force=False):
+    """
+    Load every page of pdf_paths into the store. Unchanged documents are
+    skipped unless force is set. Returns the number of documents (re)loaded.
+    """
+    conn = connect(db_path)
+    known = {filename: sha for filename, sha in conn.execute("SELECT filename, sha256 FROM documents")}
+
+    stale = []
+    for path in pdf_paths:
+        filename = os.path.basename(path)
+        if not force and known.get(filename) == file_hash(path):
+            print(f"[SKIPPED] {filename} (unchanged)")
+        else:
+            stale.append(path)
+    if not stale:
+        return 0
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(stale)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        texts = list(pool.map(_page_texts, stale))
+
+    with conn:
+        for path, page_texts in zip(stale, texts):
+            filename = os.path.basename(path)
+            supplier, edition = supplier_of(filename), edition_of(filename)
+            old = conn.execute("SELECT id FROM documents WHERE filename = ?", (filename,)).fetchone()
+            if old:
+                conn.execute("DELETE FROM pages WHERE document_id = ?", (old[0],))
+                conn.execute("DELETE FROM documents WHERE id = ?", (old[0],))
+            doc_id = conn.execute(
+                "INSERT INTO documents (filename, supplier, edition, sha256, page_count) VALUES (?, ?, ?, ?, ?)",
+                (filename, supplier, edition, file_hash(path), len(page_texts)),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO pages (text, supplier, edition, filename, page, document_id) VALUES (?, ?, ?, ?, ?, ?)",
+                [(text, supplier, edition, filename, i + 1, doc_id) for i, text in enumerate(page_texts)],
+            )
+            print(f"[OK] {filename} ({len(page_texts)} pages, {supplier} {edition or ''})")
+    conn.close()
+    return len(stale)
+
+
+def search(query, db_path=DB_PATH, supplier=None, edition=None, limit=20):
+    """
+    Ranked page hits for an FTS5 query, best first:
+    [(supplier, edition, filename, page, snippet)].
+    """
+    sql = ("SELECT supplier, edition, filename, page, snippet(pages, 0, '[', ']', '...', 12) "
+           "FROM pages WHERE pages MATCH ?")
+    params = [query]
+    if supplier:
+        sql += " AND supplier = ?"
+        params.append(supplier)
+    if edition:
+        sql += " AND edition = ?"
+        params.append(edition)
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+
+    conn = connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def _library_pdfs():
+    if not os.path.isdir(BASE_PATH):
+        return []
+    return sorted(os.path.join(BASE_PATH, f) for f in os.listdir(BASE_PATH) if f.lower().endswith(".pdf"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text page store for supplier PDFs.")
+    parser.add_argument("--db", default=DB_PATH, help=f"Database file (default: {DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_cmd = commands.add_parser("ingest", help="Load page text into the store")
+    ingest_cmd.add_argument("pdfs", nargs="*", help=f"PDFs to load (default: every PDF under {BASE_PATH})")
+    ingest_cmd.add_argument("--workers", type=int, default=None, help="Pool size (default: number of cores)")
+    ingest_cmd.add_argument("--force", action="store_true", help="Reload even unchanged documents")
+
+    query_cmd = commands.add_parser("query", help="Search the store")
+    query_cmd.add_argument("query", help="FTS5 query, e.g. '\"zero gravity\"' or 'surcharge OR extra'")
+    query_cmd.add_argument("--supplier", help="Only this supplier (e.g. NBS, Creative)")
+    query_cmd.add_argument("--edition", help="Only this edition (e.g. Mar2025)")
+    query_cmd.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        pdfs = args.pdfs or _library_pdfs()
+        if not pdfs:
+            parser.error("No PDFs to ingest")
+        ingest(pdfs, args.db, args.workers, args.force)
+        return 0
+
+    try:
+        hits = search(args.query, args.db, args.supplier, args.edition, args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"Bad query: {e}")
+        return 1
+    for supplier, edition, filename, page, snippet in hits:
+        snippet = " ".join(snippet.split())
+        print(f"{supplier} {edition or ''} | {filename} p{page}\n    {snippet}")
+    if not hits:
+        print("No matches.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,11 @@
-import fitz
+from page_cache import open_cached
 import re
 import pandas as pd
 import os
 import sys
 
 def parse_creative_curtains(file_path):
-    doc = fitz.open(file_path)
+    doc = open_cached(file_path)
     
     # --- Part 1: Fabric Groups (Pages 2-3) ---
     fabrics = []
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Server-side pricing with the same rules as the quote tool.
+
+Mirrors mcb-quote-tool/src/lib/pricing.ts (calculate_grid_price and friends:
+grid[width][drop], status ok / out_of_range / error) and the product-level
+calculatePrice of src/features/quoting/pricing.ts (price group / fullness grid
+keys, drop-major grids, price-group multiplier, "Priced @ ..." notes).
+
+Lookups follow the "next highest" rule: the first step >= the value, a value
+below the first step takes the first step, a value above the last is out of
+range. The TypeScript scans the steps linearly; here single lookups bisect
+and batches use numpy.searchsorted, both over the running maximum of the steps
+(identical to the linear scan for any step order, including the few garbled
+drop_steps vectors in external_grids.json).
+
+    from pricing import calculate_price, quote_batch
+    calculate_price(product, 1450, 2100, price_group={"group_code": "2", "multiplier": 1.0})
+    quote_batch(product, widths, drops)          # arrays of tens of thousands of openings
+
+    python pricing.py mcb-quote-tool/external_grids.json 1450 2100 --group 2
+"""
+
+import argparse
+import json
+import math
+import sys
+from bisect import bisect_left
+from collections import namedtuple
+from itertools import accumulate
+
+import numpy as np
+
+GRID, SQM, UNIT = "grid", "sqm", "unit"
+CURTAINS = "Curtains"
+EXTERNAL_BLINDS = "External Blinds"
+
+# Batch status codes
+OK, WIDTH_OUT_OF_RANGE, DROP_OUT_OF_RANGE, ERROR = 0, 1, 2, 3
+
+BatchQuote = namedtuple("BatchQuote", ["price", "status", "width_index", "drop_index"])
+ActiveGrid = namedtuple("ActiveGrid", ["grid", "drop_major", "multiplier", "warning"])
+
+
+def _js_number(value):
+    """A number as JavaScript prints it in a template string (1200.0 -> '1200', nan -> 'NaN')."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return "NaN" if math.isnan(value) else ("Infinity" if value > 0 else "-Infinity")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _js_truthy(value):
+    """JavaScript truthiness of a JSON value: {} and [] are true, None, "", 0 and NaN false."""
+    if isinstance(value, (dict, list)):
+        return True
+    return bool(value) and value == value
+
+
+def step_bounds(steps):
+    """Running maximum of the steps: the ascending keys every lookup searches."""
+    return list(accumulate(steps, max))
+
+
+def find_next_highest_index(steps, value):
+    """
+    Index of the first step >= value (0 below the first step), or -1 when
+    value is above every step or NaN. Same result as findNextHighestIndex.
+    """
+    if value != value:
+        # NaN compares false with every step: the linear scan finds none
+        return -1
+    bounds = step_bounds(steps)
+    i = bisect_left(bounds, value)
+    return i if i < len(bounds) else -1
+
+
+def find_next_highest_indices(steps, values):
+    """find_next_highest_index over an array of values (-1 where out of range)."""
+    bounds = np.maximum.accumulate(np.asarray(steps, dtype=float)) if len(steps) else np.empty(0)
+    idx = np.searchsorted(bounds, np.asarray(values, dtype=float), side="left")
+    return np.where(idx < len(bounds), idx, -1)
+
+
+def grid_array(grid):
+    """A (possibly ragged) list-of-lists grid as a float array, NaN where there is no price."""
+    rows = grid or []
+    cols = max((len(r) for r in rows), default=0)
+    out = np.full((len(rows), cols), np.nan)
+    for i, row in enumerate(rows):
+        out[i, :len(row)] = [np.nan if v is None else v for v in row]
+    return out
+
+
+# --- lib/pricing.ts ---
+
+def calculate_grid_price(pricing_data, width, drop, price_group_multiplier=1.0):
+    """Grid price (grid[width][drop]) as {"price", "status", "message"?}."""
+    width_steps = pricing_data.get("width_steps")
+    drop_steps = pricing_data.get("drop_steps")
+    grid = pricing_data.get("grid")
+    if width_steps is None or drop_steps is None or grid is None:
+        return {"price": 0, "status": "error", "message": "Invalid pricing data"}
+
+    width_index = find_next_highest_index(width_steps, width)
+    drop_index = find_next_highest_index(drop_steps, drop)
+    if width_index == -1:
+        return {"price": 0, "status": "out_of_range",
+                "message": f"Width {_js_number(width)}mm exceeds max {_js_number(width_steps[-1])}mm"}
+    if drop_index == -1:
+        return {"price": 0, "status": "out_of_range",
+                "message": f"Drop {_js_number(drop)}mm exceeds max {_js_number(drop_steps[-1])}mm"}
+
+    row = grid[width_index] if width_index < len(grid) else None
+    base_price = row[drop_index] if row is not None and drop_index < len(row) else None
+    if base_price is None:
+        return {"price": 0, "status": "error", "message": "Price not found in grid"}
+    return {"price": base_price * price_group_multiplier, "status": "ok"}
+
+
+def calculate_sqm_price(pricing_data, width, drop):
+    sqm = (width / 1000) * (drop / 1000)
+    price = sqm * pricing_data["price_per_sqm"]
+    return {"price": max(price, pricing_data.get("min_charge") or 0), "status": "ok"}
+
+
+def calculate_unit_price(pricing_data, size_key):
+    price = (pricing_data.get("sizes") or {}).get(size_key)
+    if price is None:
+        return {"price": 0, "status": "error", "message": f"Size {size_key} not available"}
+    return {"price": price, "status": "ok"}
+
+
+def get_actual_grid_size(pricing_data, width, drop):
+    """The (width, drop) steps a size is priced at; None where out of range."""
+    width_index = find_next_highest_index(pricing_data["width_steps"], width)
+    drop_index = find_next_highest_index(pricing_data["drop_steps"], drop)
+    return (pricing_data["width_steps"][width_index] if width_index >= 0 else None,
+            pricing_data["drop_steps"][drop_index] if drop_index >= 0 else None)
+
+
+def get_pricing_limits(pricing_data):
+    """(min width, max width, min drop, max drop)."""
+    widths, drops = pricing_data["width_steps"], pricing_data["drop_steps"]
+    return widths[0], widths[-1], drops[0], drops[-1]
+
+
+# --- features/quoting/pricing.ts ---
+
+def active_grid(product, price_group=None, fullness=None):
+    """
+    The grid a grid-priced product is quoted from, as calculatePrice picks it:
+    curtains by "<group>_<fullness>", external blinds and everything else by
+    group code (first grid when there is none). Standard grids may be either
+    orientation; curtains and external blinds are always [drop][width].
+    """
+    data = product.get("pricing_data") or {}
+    grids, grid = data.get("grids"), data.get("grid")
+    width_steps, drop_steps = data.get("width_steps"), data.get("drop_steps")
+    group_code = (price_group or {}).get("group_code")
+    multiplier = (price_group or {}).get("multiplier") or 1.0
+
+    # Checks test JavaScript truthiness, as pricing.ts does: grids = {} is
+    # present (so a legacy "grid" beside it is never used) but has no keys
+    valid_steps = _js_truthy(width_steps) and _js_truthy(drop_steps)
+    if product.get("category") == CURTAINS:
+        if not _js_truthy(grids) or not valid_steps:
+            return ActiveGrid(None, True, 1.0, "Invalid pricing data")
+        key = f"{group_code or '1'}_{fullness or '100'}"
+        if not _js_truthy(grids.get(key)):
+            return ActiveGrid(None, True, 1.0, f"Price grid not found for key: {key}")
+        return ActiveGrid(grids[key], True, 1.0, None)
+
+    if product.get("category") == EXTERNAL_BLINDS:
+        if not _js_truthy(grids) or not valid_steps:
+            return ActiveGrid(None, True, multiplier, "Invalid pricing data")
+        key = group_code or next(iter(grids), None) or "1"
+        if not _js_truthy(grids.get(key)):
+            return ActiveGrid(None, True, multiplier, f"Price grid not found for Group {key}")
+        return ActiveGrid(grids[key], True, multiplier, None)
+
+    if (not _js_truthy(grids) and not _js_truthy(grid)) or not valid_steps:
+        return ActiveGrid(None, True, multiplier, "Invalid pricing data")
+    key = group_code or (next(iter(grids), None) if _js_truthy(grids) else None) or "1"
+    chosen = None
+    if _js_truthy(grids):
+        chosen = grids.get(key)
+        if not _js_truthy(chosen):
+            # Case-insensitive fallback
+            chosen = next((grids[k] for k in grids if k.lower() == key.lower()), None)
+    elif _js_truthy(grid):
+        chosen = grid
+    if not _js_truthy(chosen):
+        return ActiveGrid(None, True, multiplier, f"Price grid not found for Group {key}")
+    drop_major = len(chosen) == len(drop_steps) and bool(chosen) and len(chosen[0]) == len(width_steps)
+    return ActiveGrid(chosen, drop_major, multiplier, None)
+
+
+def calculate_price(product, width, drop, price_group=None, fullness=None):
+    """One opening, as calculatePrice: {"price", "warning"?, "note"?}."""
+    pricing_type = product.get("pricing_type")
+    data = product.get("pricing_data") or {}
+
+    if pricing_type == SQM:
+        sqm = (width / 1000) * (drop / 1000)
+        multiplier = (price_group or {}).get("multiplier") or 1.0
+        return {"price": sqm * (data.get("price_per_sqm") or 0) * multiplier, "note": f"Area: {sqm:.2f} sqm"}
+    if pricing_type != GRID:
+        return {"price": 0}
+
+    selected = active_grid(product, price_group, fullness)
+    if selected.warning:
+        return {"price": 0, "warning": selected.warning}
+
+    width_steps, drop_steps = data["width_steps"], data["drop_steps"]
+    width_index = find_next_highest_index(width_steps, width)
+    drop_index = find_next_highest_index(drop_steps, drop)
+    if width_index == -1:
+        return {"price": 0, "warning": f"Width {_js_number(width)}mm exceeds max {_js_number(width_steps[-1])}mm"}
+    if drop_index == -1:
+        return {"price": 0, "warning": f"Drop {_js_number(drop)}mm exceeds max {_js_number(drop_steps[-1])}mm"}
+
+    row, col = (drop_index, width_index) if selected.drop_major else (width_index, drop_index)
+    cells = selected.grid[row] if row < len(selected.grid) else []
+    price = (cells[col] if col < len(cells) else None) or 0
+    return {"price": price * selected.multiplier,
+            "note": f"Priced @ {_js_number(width_steps[width_index])}W x {_js_number(drop_steps[drop_index])}D Bracket"}
+
+
+def calculate_extra_price(extra, base_price, width, drop):
+    """An extra's price for one opening, by its price_type (as calculateExtraPrice)."""
+    price_type, price = extra.get("price_type"), extra["price"]
+    if price_type == "per_metre_width":
+        return price * (width / 1000)
+    if price_type == "per_sqm":
+        return price * (width / 1000) * (drop / 1000)
+    if price_type == "percentage":
+        return base_price * (price / 100)
+    return price
+
+
+def quote_batch(product, widths, drops, price_group=None, fullness=None):
+    """
+    calculate_price for arrays of widths and drops at once (grid products).
+    Returns a BatchQuote of arrays: price (0 where not priced), status
+    (OK / WIDTH_OUT_OF_RANGE / DROP_OUT_OF_RANGE / ERROR) and the bracket
+    indices (-1 out of range). batch_result() turns one entry back into the
+    calculate_price dict.
+    """
+    widths = np.asarray(widths, dtype=float)
+    drops = np.asarray(drops, dtype=float)
+    n = len(widths)
+    data = product.get("pricing_data") or {}
+    selected = active_grid(product, price_group, fullness) if product.get("pricing_type") == GRID else None
+    if selected is None or selected.warning:
+        return BatchQuote(np.zeros(n), np.full(n, ERROR, dtype=np.int8),
+                          np.full(n, -1, dtype=np.intp), np.full(n, -1, dtype=np.intp))
+
+    width_index = find_next_highest_indices(data["width_steps"], widths)
+    drop_index = find_next_highest_indices(data["drop_steps"], drops)
+    status = np.full(n, OK, dtype=np.int8)
+    status[drop_index < 0] = DROP_OUT_OF_RANGE
+    status[width_index < 0] = WIDTH_OUT_OF_RANGE
+
+    prices = grid_array(selected.grid)
+    if not selected.drop_major:
+        prices = prices.T
+    # Pad so every in-range bracket has a cell; missing cells price at 0 (as "|| 0" does)
+    padded = np.zeros((len(data["drop_steps"]) + 1, len(data["width_steps"]) + 1))
+    rows, cols = min(prices.shape[0], padded.shape[0]), min(prices.shape[1], padded.shape[1])
+    padded[:rows, :cols] = np.nan_to_num(prices[:rows, :cols], nan=0.0)
+
+    price = padded[drop_index, width_index] * selected.multiplier
+    price[status != OK] = 0.0
+    return BatchQuote(price, status, width_index, drop_index)
+
+
+def batch_result(product, quote, i, widths, drops, price_group=None, fullness=None):
+    """Entry i of a BatchQuote in calculate_price's {"price", "warning"/"note"} form."""
+    data = product.get("pricing_data") or {}
+    status = quote.status[i]
+    if status == ERROR:
+        return calculate_price(product, float(widths[i]), float(drops[i]), price_group, fullness)
+    if status == WIDTH_OUT_OF_RANGE:
+        return {"price": 0, "warning": f"Width {_js_number(float(widths[i]))}mm exceeds max "
+                                       f"{_js_number(data['width_steps'][-1])}mm"}
+    if status == DROP_OUT_OF_RANGE:
+        return {"price": 0, "warning": f"Drop {_js_number(float(drops[i]))}mm exceeds max "
+                                       f"{_js_number(data['drop_steps'][-1])}mm"}
+    w, d = data["width_steps"][quote.width_index[i]], data["drop_steps"][quote.drop_index[i]]
+    return {"price": float(quote.price[i]), "note": f"Priced @ {_js_number(w)}W x {_js_number(d)}D Bracket"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price one opening against every product in a file.")
+    parser.add_argument("products", help="JSON array or JSON Lines of products (pricing_type, pricing_data)")
+    parser.add_argument("width", type=float)
+    parser.add_argument("drop", type=float)
+    parser.add_argument("--group", help="Price group code")
+    parser.add_argument("--multiplier", type=float, default=1.0, help="Price group multiplier")
+    parser.add_argument("--fullness", choices=["100", "160"], help="Curtain fullness")
+    args = parser.parse_args()
+
+    with open(args.products, encoding="utf-8") as f:
+        text = f.read()
+    products = json.loads(text) if text.lstrip().startswith("[") else [
+        json.loads(line) for line in text.splitlines() if line.strip()]
+    price_group = {"group_code": args.group, "multiplier": args.multiplier} if args.group else None
+
+    for product in products:
+        product.setdefault("pricing_type", GRID)
+        result = calculate_price(product, args.width, args.drop, price_group, args.fullness)
+        detail = result.get("warning") or result.get("note") or ""
+        print(f"{product.get('name', '?'):45} {result['price']:10.2f}  {detail}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
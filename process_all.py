@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Re-ingest every supplier price book in parallel.
+
+Each (document, extractor) pair below is one job. Jobs are fanned out to a
+process pool sized to the machine's cores, largest input first, so a full
+re-ingest takes roughly as long as the slowest single book. A job that
+raises is recorded and reported; it does not abort the rest of the batch.
+
+A manifest (.ingest_manifest.json) records, per job, the hashes of its input
+files, its extractor code and the outputs it produced. Jobs whose inputs and
+code are unchanged, and whose outputs are still the ones recorded, are
+skipped; --force rebuilds everything. Workbooks whose sheet contents come out
+identical are not rewritten (see workbook_io.write_workbook).
+
+Run from the repository root (the extractors use relative paths):
+
+    python process_all.py
+    python process_all.py --workers 4 --only "NBS Roller Blinds" "Tate Volitakis Installation Rates"
+    python process_all.py --trace ingest_trace.json    # Chrome trace of every stage (see tracing.py)
+    python process_all.py --metrics ingest.prom        # Prometheus textfile of run metrics (see metrics.py)
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import metrics
+import tracing
+from page_cache import file_hash
+from page_reader import PAGE_WORKERS_ENV
+
+BASE_PATH = "A Supplier Pricing, Info & Brochures (Alex Website)"
+
+
+def _pdf(filename):
+    return os.path.join(BASE_PATH, filename)
+
+
+# inputs are passed to the function first, then extra_args
+Job = namedtuple("Job", ["name", "module", "function", "inputs", "outputs", "extra_args"])
+
+
+def _job(name, module, function, inputs, outputs, extra_args=()):
+    return Job(name, module, function, list(inputs), list(outputs), list(extra_args))
+
+
+JOBS = [
+    _job("Creative Internal Blinds", "process_creative_internal", "process_creative_internal",
+         [_pdf("Creative Internal Blinds Pricing 07July2025.pdf")],
+         ["Products/Creative Internal Blinds.xlsx"]),
+    _job("Creative External Blinds", "process_creative_external", "process_creative_external",
+         [_pdf("Creative External Blinds Pricing 07July2025.pdf")],
+         ["Products/Creative External Blinds.xlsx"]),
+    _job("Creative Curtains", "process_creative_curtains", "process_creative_curtains",
+         [_pdf("Creative Curtains Pricing Jun25.pdf")],
+         ["Products/Creative Curtains.xlsx"], ["Products/Creative Curtains.xlsx"]),
+    _job("Creative Doors", "process_creative_doors", "process_creative_doors",
+         [_pdf("Creative Doors Fly Screen & Security Door Pricing 2024.pdf"),
+          _pdf("Creative Doors Invisi-Gard Security Door Pricing 2024.pdf")],
+         ["Products/Creative Doors.xlsx"]),
+    _job("NBS Aluminium Venetians", "process_nbs_batch1", "process_nbs_book",
+         [_pdf("NBS Aluminium Venetians 25mm & 50mm Pricing Mar2025.pdf")],
+         ["Products/NBS Aluminium Venetians.xlsx"], ["NBS Aluminium Venetians"]),
+    _job("NBS Honeycomb Blinds", "process_nbs_batch1", "process_nbs_book",
+         [_pdf("NBS Honeycomb Blinds (Arena) Pricing Mar2025.pdf")],
+         ["Products/NBS Honeycomb Blinds.xlsx"], ["NBS Honeycomb Blinds"]),
+    _job("NBS PVC Venetian", "process_nbs_batch2", "process_pvc_venetian",
+         [_pdf("NBS PVC Venetian (Tuscany) Pricing Mar2025.pdf")],
+         ["Products/NBS PVC Venetian.xlsx"]),
+    _job("NBS Plantation Shutters", "process_nbs_batch2", "process_plantation_shutters",
+         [_pdf("NBS Plantation Shutters Pricing (PVC, Timber & Aluminium) Mar2025.pdf")],
+         ["Products/NBS Plantation Shutters.xlsx"]),
+    _job("NBS Roller Blinds", "process_nbs_batch3", "process_nbs_roller_blinds",
+         [_pdf("NBS Roller Blinds (Blockout & Screens) Mar2025.pdf")],
+         ["Products/NBS Roller Blinds.xlsx"]),
+    _job("NBS Woodlike Venetians", "process_nbs_batch3", "process_nbs_woodlike",
+         [_pdf("NBS Woodlike Venetians (Urbanwood) Mar2025.pdf")],
+         ["Products/NBS Woodlike Venetians.xlsx"]),
+    _job("NBS Roller Blinds (Deep)", "process_nbs_rollers_deep", "process_nbs_rollers_deep",
+         [_pdf("NBS Roller Blinds (Blockout & Screens) Mar2025.pdf")],
+         ["Products/NBS Roller Blinds (Deep).xlsx"]),
+    _job("Shutter Tech Roller Shutter", "process_final_batch", "process_shutter_tech",
+         [_pdf("Shutter Tech Roller Shutter Pricing 01Sept2023.xlsm")],
+         ["Products/Shutter Tech Roller Shutter.xlsx"]),
+    _job("Tate Volitakis Installation Rates", "process_final_batch", "process_tate",
+         [_pdf("Tate Volitakis Installation Rates Pricing 01Nov2025.pdf")],
+         ["Products/Tate Volitakis Installation Rates.xlsx"]),
+]
+
+# Every extractor depends on these; editing one invalidates all jobs
+SHARED_MODULES = ["grid_extraction.py", "row_clustering.py", "page_cache.py", "page_reader.py", "page_index.py",
+                  "workbook_io.py"]
+
+MANIFEST_PATH = ".ingest_manifest.json"
+
+
+def _input_size(paths):
+    """Total size of the existing files among paths (for scheduling)."""
+    return sum(os.path.getsize(p) for p in paths if os.path.isfile(p))
+
+
+# --- Build manifest ---
+
+def _hash_file(path):
+    if not os.path.isfile(path):
+        return None
+    return file_hash(path)
+
+
+def job_fingerprint(job):
+    """Hashes of everything that determines a job's outputs."""
+    code = [f"{job.module}.py"] + SHARED_MODULES
+    return {
+        "inputs": {p: _hash_file(p) for p in job.inputs},
+        "code": {p: _hash_file(p) for p in code},
+        "args": job.extra_args,
+        "function": job.function,
+    }
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def is_up_to_date(job, manifest):
+    """True when inputs and code are unchanged and every recorded output is still intact."""
+    entry = manifest.get(job.name)
+    if not entry or entry["fingerprint"] != job_fingerprint(job):
+        return False
+    return all(_hash_file(p) == h for p, h in entry["outputs"].items())
+
+
+def record_job(job, manifest):
+    manifest[job.name] = {
+        "fingerprint": job_fingerprint(job),
+        "outputs": {p: _hash_file(p) for p in job.outputs},
+    }
+
+
+def run_job(name, module_name, function_name, args):
+    """Worker entry point. Never raises: returns (name, ok, seconds, error)."""
+    start = time.perf_counter()
+    try:
+        with tracing.span("job", supplier=name, extractor=f"{module_name}.{function_name}"):
+            module = importlib.import_module(module_name)
+            getattr(module, function_name)(*args)
+        return name, True, time.perf_counter() - start, None
+    except Exception:
+        return name, False, time.perf_counter() - start, traceback.format_exc()
+    finally:
+        tracing.flush()
+        metrics.flush()
+
+
+def _limit_page_workers(page_workers):
+    """Pool initializer: size the page pools extractors start inside this worker."""
+    os.environ[PAGE_WORKERS_ENV] = str(page_workers)
+
+
+def run_all(jobs, workers=None):
+    """
+    Run jobs on a process pool and return a list of
+    (name, ok, seconds, error) in completion order. The cores are shared out
+    between jobs, so extractors that parallelise over pages start pools of
+    cores // workers (at least 1, i.e. no pool) instead of one per core each.
+    """
+    workers = workers or os.cpu_count() or 1
+    page_workers = max(1, (os.cpu_count() or 1) // workers)
+    # Longest jobs first keeps the pool busy until the end
+    jobs = sorted(jobs, key=lambda job: _input_size(job.inputs), reverse=True)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_limit_page_workers,
+                             initargs=(page_workers,)) as pool:
+        futures = {
+            pool.submit(run_job, job.name, job.module, job.function, job.inputs + job.extra_args): job.name
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception:
+                # The worker process itself died (e.g. a crash inside PyMuPDF)
+                result = (futures[future], False, 0.0, traceback.format_exc())
+            name, ok, seconds, _ = result
+            print(f"[{'OK' if ok else 'FAILED'}] {name} ({seconds:.1f}s)")
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-ingest supplier price books in parallel.")
+    parser.add_argument("--workers", type=int, default=None, help="Pool size (default: number of cores)")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Run only the named jobs")
+    parser.add_argument("--force", action="store_true", help="Rebuild even when inputs and code are unchanged")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome trace of every stage to FILE")
+    parser.add_argument("--metrics", metavar="FILE", help="Write a Prometheus textfile of run metrics to FILE")
+    args = parser.parse_args()
+
+    if args.trace:
+        tracing.start(args.trace)
+    if args.metrics:
+        metrics.start(args.metrics)
+
+    jobs = JOBS
+    if args.only:
+        jobs = [job for job in JOBS if job.name in args.only]
+        unknown = set(args.only) - {job.name for job in jobs}
+        if unknown:
+            parser.error(f"Unknown job(s): {', '.join(sorted(unknown))}")
+
+    manifest = load_manifest()
+    stale = []
+    for job in jobs:
+        if not args.force and is_up_to_date(job, manifest):
+            print(f"[SKIPPED] {job.name} (unchanged)")
+            metrics.inc("mcb_ingest_jobs_total", status="skipped")
+        else:
+            stale.append(job)
+
+    start = time.perf_counter()
+    results = run_all(stale, args.workers)
+    failed = [r for r in results if not r[1]]
+
+    by_name = {job.name: job for job in stale}
+    for name, ok, seconds, _ in results:
+        metrics.inc("mcb_ingest_jobs_total", status="ok" if ok else "failed")
+        metrics.set_gauge("mcb_ingest_job_seconds", round(seconds, 3), job=name)
+        if ok:
+            record_job(by_name[name], manifest)
+        else:
+            manifest.pop(name, None)
+    save_manifest(manifest)
+    metrics.set_gauge("mcb_ingest_run_seconds", round(time.perf_counter() - start, 3))
+
+    print(f"\n{len(results) - len(failed)}/{len(results)} jobs succeeded in {time.perf_counter() - start:.1f}s")
+    for name, _, _, error in failed:
+        print(f"\n--- {name} ---\n{error}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
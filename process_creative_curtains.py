@@ -1,28 +1,22 @@
-import fitz
 import pandas as pd
-import os
 import re
 import sys
 
+from page_index import FABRIC_GROUPING, PRICE_GRID, load_page_index
+from page_reader import read_pages
+from row_clustering import group_text_into_rows
+from workbook_io import write_workbook
+
 def process_creative_curtains(pdf_path, output_path):
     print(f"Processing {pdf_path}...")
-    doc = fitz.open(pdf_path)
+    index = load_page_index(pdf_path)
     
     # --- Fabrics Extraction ---
     fabrics = []
     valid_suppliers = ["Charles Parsons", "Hoad", "Warwick", "James Dunlop", "Zepel", "Filigree", "Basford", "Maurice Kain", "Nettex", "Shaw", "Texstyle", "Wilson", "Four Families"]
     
-    for i in [1, 2]:
-        page = doc[i]
-        words = page.get_text("words", sort=True)
-        rows = {}
-        for w in words:
-            y = round(w[1], 1)
-            if y not in rows: rows[y] = []
-            rows[y].append(w[4])
-        
-        for y in sorted(rows.keys()):
-            row_words = rows[y]
+    for view in read_pages(pdf_path, index.pages(FABRIC_GROUPING)):
+        for row_words in group_text_into_rows(view.words):
             if len(row_words) < 4: continue
             
             # Expecting: Index Supplier... Range... Width Group
@@ -57,18 +51,12 @@ def process_creative_curtains(pdf_path, output_path):
     # --- Pricing Extraction ---
     pricing_rows = []
     
-    for i in range(3, 8): # Pages 4-8 -> Groups 1-5
-        group_num = i - 2
-        page = doc[i]
-        words = page.get_text("words", sort=True)
-        rows = {}
-        for w in words:
-            y = round(w[1], 1)
-            if y not in rows: rows[y] = []
-            rows[y].append(w[4])
+    for n, view in enumerate(read_pages(pdf_path, index.pages(PRICE_GRID))):
+        # One page per price group ("Group 01" in the page heading)
+        match_group = re.search(r'Group\s*0*(\d+)', view.text, re.IGNORECASE)
+        group_num = int(match_group.group(1)) if match_group else n + 1
             
-        for y in sorted(rows.keys()):
-            row_words = rows[y]
+        for row_words in group_text_into_rows(view.words):
             clean_words = [w.replace('$', '').replace(',', '') for w in row_words]
             
             # Look for: Width Price1 Price2
@@ -123,11 +111,8 @@ def process_creative_curtains(pdf_path, output_path):
         print("Warning: No pricing rows extracted!")
     
     # Write to Excel
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        df_fabrics.to_excel(writer, sheet_name='Fabrics', index=False)
-        df_pricing.to_excel(writer, sheet_name='Pricing', index=False)
-        
-    print(f"Saved to {output_path}")
+    if write_workbook(output_path, {'Fabrics': df_fabrics, 'Pricing': df_pricing}):
+        print(f"Saved to {output_path}")
 
 if __name__ == "__main__":
     if len(sys.argv) > 2:
@@ -1,19 +1,17 @@
-import fitz
 import re
 import pandas as pd
 import os
 
+from page_cache import open_cached
+from row_clustering import group_text_into_rows
+from workbook_io import write_workbook
+
 def get_rows_from_page(page):
     words = page.get_text("words", sort=True)
-    rows = {}
-    for w in words:
-        y = round(w[1], 1)
-        if y not in rows: rows[y] = []
-        rows[y].append(w[4])
-    return [rows[y] for y in sorted(rows.keys())]
+    return group_text_into_rows(words)
 
 def extract_from_flyscreens(pdf_path):
-    doc = fitz.open(pdf_path)
+    doc = open_cached(pdf_path)
     data = []
     
     # Page 1 analysis
@@ -69,7 +67,7 @@ def extract_from_flyscreens(pdf_path):
     return pd.DataFrame(data)
 
 def extract_from_invisigard(pdf_path):
-    doc = fitz.open(pdf_path)
+    doc = open_cached(pdf_path)
     data = []
     
     for page in doc:
@@ -97,10 +95,11 @@ def extract_from_invisigard(pdf_path):
 
     return pd.DataFrame(data)
 
-def process_creative_doors():
-    base_path = "A Supplier Pricing, Info & Brochures (Alex Website)"
-    fly_path = os.path.join(base_path, "Creative Doors Fly Screen & Security Door Pricing 2024.pdf")
-    invisi_path = os.path.join(base_path, "Creative Doors Invisi-Gard Security Door Pricing 2024.pdf")
+BASE_PATH = "A Supplier Pricing, Info & Brochures (Alex Website)"
+FLY_PATH = os.path.join(BASE_PATH, "Creative Doors Fly Screen & Security Door Pricing 2024.pdf")
+INVISI_PATH = os.path.join(BASE_PATH, "Creative Doors Invisi-Gard Security Door Pricing 2024.pdf")
+
+def process_creative_doors(fly_path=FLY_PATH, invisi_path=INVISI_PATH):
     
     print("Extracting Flyscreens...")
     df_fly = extract_from_flyscreens(fly_path)
@@ -111,13 +110,13 @@ def process_creative_doors():
     print(f"Extracted {len(df_invisi)} invisi-gard items.")
     
     output_path = "Products/Creative Doors.xlsx"
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        if not df_fly.empty:
-            df_fly.to_excel(writer, sheet_name='Flyscreens', index=False)
-        if not df_invisi.empty:
-            df_invisi.to_excel(writer, sheet_name='Invisi-Gard', index=False)
-            
-    print(f"Saved to {output_path}")
+    sheets = {}
+    if not df_fly.empty:
+        sheets['Flyscreens'] = df_fly
+    if not df_invisi.empty:
+        sheets['Invisi-Gard'] = df_invisi
+    if write_workbook(output_path, sheets):
+        print(f"Saved to {output_path}")
 
 if __name__ == "__main__":
     process_creative_doors()
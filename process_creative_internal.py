@@ -1,126 +1,82 @@
-import fitz
-import pandas as pd
-import os
 import re
 
-def get_grid_from_page(page):
-    words = page.get_text("words", sort=True)
-    rows = {}
-    for w in words:
-        y = int(w[1])
-        if y not in rows: rows[y] = []
-        rows[y].append(w[4])
+from functools import partial
+
+from grid_extraction import get_grid_from_words
+from page_index import PRICE_GRID, load_page_index
+from page_reader import map_pages_parallel
+from workbook_io import write_workbook
+
+
+DEFAULT_PDF = "A Supplier Pricing, Info & Brochures (Alex Website)/Creative Internal Blinds Pricing 07July2025.pdf"
+
+PRODUCT_KEYWORDS = ["Roller Blinds", "Roman Blinds", "Panel Glides", "Vertical Blinds", "Venetian Blinds", "Pelmet", "Valance"]
+
+def scan_page(view, grid_pages):
+    """
+    Everything this book needs from one page, from a single decode:
+    (product keyword seen on the page or None, group label, grid DataFrame or None).
+    Grids are only looked for on the pages in grid_pages.
+    """
+    text = view.text
     
-    sorted_y = sorted(rows.keys())
+    # Detect Product (last matching keyword wins)
+    product = None
+    for pk in PRODUCT_KEYWORDS:
+        if pk.upper() in text.upper():
+            product = pk
     
-    # 1. Identify Width Header Row
-    width_row = []
-    width_y_index = -1
+    # Detect Group
+    group = ""
+    match_group = re.search(r'Group[-\s]*(\d+)', text, re.IGNORECASE)
+    if match_group:
+        group = f"Group {match_group.group(1)}"
     
-    for i, y in enumerate(sorted_y):
-        line = rows[y]
-        clean_line = [x for x in line if x.isdigit()]
-        if len(clean_line) > 5:
-            try:
-                nums = [int(x) for x in clean_line]
-                # Check for increasing sequence
-                if all(nums[j] <= nums[j+1] for j in range(len(nums)-1)):
-                     width_row = nums
-                     width_y_index = i
-                     break
-            except:
-                continue
-                
-    if not width_row: return None
-
-    # 2. Extract Data Rows
-    data = []
-    for i in range(width_y_index + 1, len(sorted_y)):
-        y = sorted_y[i]
-        line = rows[y]
-        
-        clean_tokens = [t.replace('$', '').replace(',', '') for t in line]
-        nums = []
-        for t in clean_tokens:
-            try: nums.append(int(float(t)))
-            except: pass
-            
-        if not nums: continue
-        
-        # Heuristic: Drop + Prices
-        # Length check
-        if len(nums) >= len(width_row):
-            # Assumption: First is Drop, Rest are Prices
-            # If len > width_row + 1, maybe extra columns?
-            # If len == width_row, usually drop + prices (total width_row + 1 items needed)
-            # Wait, if width_row has 10 items (columns), we need 11 nums (1 drop + 10 prices)
-            
-            if len(nums) >= len(width_row):
-                # Take first as drop
-                drop = nums[0]
-                # Take next N as prices
-                prices = nums[1:]
-                
-                # Check if we have enough prices
-                if len(prices) >= len(width_row) - 1: 
-                    # Allow missing last price?
-                    # or if len(nums) == len(width_row), maybe Drop is missing?
-                    # Let's assume standard format: Drop first.
-                    
-                    row_dict = {"Drop": drop}
-                    for j, w_label in enumerate(width_row):
-                        if j < len(prices):
-                            row_dict[w_label] = prices[j]
-                    data.append(row_dict)
+    grid = get_grid_from_words(view.words) if view.number in grid_pages else None
+    return product, group, grid
 
-    if data:
-        return pd.DataFrame(data)
-    return None
+def build_section_map(page_scans):
+    """
+    Returns [(product, group)] per page from scan_page results. The product
+    carries over from earlier pages until another keyword appears; the group
+    is taken from the page itself.
+    """
+    sections = []
+    current_product = "Unknown Product"
+    for product, group, _ in page_scans:
+        if product:
+            current_product = product
+        sections.append((current_product, group))
+    return sections
 
-def process_creative_internal():
-    input_pdf = "A Supplier Pricing, Info & Brochures (Alex Website)/Creative Internal Blinds Pricing 07July2025.pdf"
-    doc = fitz.open(input_pdf)
+def process_creative_internal(input_pdf=DEFAULT_PDF, workers=None):
+    # Every page is scanned for product keywords (the product carries over),
+    # but grids are only extracted from pages the index labels as price grids
+    grid_pages = frozenset(load_page_index(input_pdf, workers=workers).pages(PRICE_GRID))
+    scans = map_pages_parallel(input_pdf, partial(scan_page, grid_pages=grid_pages), workers=workers)
+    pages = sorted(scans)
+    sections = dict(zip(pages, build_section_map(scans[i] for i in pages)))
+    grids = {i: scans[i][2] for i in pages if scans[i][2] is not None}
     
-    current_product = "Unknown Product"
     extracted_sheets = {}
-    
-    product_keywords = ["Roller Blinds", "Roman Blinds", "Panel Glides", "Vertical Blinds", "Venetian Blinds", "Pelmet", "Valance"]
-    
-    for page_num, page in enumerate(doc):
-        text = page.get_text("text")
-        
-        # Detect Product
-        for pk in product_keywords:
-            if pk.upper() in text.upper():
-                current_product = pk
-                # Don't break, keep looking for specific subtypes or groups?
-        
-        # Detect Group
-        group = ""
-        match_group = re.search(r'Group[-\s]*(\d+)', text, re.IGNORECASE)
-        if match_group:
-            group = f"Group {match_group.group(1)}"
+    for page_num in sorted(grids):
+        df = grids[page_num]
+        current_product, group = sections[page_num]
+        sheet_name = f"{current_product} {group} P{page_num+1}".strip()[:31] # Excel sheet limit 31 chars
+        # Ensure unique name
+        counter = 1
+        base_name = sheet_name
+        while sheet_name in extracted_sheets:
+            sheet_name = f"{base_name} ({counter})"
+            counter += 1
             
-        # Extract Grid
-        df = get_grid_from_page(page)
-        if df is not None:
-            sheet_name = f"{current_product} {group} P{page_num+1}".strip()[:31] # Excel sheet limit 31 chars
-            # Ensure unique name
-            counter = 1
-            base_name = sheet_name
-            while sheet_name in extracted_sheets:
-                sheet_name = f"{base_name} ({counter})"
-                counter += 1
-                
-            extracted_sheets[sheet_name] = df
-            print(f"Extracted {sheet_name} ({len(df)} rows)")
+        extracted_sheets[sheet_name] = df
+        print(f"Extracted {sheet_name} ({len(df)} rows)")
 
     output_path = "Products/Creative Internal Blinds.xlsx"
     if extracted_sheets:
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            for name, df in extracted_sheets.items():
-                df.to_excel(writer, sheet_name=name, index=False)
-        print(f"Saved to {output_path}")
+        if write_workbook(output_path, extracted_sheets):
+            print(f"Saved to {output_path}")
     else:
         print("No grids found.")
 
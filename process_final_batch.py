@@ -1,10 +1,14 @@
-import fitz
 import pandas as pd
-import os
 import re
 
-def process_shutter_tech():
-    path = "A Supplier Pricing, Info & Brochures (Alex Website)/Shutter Tech Roller Shutter Pricing 01Sept2023.xlsm"
+from page_cache import open_cached
+from row_clustering import group_words_into_rows
+from workbook_io import write_workbook
+
+SHUTTER_TECH_PATH = "A Supplier Pricing, Info & Brochures (Alex Website)/Shutter Tech Roller Shutter Pricing 01Sept2023.xlsm"
+TATE_PATH = "A Supplier Pricing, Info & Brochures (Alex Website)/Tate Volitakis Installation Rates Pricing 01Nov2025.pdf"
+
+def process_shutter_tech(path=SHUTTER_TECH_PATH):
     print(f"Processing {path}...")
     try:
         xls = pd.ExcelFile(path)
@@ -15,33 +19,20 @@ def process_shutter_tech():
             print(f"  Loaded sheet: {sheet_name}")
             
         out = "Products/Shutter Tech Roller Shutter.xlsx"
-        with pd.ExcelWriter(out, engine='openpyxl') as writer:
-            for name, df in sheets.items():
-                df.to_excel(writer, sheet_name=name, index=False)
-        print(f"Saved {out}")
+        if write_workbook(out, sheets):
+            print(f"Saved {out}")
     except Exception as e:
         print(f"Failed to process Shutter Tech: {e}")
 
 def get_table_from_page(page, headers):
     # Extract rows based on Y-coordinates
     words = page.get_text("words", sort=True)
-    rows = {}
-    for w in words:
-        y = int(w[1])
-        if y not in rows: rows[y] = []
-        rows[y].sort(key=lambda x: x[0]) # Sort by X
-        rows[y].append(w)
-        
-    sorted_y = sorted(rows.keys())
     
     data = []
     
     # Heuristic: Find rows with prices ($)
-    for y in sorted_y:
-        line_words = rows[y]
-        # Sort by X
-        line_words.sort(key=lambda x: x[0])
-        
+    # Rows come back ordered left to right
+    for line_words in group_words_into_rows(words):
         # Check for prices
         prices = []
         text_parts = []
@@ -74,10 +65,9 @@ def get_table_from_page(page, headers):
             
     return pd.DataFrame(data)
 
-def process_tate():
-    path = "A Supplier Pricing, Info & Brochures (Alex Website)/Tate Volitakis Installation Rates Pricing 01Nov2025.pdf"
+def process_tate(path=TATE_PATH):
     print(f"Processing {path}...")
-    doc = fitz.open(path)
+    doc = open_cached(path)
     
     # Page 1: Internal
     h1 = ["Item", "Base Rate", "Width > 2200", "Height > 3000", "Height > 4000", "Height > 5000"]
@@ -88,10 +78,11 @@ def process_tate():
     df2 = get_table_from_page(doc[1], h2)
     
     out = "Products/Tate Volitakis Installation Rates.xlsx"
-    with pd.ExcelWriter(out, engine='openpyxl') as writer:
-        if not df1.empty: df1.to_excel(writer, sheet_name="Internal", index=False)
-        if not df2.empty: df2.to_excel(writer, sheet_name="External", index=False)
-    print(f"Saved {out}")
+    sheets = {}
+    if not df1.empty: sheets["Internal"] = df1
+    if not df2.empty: sheets["External"] = df2
+    if write_workbook(out, sheets):
+        print(f"Saved {out}")
 
 if __name__ == "__main__":
     process_shutter_tech()
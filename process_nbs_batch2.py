@@ -1,95 +1,32 @@
-import fitz
 import pandas as pd
 import os
 import re
 
-def get_grid_from_page(page):
-    words = page.get_text("words", sort=True)
-    rows = {}
-    for w in words:
-        y = int(w[1])
-        if y not in rows: rows[y] = []
-        rows[y].append(w[4])
-    
-    sorted_y = sorted(rows.keys())
-    
-    # Identify Width Header
-    width_row = []
-    width_y_index = -1
-    
-    for i, y in enumerate(sorted_y):
-        clean_line = [x for x in rows[y] if x.isdigit()]
-        if len(clean_line) > 5:
-            try:
-                nums = [int(x) for x in clean_line]
-                # Check for strictly increasing sequence
-                if all(nums[j] <= nums[j+1] for j in range(len(nums)-1)):
-                     width_row = nums
-                     width_y_index = i
-                     break
-            except:
-                continue
-                
-    if not width_row: return None
+from grid_extraction import get_grid_from_words
+from page_cache import open_cached
+from page_index import PRICE_GRID, load_page_index
+from page_reader import read_pages
+from workbook_io import write_workbook
 
-    data = []
-    for i in range(width_y_index + 1, len(sorted_y)):
-        y = sorted_y[i]
-        line = rows[y]
-        clean_tokens = [t.replace('$', '').replace(',', '') for t in line]
-        nums = []
-        for t in clean_tokens:
-             try: nums.append(int(float(t)))
-             except: pass
-             
-        if not nums: continue
-        
-        # Logic: Drop + Prices
-        # PVC Venetian has Drop at start AND end?
-        # Only take first number as Drop
-        
-        if len(nums) >= len(width_row):
-            drop = nums[0]
-            prices = nums[1:]
-            
-            row_dict = {"Drop": drop}
-            for j, val in enumerate(prices):
-                if j < len(width_row):
-                    row_dict[width_row[j]] = val
-            data.append(row_dict)
-            
-    if data: return pd.DataFrame(data)
-    return None
 
-def process_nbs_batch2():
-    base_path = "A Supplier Pricing, Info & Brochures (Alex Website)"
-    
-    # Files
-    pvc_path = os.path.join(base_path, "NBS PVC Venetian (Tuscany) Pricing Mar2025.pdf")
-    shutters_path = os.path.join(base_path, "NBS Plantation Shutters Pricing (PVC, Timber & Aluminium) Mar2025.pdf")
-    
-    output_path = "Products/NBS Batch 2.xlsx"
-    # Actually, keep distinct files if possible?
-    # Task says "seperate sheets for each file." "place all of these sheets into a the "product" folder."
-    # I'll enable saving to separate files: Products/NBS PVC Venetian.xlsx and Products/NBS Plantation Shutters.xlsx
-    
-    # 1. PVC Venetian
+def process_pvc_venetian(pvc_path):
     print(f"Processing {pvc_path}...")
-    doc = fitz.open(pvc_path)
-    # Search for Grid on Page 3 (Index 2)
-    grid_df = get_grid_from_page(doc[2])
+    # First price grid in the book (page 3 in the Mar 2025 edition)
+    grid_pages = load_page_index(pvc_path).pages(PRICE_GRID)
+    grid_df = None
+    for view in read_pages(pvc_path, grid_pages[:1]):
+        grid_df = get_grid_from_words(view.words)
     
     if grid_df is not None:
         out = "Products/NBS PVC Venetian.xlsx"
-        with pd.ExcelWriter(out, engine='openpyxl') as writer:
-            grid_df.to_excel(writer, sheet_name="PVC Venetian", index=False)
-        print(f"Saved {out}")
+        if write_workbook(out, {"PVC Venetian": grid_df}):
+            print(f"Saved {out}")
     else:
         print("Failed to extract PVC Venetian grid.")
 
-    # 2. Plantation Shutters
+def process_plantation_shutters(shutters_path):
     print(f"Processing {shutters_path}...")
-    doc = fitz.open(shutters_path)
+    doc = open_cached(shutters_path)
     
     shutters_data = []
     
@@ -116,10 +53,21 @@ def process_nbs_batch2():
     if shutters_data:
         df = pd.DataFrame(shutters_data)
         out = "Products/NBS Plantation Shutters.xlsx"
-        df.to_excel(out, index=False)
-        print(f"Saved {out}")
+        if write_workbook(out, {"Sheet1": df}):
+            print(f"Saved {out}")
     else:
         print("No plantation shutter prices found.")
 
+def process_nbs_batch2():
+    base_path = "A Supplier Pricing, Info & Brochures (Alex Website)"
+    
+    # Files
+    pvc_path = os.path.join(base_path, "NBS PVC Venetian (Tuscany) Pricing Mar2025.pdf")
+    shutters_path = os.path.join(base_path, "NBS Plantation Shutters Pricing (PVC, Timber & Aluminium) Mar2025.pdf")
+    
+    # Saved to separate files: Products/NBS PVC Venetian.xlsx and Products/NBS Plantation Shutters.xlsx
+    process_pvc_venetian(pvc_path)
+    process_plantation_shutters(shutters_path)
+
 if __name__ == "__main__":
     process_nbs_batch2()
@@ -1,76 +1,21 @@
-import fitz
 import pandas as pd
-import os
 import re
 
-def get_grid_from_words(words):
-    rows = {}
-    for w in words:
-        y = int(w[1])
-        if y not in rows: rows[y] = []
-        rows[y].sort(key=lambda x: x[0])
-        rows[y].append(w[4])
-    
-    sorted_y = sorted(rows.keys())
-    
-    width_row = []
-    width_y_index = -1
-    
-    for i, y in enumerate(sorted_y):
-        line = rows[y]
-        clean_line = [x for x in line if x.isdigit()]
-        if len(clean_line) > 5:
-            try:
-                nums = [int(x) for x in clean_line]
-                if all(nums[j] <= nums[j+1] for j in range(len(nums)-1)):
-                     width_row = nums
-                     width_y_index = i
-                     break
-            except:
-                continue
-                
-    if not width_row: return None
+import metrics
+from grid_extraction import get_grid_from_words
+from page_index import EXTRAS_TABLE, MOTOR_LIST, PRICE_GRID, RULES_TEXT, load_page_index
+from page_reader import read_pages
+from row_clustering import group_text_into_rows
+from workbook_io import write_workbook
 
-    data = []
-    for i in range(width_y_index + 1, len(sorted_y)):
-        y = sorted_y[i]
-        line = rows[y]
-        clean_tokens = [t.replace('$', '').replace(',', '') for t in line]
-        nums = []
-        for t in clean_tokens:
-             try: nums.append(int(float(t)))
-             except: pass
-        if not nums: continue
-        
-        if len(nums) >= len(width_row):
-            drop = nums[0]
-            prices = nums[1:]
-            row_dict = {"Drop": drop}
-            for j, val in enumerate(prices):
-                if j < len(width_row):
-                    row_dict[width_row[j]] = val
-            data.append(row_dict)
-            
-    if data: return pd.DataFrame(data)
-    return None
 
-def extract_extras_table(page):
+def extract_extras_table(view):
     # Heuristic for generic table: Look for 3 columns "Item", "Cost", "Unit"
     # Or just lines with a price $XX.XX
     
     content = []
-    words = page.get_text("words", sort=True)
-    rows = {}
-    for w in words:
-        y = int(w[1])
-        if y not in rows: rows[y] = []
-        rows[y].sort(key=lambda x: x[0])
-        rows[y].append(w[4])
-        
-    sorted_y = sorted(rows.keys())
     
-    for y in sorted_y:
-        line = rows[y]
+    for line in group_text_into_rows(view.words):
         text_line = " ".join(line)
         
         # Regex to find Price at end or middle?
@@ -88,9 +33,8 @@ def extract_extras_table(page):
             
     return pd.DataFrame(content)
 
-def extract_text_rules(page):
-    text = page.get_text("text")
-    lines = text.split('\n')
+def extract_text_rules(view):
+    lines = view.text.split('\n')
     rules = []
     
     keywords = ["extra", "surcharge", "plus", "add", "deduct", "cost"]
@@ -106,34 +50,41 @@ def extract_text_rules(page):
                  
     return pd.DataFrame(rules)
 
-def process_nbs_rollers_deep():
-    path = "A Supplier Pricing, Info & Brochures (Alex Website)/NBS Roller Blinds (Blockout & Screens) Mar2025.pdf"
-    doc = fitz.open(path)
-    
+DEFAULT_PDF = "A Supplier Pricing, Info & Brochures (Alex Website)/NBS Roller Blinds (Blockout & Screens) Mar2025.pdf"
+
+def process_nbs_rollers_deep(path=DEFAULT_PDF):
     data_grids = {}
     data_extras = []
     data_rules = []
     
-    # 1. Text Rules (Pages 1-5)
-    print("Scanning rules...")
-    for i in range(5):
-        df = extract_text_rules(doc[i])
-        if not df.empty:
-            data_rules.append(df)
-            
-    # 2. Grids (Pages 6-13) - Split Page Logic
-    print("Scanning grids...")
-    for i in range(5, 14):
-        if i >= len(doc): break
-        page = doc[i]
-        words = page.get_text("words", sort=True)
+    # One pass over the labelled pages: each is decoded once and routed by its label
+    # (Mar 2025 edition: rules pages 1-5, grids 6-13, extras 14-end)
+    print("Scanning rules, grids and extras...")
+    index = load_page_index(path)
+    for view in read_pages(path, index.pages(RULES_TEXT, PRICE_GRID, EXTRAS_TABLE, MOTOR_LIST)):
+        i = view.number
+        label = index.label(i)
         
-        # Header (Top of page)
-        header_text = " ".join([w[4] for w in words if w[1] < 100])
+        # 1. Text Rules
+        if label == RULES_TEXT:
+            df = extract_text_rules(view)
+            if not df.empty:
+                data_rules.append(df)
+        
+        # 3. Extras (component and motor price lists)
+        if label in (EXTRAS_TABLE, MOTOR_LIST):
+            df = extract_extras_table(view)
+            if not df.empty:
+                data_extras.append(df)
+                metrics.inc("mcb_ingest_extras_total", len(df))
+        
+        # 2. Grids - Split Page Logic
+        if label != PRICE_GRID:
+            continue
         
         # Split Words
-        left_words = [w for w in words if w[2] < 425]
-        right_words = [w for w in words if w[0] > 425]
+        left_words = view.left_of(425)
+        right_words = view.right_of(425)
         
         df_left = get_grid_from_words(left_words)
         if df_left is not None:
@@ -147,32 +98,22 @@ def process_nbs_rollers_deep():
         if df_right is not None:
              name = f"P{i+1} Right"
              data_grids[name] = df_right
-             
-    # 3. Extras (Pages 14-End)
-    print("Scanning extras...")
-    for i in range(13, len(doc)):
-        df = extract_extras_table(doc[i])
-        if not df.empty:
-            data_extras.append(df)
             
     # Save
     out = "Products/NBS Roller Blinds (Deep).xlsx"
-    with pd.ExcelWriter(out, engine='openpyxl') as writer:
-        # Grids
-        for name, df in data_grids.items():
-            df.to_excel(writer, sheet_name=name, index=False)
-            
-        # Extras
-        if data_extras:
-            full_extras = pd.concat(data_extras)
-            full_extras.to_excel(writer, sheet_name="Extras", index=False)
-            
-        # Rules
-        if data_rules:
-            full_rules = pd.concat(data_rules)
-            full_rules.to_excel(writer, sheet_name="Surcharges & Rules", index=False)
-            
-    print(f"Saved {out}")
+    # Grids
+    sheets = dict(data_grids)
+        
+    # Extras
+    if data_extras:
+        sheets["Extras"] = pd.concat(data_extras)
+        
+    # Rules
+    if data_rules:
+        sheets["Surcharges & Rules"] = pd.concat(data_rules)
+    
+    if write_workbook(out, sheets):
+        print(f"Saved {out}")
 
 if __name__ == "__main__":
     process_nbs_rollers_deep()
@@ -0,0 +1,75 @@
+"""
+Row clustering for PDF word boxes.
+
+Extractors used to bucket words by int(y) or round(y, 1), so the same visual
+row could split or merge depending on which script ran. This module gives every
+extractor the same row model:
+
+    1. Sort all words once by (top, left).
+    2. Sweep the sorted tops: a word whose top is within `tolerance` points
+       of the previous word's top joins the same row, otherwise a new row starts.
+    3. Order words left to right inside each row.
+
+Cost is O(n log n) for the sorts plus one linear pass.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Words whose tops differ by no more than this many points share a row
+DEFAULT_ROW_TOLERANCE = 2.0
+
+# order    -- permutation of the input words into (row, x) order
+# row_ids  -- row index of each word in that order
+# starts   -- first position of each row in the ordered words
+# ends     -- one past the last position of each row
+# top      -- smallest y0 in each row
+# bottom   -- largest y1 in each row
+RowSpans = namedtuple("RowSpans", ["order", "row_ids", "starts", "ends", "top", "bottom"])
+
+
+def cluster_rows(boxes, tolerance=DEFAULT_ROW_TOLERANCE):
+    """Cluster an (n, 4) array of (x0, y0, x1, y1) boxes into RowSpans."""
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    n = len(boxes)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return RowSpans(empty, empty, empty, empty, np.zeros(0), np.zeros(0))
+
+    x0 = boxes[:, 0]
+    y0 = boxes[:, 1]
+
+    by_y = np.lexsort((x0, y0))
+    new_row = np.diff(y0[by_y]) > tolerance
+    row_of_sorted = np.concatenate(([0], np.cumsum(new_row)))
+
+    # Rows are already contiguous; re-order each one left to right
+    within = np.lexsort((x0[by_y], row_of_sorted))
+    order = by_y[within]
+    row_ids = row_of_sorted[within]
+
+    starts = np.flatnonzero(np.concatenate(([True], row_ids[1:] != row_ids[:-1])))
+    ends = np.append(starts[1:], n)
+    top = np.minimum.reduceat(y0[order], starts)
+    bottom = np.maximum.reduceat(boxes[order, 3], starts)
+    return RowSpans(order, row_ids, starts, ends, top, bottom)
+
+
+def group_words_into_rows(words, tolerance=DEFAULT_ROW_TOLERANCE):
+    """
+    Group PyMuPDF word tuples into visual rows.
+
+    Returns a list of rows from top to bottom, each a list of the
+    original word tuples ordered left to right.
+    """
+    if not words:
+        return []
+    spans = cluster_rows([w[:4] for w in words], tolerance)
+    ordered = [words[i] for i in spans.order]
+    return [ordered[s:e] for s, e in zip(spans.starts, spans.ends)]
+
+
+def group_text_into_rows(words, tolerance=DEFAULT_ROW_TOLERANCE):
+    """Same as group_words_into_rows but each row holds only the word strings."""
+    return [[w[4] for w in row] for row in group_words_into_rows(words, tolerance)]
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Synthetic supplier price books for scale and accuracy testing.
+
+The real supplier PDFs are small and cannot be committed, so this writes PDFs
+(reportlab) that imitate their layouts, plus a ground-truth JSON of every
+value printed:
+
+    grid       width header + drop rows, "$" prices (NBS / Creative internal)
+    split      two grids side by side on a landscape page (NBS rollers, cut at x=425)
+    group      Group-01..04 grids stacked on one page (Creative external)
+    fabric     "No. Group Fabric Type / Fabric / Supplier / W (m)" rows, the 6-line
+               blocks of the fabric grouping tables, with the "<Product> - Fabric
+               Grouping  (<Month Year>)" title at the foot of the first page
+    extras     "ITEM Picture Cost Unit" component lists with $ prices
+
+Noise (0..1) adds sub-tolerance jitter to every word, thousands separators,
+running headers/footers and stray notes, as the real books have.
+
+    python synth_pricebook.py -o /tmp/book.pdf --grid-pages 1000
+    python synth_pricebook.py -o /tmp/fabrics.pdf --grid-pages 0 --fabric-rows 10000
+    python synth_pricebook.py -o /tmp/book.pdf --noise 0.5 --check
+
+The ground truth goes to <pdf>.truth.json. --check extracts the grids back
+with grid_extraction and reports how many match the truth exactly.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+
+from page_index import EXTRAS_TABLE, FABRIC_GROUPING, PRICE_GRID
+
+# x where process_nbs_rollers_deep.py splits a page into two grids
+SPLIT_X = 425
+
+FABRIC_TYPES = ["Block Out", "Light Filter", "Screen", "Sunscreen", "Translucent"]
+FABRIC_WORDS = ["Kleenscreen", "Sanctuary", "Bancoora", "Focus", "Vibe", "Aventus", "Zen", "Metro",
+                "Linesque", "Mode", "Serene", "Jersey", "Karma", "Balmoral", "Como", "Nouveau"]
+FABRIC_SUPPLIERS = ["Texstyle", "Shaw", "4-Families", "H.Douglas", "Vertilux", "Uniline"]
+EXTRA_ITEMS = ["Pin End", "Direct Drive", "Gear Drive", "Tube Adapter", "Bracket", "Double Bracket Kit",
+               "Chain Tensioner", "Bottom Rail", "Spring Assist", "Side Channel", "Idler End"]
+UNITS = ["Each", "Set", "Per Metre", "Pair"]
+PRODUCTS = ["Roller", "Roman Blinds", "Panel Glides", "Vertical Blinds", "Straight Drop"]
+FOOTER = ["July 2025", "Synthetic Wholesale Blinds", "GST Not Included"]
+
+
+class Writer:
+    """A reportlab canvas that records the page being drawn and jitters words."""
+
+    def __init__(self, path, noise, rng):
+        self.canvas = canvas.Canvas(path, pagesize=A4, pageCompression=1)
+        self.noise = noise
+        self.rng = rng
+        self.page = 0
+        self.size = A4
+
+    def new_page(self, size=A4):
+        if self.page:
+            self.canvas.showPage()
+        self.canvas.setPageSize(size)
+        self.size = size
+        self.page += 1
+
+    def text(self, x, y, s, size=7, font="Helvetica"):
+        """Draw s with its top-left near (x, y) in page coordinates measured from the top."""
+        if self.noise:
+            x += self.rng.uniform(-1.5, 1.5) * self.noise
+            y += self.rng.uniform(-0.6, 0.6) * self.noise
+        self.canvas.setFont(font, size)
+        self.canvas.drawString(x, self.size[1] - y - size, s)
+
+    def footer(self, number):
+        if self.noise:
+            for i, line in enumerate(FOOTER):
+                self.text(40, self.size[1] - 60 + i * 10, line, size=6)
+            self.text(self.size[0] - 40, self.size[1] - 30, str(number), size=6)
+
+    def save(self):
+        self.canvas.save()
+
+
+def _money(value, noise, rng):
+    """'$123', or '$1,234' for large prices (always, with noise) as the books print them."""
+    if value >= 1000 and (noise or rng.random() < 0.5):
+        return f"${value:,}"
+    return f"${value}"
+
+
+def make_grid(rng, n_widths, n_drops):
+    """(width_steps, drop_steps, prices[drop][width]) with prices rising with size."""
+    w0, d0 = rng.choice([450, 600, 900, 960]), rng.choice([600, 900, 1000, 1200])
+    w_step, d_step = rng.choice([150, 200, 300]), rng.choice([200, 300])
+    widths = [w0 + i * w_step for i in range(n_widths)]
+    drops = [d0 + i * d_step for i in range(n_drops)]
+    base = rng.randint(60, 300)
+    prices = [[base + (w // 12) + (d // 20) + rng.randint(0, 15) for w in widths] for d in drops]
+    return widths, drops, prices
+
+
+def draw_grid(out, x, y, grid, col_width, row_height=12):
+    widths, drops, prices = grid
+    out.text(x, y, "Drop/Width", size=6)
+    for c, w in enumerate(widths):
+        out.text(x + (c + 1) * col_width, y, str(w))
+    for r, (d, row) in enumerate(zip(drops, prices), start=1):
+        out.text(x, y + r * row_height, str(d))
+        for c, price in enumerate(row):
+            out.text(x + (c + 1) * col_width, y + r * row_height, _money(price, out.noise, out.rng))
+    return y + (len(drops) + 1) * row_height
+
+
+def _grid_truth(page, position, grid):
+    widths, drops, prices = grid
+    return {"page": page, "position": position, "width_steps": widths, "drop_steps": drops, "prices": prices}
+
+
+def write_grid_pages(out, truth, count, rng):
+    for n in range(count):
+        out.new_page()
+        grid = make_grid(rng, rng.randint(8, 15), rng.randint(8, 20))
+        out.text(40, 40, f"{rng.choice(PRODUCTS)} - Price Grid {n + 1}", size=12, font="Helvetica-Bold")
+        if out.noise and rng.random() < out.noise:
+            out.text(40, 58, "Prices include standard brackets. Maximum width 3000mm.", size=7)
+        draw_grid(out, 40, 80, grid, col_width=34)
+        out.footer(out.page)
+        truth["pages"].append({"page": out.page, "label": PRICE_GRID, "layout": "grid"})
+        truth["grids"].append(_grid_truth(out.page, "page", grid))
+
+
+def write_split_pages(out, truth, count, rng):
+    size = landscape(A4)
+    for n in range(count):
+        out.new_page(size)
+        out.text(40, 30, f"Roller Blinds - Page {n + 1}", size=12, font="Helvetica-Bold")
+        for position, x in (("left", 30), ("right", SPLIT_X + 10)):
+            grid = make_grid(rng, 10, rng.randint(8, 16))
+            out.text(x, 52, f"{position.title()} range", size=8)
+            draw_grid(out, x, 70, grid, col_width=34)
+            truth["grids"].append(_grid_truth(out.page, position, grid))
+        out.footer(out.page)
+        truth["pages"].append({"page": out.page, "label": PRICE_GRID, "layout": "split"})
+
+
+def write_group_pages(out, truth, count, rng):
+    for n in range(count):
+        out.new_page()
+        n_widths = rng.randint(10, 15)
+        template = make_grid(rng, n_widths, 8)
+        out.text(40, 30, f"External Blind {n + 1}", size=12, font="Helvetica-Bold")
+        y = 52
+        for group in range(1, 5):
+            widths, drops, prices = template
+            grid = (widths, drops, [[p + 25 * (group - 1) for p in row] for row in prices])
+            out.text(40, y, f"Group-0{group}", size=8, font="Helvetica-Bold")
+            y = draw_grid(out, 40, y + 16, grid, col_width=34) + 16
+            truth["grids"].append(_grid_truth(out.page, f"group-{group}", grid))
+        out.footer(out.page)
+        truth["pages"].append({"page": out.page, "label": PRICE_GRID, "layout": "group"})
+
+
+def write_fabric_pages(out, truth, rows, rng, rows_per_page=48):
+    columns = [40, 75, 115, 200, 330, 430]
+    product = rng.choice(PRODUCTS)
+    group = 1
+    for start in range(0, rows, rows_per_page):
+        out.new_page()
+        for x, heading in zip(columns, ["No.", "Group", "Fabric Type", "Fabric", "Supplier", "W (m)"]):
+            out.text(x, 40, heading, size=8, font="Helvetica-Bold")
+        for r in range(start, min(start + rows_per_page, rows)):
+            if rng.random() < 0.15:
+                group = min(group + 1, 9)
+            fabric = {
+                "no": r + 1,
+                "group": group,
+                "fabric_type": rng.choice(FABRIC_TYPES),
+                "name": f"{rng.choice(FABRIC_WORDS)} {rng.choice(['B/O', 'LF', '5%', '10%', 'Translucent'])}",
+                "supplier": rng.choice(FABRIC_SUPPLIERS),
+                "width": rng.choice(["2.4", "2.8", "3.0", "3.1"]),
+            }
+            y = 56 + (r - start) * 14
+            for x, key in zip(columns, ["no", "group", "fabric_type", "name", "supplier", "width"]):
+                out.text(x, y, str(fabric[key]))
+            truth["fabrics"].append(dict(fabric, page=out.page))
+        if start == 0:
+            # The real tables carry their title at the foot of the first page
+            out.text(40, out.size[1] - 90, f"{product} - Fabric Grouping  (July 2025)", size=11,
+                     font="Helvetica-Bold")
+        out.footer(out.page)
+        truth["pages"].append({"page": out.page, "label": FABRIC_GROUPING, "layout": "fabric",
+                               "section": f"{product} - Fabric Grouping"})
+
+
+def write_extras_pages(out, truth, rows, rng, rows_per_page=40):
+    for start in range(0, rows, rows_per_page):
+        out.new_page()
+        out.text(40, 30, "Additional components and prices", size=12, font="Helvetica-Bold")
+        for x, heading in zip([40, 260, 340, 420], ["ITEM", "Picture", "Cost", "Unit"]):
+            out.text(x, 52, heading, size=8, font="Helvetica-Bold")
+        for r in range(start, min(start + rows_per_page, rows)):
+            extra = {
+                "name": f"{rng.choice([38, 40, 45, 50, 55])}mm {rng.choice(EXTRA_ITEMS)} {r + 1}",
+                "price": round(rng.uniform(1, 250), 2),
+                "unit": rng.choice(UNITS),
+            }
+            y = 70 + (r - start) * 16
+            out.text(40, y, extra["name"])
+            out.text(340, y, f"${extra['price']:,.2f}")
+            out.text(420, y, extra["unit"])
+            truth["extras"].append(dict(extra, page=out.page))
+        out.footer(out.page)
+        truth["pages"].append({"page": out.page, "label": EXTRAS_TABLE, "layout": "extras"})
+
+
+def generate(path, grid_pages=10, split_pages=5, group_pages=5, fabric_rows=200, extras_rows=60,
+             noise=0.0, seed=0):
+    """Write a synthetic book to path and return its ground truth (also saved as <path>.truth.json)."""
+    rng = random.Random(seed)
+    out = Writer(path, noise, rng)
+    truth = {"pdf": path, "seed": seed, "noise": noise, "pages": [], "grids": [], "fabrics": [], "extras": []}
+
+    write_grid_pages(out, truth, grid_pages, rng)
+    write_split_pages(out, truth, split_pages, rng)
+    write_group_pages(out, truth, group_pages, rng)
+    if fabric_rows:
+        write_fabric_pages(out, truth, fabric_rows, rng)
+    if extras_rows:
+        write_extras_pages(out, truth, extras_rows, rng)
+    if not out.page:
+        out.new_page()
+    out.save()
+
+    with open(f"{path}.truth.json", "w") as f:
+        json.dump(truth, f)
+    return truth
+
+
+def check_grids(path, truth):
+    """Extract every ground-truth grid back; returns (exact matches, total)."""
+    import fitz
+
+    from grid_extraction import extract_grid, extract_grid_groups
+
+    matched = 0
+    doc = fitz.open(path)
+    by_page = {}
+    for grid in truth["grids"]:
+        by_page.setdefault(grid["page"], []).append(grid)
+
+    for page_number, expected in by_page.items():
+        words = doc[page_number - 1].get_text("words", sort=True)
+        if expected[0]["position"] in ("left", "right"):
+            found = [extract_grid([w for w in words if w[2] < SPLIT_X]),
+                     extract_grid([w for w in words if w[0] > SPLIT_X])]
+        elif expected[0]["position"].startswith("group-"):
+            found = [grid for _, grid in extract_grid_groups(words)]
+        else:
+            found = [extract_grid(words)]
+        for want, got in zip(expected, found):
+            if got is not None and (got.width_steps.tolist() == want["width_steps"]
+                                    and got.drop_steps.tolist() == want["drop_steps"]
+                                    and got.prices.tolist() == want["prices"]):
+                matched += 1
+    doc.close()
+    return matched, len(truth["grids"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic supplier price book with ground truth.")
+    parser.add_argument("-o", "--out", required=True, help="Output PDF")
+    parser.add_argument("--grid-pages", type=int, default=10, help="Single-grid pages")
+    parser.add_argument("--split-pages", type=int, default=5, help="Left/right split grid pages")
+    parser.add_argument("--group-pages", type=int, default=5, help="Stacked Group-01..04 grid pages")
+    parser.add_argument("--fabric-rows", type=int, default=200, help="Fabric grouping table rows")
+    parser.add_argument("--extras-rows", type=int, default=60, help="Extras list rows")
+    parser.add_argument("--noise", type=float, default=0.0, help="Layout noise, 0..1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="Extract the grids back and score them")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    truth = generate(args.out, args.grid_pages, args.split_pages, args.group_pages,
+                     args.fabric_rows, args.extras_rows, args.noise, args.seed)
+    print(f"Wrote {args.out}: {len(truth['pages'])} pages, {len(truth['grids'])} grids, "
+          f"{len(truth['fabrics'])} fabrics, {len(truth['extras'])} extras "
+          f"in {time.perf_counter() - start:.1f}s (truth: {args.out}.truth.json)")
+
+    if args.check:
+        matched, total = check_grids(args.out, truth)
+        print(f"Grids extracted exactly: {matched}/{total}")
+        return 0 if matched == total else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
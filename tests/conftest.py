@@ -0,0 +1,44 @@
+import os
+import sys
+import uuid
+from urllib.parse import quote
+
+import pytest
+
+# The scripts are flat top-level modules; make them importable from tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A throwaway Postgres for the database tests (a postgresql:// URL); they are
+# skipped without one
+TEST_DSN = os.environ.get("MCB_TEST_DATABASE_URL")
+
+
+@pytest.fixture
+def pg():
+    """
+    (cursor, connection URL) for a fresh schema holding bulk_load's
+    LOCAL_SCHEMA tables; the URL puts that schema first on the search_path,
+    so other connections see the same tables. Dropped afterwards.
+    """
+    psycopg = pytest.importorskip("psycopg")
+
+    from bulk_load import LOCAL_SCHEMA
+
+    if not TEST_DSN:
+        pytest.skip("MCB_TEST_DATABASE_URL is not set")
+    try:
+        conn = psycopg.connect(TEST_DSN, autocommit=True)
+    except psycopg.OperationalError as e:
+        pytest.skip(f"no Postgres available: {e}")
+    schema = f"mcb_test_{uuid.uuid4().hex[:8]}"
+    with conn, conn.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}")
+        cur.execute(f"SET search_path TO {schema}, public")
+        cur.execute(LOCAL_SCHEMA)
+        try:
+            options = quote(f"-csearch_path={schema},public")
+            yield cur, f"{TEST_DSN}{'&' if '?' in TEST_DSN else '?'}options={options}"
+        finally:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from batch_quote import Catalog, parse_measurement, parse_quantity, price_chunk
+from grid_codec import read_products
+from pricing import calculate_price
+
+EXTERNAL_GRIDS = os.path.join(os.path.dirname(__file__), "..", "mcb-quote-tool", "external_grids.json")
+PRODUCT = "Creative Recloth"
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    groups = [{"category": "External Blinds", "group_code": "2", "multiplier": "1.5"}]
+    return Catalog(read_products(EXTERNAL_GRIDS), price_groups=groups)
+
+
+@pytest.mark.parametrize("value, quantity", [(None, 1), ("", 1), (" ", 1), ("0", 0), ("3", 3), ("2.0", 2)])
+def test_quantity(value, quantity):
+    assert parse_quantity(value) == (quantity, None)
+
+
+@pytest.mark.parametrize("value", ["-1", "1.5", "abc"])
+def test_invalid_quantity_is_rejected(value):
+    quantity, warning = parse_quantity(value)
+    assert quantity == 0 and warning
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "", None, "wide"])
+def test_measurement_must_be_a_finite_number(value):
+    assert parse_measurement(value) is None
+
+
+@pytest.mark.parametrize("width, drop, price_group", [
+    (1450, 2100, None),   # bracket note
+    (1450, 2100, "2"),    # price group multiplier
+    (99999, 2100, None),  # width out of range
+    (1450, 99999, "2"),   # drop out of range
+])
+def test_line_matches_calculate_price(catalog, width, drop, price_group):
+    row = {"product": PRODUCT, "width": str(width), "drop": str(drop), "price_group": price_group, "quantity": "2"}
+    [line] = price_chunk(catalog, [row])
+    group = catalog.price_groups.get(("", "external blinds", "2")) if price_group else None
+    expected = calculate_price(catalog.products["creative recloth"], width, drop, group)
+    assert line["base_price"] == round(expected["price"], 2)
+    assert line["line_total"] == round(expected["price"] * 2, 2)
+    assert line["note"] == expected.get("note")
+    assert line["warning"] == expected.get("warning")
+
+
+def test_multiplier_is_applied(catalog):
+    [line] = price_chunk(catalog, [{"product": PRODUCT, "width": "1450", "drop": "2100", "price_group": "2"}])
+    group_2 = calculate_price(catalog.products["creative recloth"], 1450, 2100, {"group_code": "2", "multiplier": 1.0})
+    assert line["base_price"] == round(group_2["price"] * 1.5, 2)
+
+
+@pytest.mark.parametrize("width", ["nan", "inf", "-5"])
+def test_bad_measurement_is_a_warning(catalog, width):
+    [line] = price_chunk(catalog, [{"product": PRODUCT, "width": width, "drop": "2100"}])
+    assert line["warning"] == "Width must be greater than 0"
+    assert line["line_total"] == 0
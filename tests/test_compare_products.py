@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pytest
+
+from batch_quote import Catalog
+from compare_products import Comparison, cheapest_two, price_matrix, stack_grids
+from grid_codec import read_products
+from pricing import GRID, calculate_price
+
+EXTERNAL_GRIDS = os.path.join(os.path.dirname(__file__), "..", "mcb-quote-tool", "external_grids.json")
+
+# Group 4 is missing from the Veue grids: those products cannot price it
+VARIANTS = [(None, None), ("2", None), ("4", None)]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    products = [dict(p, pricing_type=GRID) for p in read_products(EXTERNAL_GRIDS)]
+    groups = [{"category": "External Blinds", "group_code": "2", "multiplier": "1.5"}]
+    return Catalog(products, price_groups=groups)
+
+
+def _expected(catalog, product, width, drop, code):
+    group, _, _ = catalog.price_group(product, {"price_group": code})
+    result = calculate_price(product, width, drop, group, None)
+    return result["price"] if result["price"] > 0 and not result.get("warning") else np.inf
+
+
+def test_matrix_matches_calculate_price(catalog):
+    products = list(catalog.products.values())
+    stacked = stack_grids(catalog, products, VARIANTS)
+    rng = np.random.default_rng(0)
+    widths, drops = rng.uniform(0, 7500, 300).round(), rng.uniform(0, 4000, 300).round()
+    variant = rng.integers(0, len(VARIANTS), 300)
+
+    matrix = price_matrix(stacked, widths, drops, variant)
+    assert matrix.shape == (300, len(products))
+    assert 0 < np.isfinite(matrix).sum() < matrix.size
+    for i in range(300):
+        for p, product in enumerate(products):
+            code = VARIANTS[variant[i]][0]
+            assert matrix[i, p] == _expected(catalog, product, widths[i], drops[i], code)
+
+
+@pytest.mark.parametrize("eligible", [
+    [[False, False, False]],  # no candidate
+    [[True, False, False]],   # one candidate, its price +inf (not on its grid)
+])
+def test_cheapest_two_without_candidates(eligible):
+    matrix = np.array([[np.inf, 200.0, 300.0]])
+    assert cheapest_two(matrix, np.array(eligible)) == ([-1], [np.inf], [-1], [np.inf])
+
+
+def test_cheapest_two_with_one_candidate():
+    matrix = np.array([[100.0, 200.0, 300.0], [50.0, np.inf, np.inf]])
+    eligible = np.array([[False, True, False], [True, True, True]])
+    first, first_price, second, second_price = cheapest_two(matrix, eligible)
+    assert list(first) == [1, 0] and list(first_price) == [200.0, 50.0]
+    assert list(second) == [-1, -1] and list(second_price) == [np.inf, np.inf]
+
+
+def test_cheapest_two_with_a_single_product():
+    first, first_price, second, second_price = cheapest_two(np.array([[80.0]]), np.array([[True]]))
+    assert (list(first), list(first_price), list(second), list(second_price)) == ([0], [80.0], [-1], [np.inf])
+
+
+def test_cheapest_two_with_ties():
+    matrix = np.array([[120.0, 90.0, 90.0, 90.0], [60.0, 150.0, 150.0, 40.0]])
+    eligible = np.array([[True, True, True, False], [True, True, True, False]])
+    first, first_price, second, second_price = cheapest_two(matrix, eligible)
+    # Two of the tied products, never the ineligible cheaper one
+    assert {first[0], second[0]} <= {1, 2} and first[0] != second[0]
+    assert (first_price[0], second_price[0]) == (90.0, 90.0)
+    assert (first[1], first_price[1]) == (0, 60.0)
+    assert second[1] in (1, 2) and second_price[1] == 150.0
+
+
+def test_opening_outside_one_products_grid(catalog):
+    # Recloth stops at a 3300mm drop; the Crank/Strap straight drop goes to 3600mm
+    ranges = {"Straight Drop": ["Creative Recloth", "Creative Straight Drop (Crank/Strap)"]}
+    comparison = Comparison(catalog, ranges, [(None, None)])
+    rows = [{"width": "2400", "drop": "3500", "range": "Straight Drop"},
+            {"width": "2400", "drop": "2000", "range": "Straight Drop"}]
+    matrix, eligible, (first, first_price, second, second_price) = comparison.compare(rows)
+
+    recloth, crank = comparison.products
+    assert matrix[0, 0] == np.inf and eligible[0].all()
+    assert (first[0], second[0], second_price[0]) == (1, -1, np.inf)
+    assert first_price[0] == _expected(catalog, crank, 2400, 3500, None)
+
+    prices = sorted((_expected(catalog, product, 2400, 2000, None), p) for p, product in enumerate((recloth, crank)))
+    assert [(first_price[1], first[1]), (second_price[1], second[1])] == prices
@@ -0,0 +1,117 @@
+import csv
+import json
+import os
+
+import pytest
+
+from conftest import REPO_ROOT
+from fabric_audit import (CURTAINS_CATEGORY, INTERNAL_CATEGORY, SUPPLIER, compare_roller_with_db, generate_report,
+                          read_fabrics)
+from fabric_matcher import FabricMatcher
+
+SNAPSHOT = os.path.join(REPO_ROOT, "fabrics_snapshot.csv")
+
+
+def _pdf(name, group=3):
+    return {"row": 1, "group": group, "type": "Block Out", "name": name, "supplier": "Texstyle", "width": "3.0"}
+
+
+def _db(name, group="3"):
+    return {"name": name, "price_group": group, "brand": "Texstyle"}
+
+
+def _issues(pdf_names, db_names):
+    issues = compare_roller_with_db([_pdf(n) for n in pdf_names], [_db(n) for n in db_names])
+    return {(i["type"], i.get("pdf_name") or i.get("name") or i.get("db_name")) for i in issues}
+
+
+def test_unmatched_fabric_is_missing_in_db():
+    # 'Vivid' is contained in both names, but 'Block' marks a different fabric
+    assert ("MISSING_IN_DB", "Vivid Shade") in _issues(["Vivid Shade"], ["Vivid Block"])
+
+
+def test_conflicting_type_markers_never_match():
+    assert ("MISSING_IN_DB", "Barrier Reef LF") in _issues(["Barrier Reef LF"], ["Barrier Reef B/O"])
+    assert ("MISSING_IN_DB", "Aventus 3%") in _issues(["Aventus 3%"], ["Aventus 5%"])
+
+
+def test_marker_on_one_side_still_matches_the_same_stem():
+    assert ("NAME_MISMATCH", "Dawn B/O") in _issues(["Dawn B/O"], ["Dawn"])
+
+
+def test_candidates_are_ranked():
+    matches = FabricMatcher(["Duo B/O (new)", "Duo B/O", "Duo LF"]).candidates("Duo B/O")
+    assert [m.name for m in matches] == ["Duo B/O", "Duo B/O (new)"]
+
+
+def test_repeated_db_name_keeps_the_last_row():
+    issues = compare_roller_with_db([_pdf("Dawn B/O", group=3)], [_db("Dawn B/O", "2"), _db("Dawn B/O", "3")])
+    assert not any(i["type"] == "GROUP_MISMATCH" for i in issues)
+
+
+# --- DB sources (read_fabrics) ---
+
+def _report(source, monkeypatch, capsys):
+    monkeypatch.chdir(REPO_ROOT)
+    generate_report(source=source)
+    return capsys.readouterr().out
+
+
+def test_snapshot_csv_is_read_per_product_category():
+    internal = list(read_fabrics(SNAPSHOT, SUPPLIER, INTERNAL_CATEGORY))
+    curtains = list(read_fabrics(SNAPSHOT, SUPPLIER, CURTAINS_CATEGORY))
+    assert (len(internal), len(curtains)) == (79, 51)
+    assert internal[0] == {"name": "Bancoora B/O", "price_group": "1", "brand": "4-Families"}
+    assert not list(read_fabrics(SNAPSHOT, "NBS", INTERNAL_CATEGORY))
+
+
+def test_jsonl_export_is_filtered(tmp_path):
+    path = tmp_path / "fabrics.jsonl"
+    rows = [
+        {"supplier": "Creative", "product_category": "Internal Blinds", "name": "Dawn", "price_group": 2, "brand": None},
+        {"supplier": "Creative", "product_category": "Curtains", "name": "Dusk", "price_group": "1", "brand": "Shaw"},
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    assert list(read_fabrics(str(path), SUPPLIER, INTERNAL_CATEGORY)) == [
+        {"name": "Dawn", "price_group": "2", "brand": ""}]
+
+
+def test_parquet_export_matches_the_csv(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    with open(SNAPSHOT, newline="") as f:
+        rows = list(csv.DictReader(f))
+    path = str(tmp_path / "fabrics.parquet")
+    pq.write_table(pa.Table.from_pylist(rows), path)
+    assert list(read_fabrics(path, SUPPLIER, INTERNAL_CATEGORY)) == list(read_fabrics(SNAPSHOT, SUPPLIER, INTERNAL_CATEGORY))
+
+
+def test_report_from_snapshot(monkeypatch, capsys):
+    out = _report(SNAPSHOT, monkeypatch, capsys)
+    assert "GROUP MISMATCH: 'Balmoral B/O' — PDF: Group 3, DB: 2" in out
+    assert "MISSING IN DB: 'Vivid Shade'" in out
+
+
+def test_report_from_postgres_matches_snapshot(pg, monkeypatch, capsys):
+    cur, dsn = pg
+    with open(SNAPSHOT, newline="") as f:
+        rows = list(csv.DictReader(f))
+    with cur.connection.transaction():
+        # The live table has no natural-key index and repeats a few names
+        # (Curtains 'Horizon' three times); the audit has to see them as they are
+        cur.execute("DROP INDEX fabrics_natural_key")
+        cur.executemany("INSERT INTO fabrics (supplier, product_category, name, brand, price_group)"
+                        " VALUES (%(supplier)s, %(product_category)s, %(name)s, %(brand)s, %(price_group)s)", rows)
+        # Inactive fabrics are not part of the audit
+        cur.execute("INSERT INTO fabrics (supplier, product_category, name, price_group, is_active)"
+                    " VALUES ('Creative', 'Internal Blinds', 'Vivid Shade', '2', false)")
+
+    for category in (INTERNAL_CATEGORY, CURTAINS_CATEGORY):
+        from_table = list(read_fabrics(dsn, SUPPLIER, category))
+        assert from_table == sorted(read_fabrics(SNAPSHOT, SUPPLIER, category), key=lambda r: r["name"])
+
+    def errors(out):
+        return [line for line in out.splitlines() if "🔴" in line]
+
+    assert errors(_report(dsn, monkeypatch, capsys)) == errors(_report(SNAPSHOT, monkeypatch, capsys))
+    assert "'Horizon' appears 3x" in _report(dsn, monkeypatch, capsys)
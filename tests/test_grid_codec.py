@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from grid_codec import _pricing_key_order, _same, decode_pricing_data, encode_pricing_data, read_products
+
+EXTERNAL_GRIDS = os.path.join(os.path.dirname(__file__), "..", "mcb-quote-tool", "external_grids.json")
+
+CASES = [
+    {"width_steps": [600, 900.5], "drop_steps": [1000],
+     "grids": {"1": [[10.5, None], [], [3]], "ß": [[1, 2]], "empty": []}, "notes": "kept"},
+    {"width_steps": [1.0, 2.0], "drop_steps": [3.0], "grid": [[131.0, 99.99], [0.0, None]]},
+    {"width_steps": [], "drop_steps": [], "grids": {}},
+]
+
+
+@pytest.mark.parametrize("delta", [True, False])
+@pytest.mark.parametrize("pricing_data", CASES)
+def test_round_trip_is_exact(pricing_data, delta):
+    decoded = decode_pricing_data(encode_pricing_data(pricing_data, delta))
+    assert _same(decoded, _pricing_key_order(pricing_data))
+
+
+def test_external_grids_round_trip():
+    for product in read_products(EXTERNAL_GRIDS):
+        pricing_data = product["pricing_data"]
+        assert _same(decode_pricing_data(encode_pricing_data(pricing_data)), _pricing_key_order(pricing_data))
+
+
+def test_fractions_of_a_cent_are_rejected():
+    with pytest.raises(ValueError):
+        encode_pricing_data({"width_steps": [1], "drop_steps": [1], "grid": [[1.001]]})
@@ -0,0 +1,40 @@
+import fitz
+import pytest
+
+import page_index
+from page_index import BROCHURE, PRICE_GRID, PageIndex, load_page_index
+
+
+def _index(labels):
+    return PageIndex([{"page": i, "label": label, "section": "", "features": {}} for i, label in enumerate(labels)])
+
+
+def test_check_pages_accepts_the_mapped_pages():
+    _index([BROCHURE, PRICE_GRID, PRICE_GRID, PRICE_GRID]).check_pages(PRICE_GRID, {1: "a", 2: "b"}, [3])
+
+
+@pytest.mark.parametrize("labels", [
+    [PRICE_GRID, PRICE_GRID, PRICE_GRID, PRICE_GRID],  # an index page classified as a grid
+    [BROCHURE, PRICE_GRID, BROCHURE, PRICE_GRID],      # a product page no longer a grid
+])
+def test_check_pages_rejects_a_different_page_set(labels):
+    with pytest.raises(ValueError):
+        _index(labels).check_pages(PRICE_GRID, {1: "a", 2: "b"}, [3])
+
+
+def test_load_page_index_closes_the_document(tmp_path, monkeypatch):
+    pdf = fitz.open()
+    pdf.new_page().insert_text((72, 72), "Roller Blinds")
+    pdf.save(tmp_path / "book.pdf")
+    monkeypatch.setattr("page_cache.CACHE_DIR", str(tmp_path / "cache"))
+
+    opened, open_cached = [], page_index.open_cached
+
+    def tracked(path):
+        opened.append(open_cached(path))
+        return opened[-1]
+
+    monkeypatch.setattr(page_index, "open_cached", tracked)
+    for rebuild in (True, False):
+        assert len(load_page_index(str(tmp_path / "book.pdf"), workers=1, rebuild=rebuild).entries) == 1
+    assert opened and all(doc._doc is None for doc in opened)
@@ -0,0 +1,16 @@
+from page_reader import PAGE_WORKERS_ENV, default_workers, map_pages_parallel
+
+
+def test_page_workers_env_sizes_the_default_pool(monkeypatch):
+    monkeypatch.setenv(PAGE_WORKERS_ENV, "1")
+    assert default_workers() == 1
+    monkeypatch.delenv(PAGE_WORKERS_ENV)
+    assert default_workers() >= 1
+
+
+def test_one_page_worker_runs_in_process(monkeypatch):
+    calls = []
+    monkeypatch.setenv(PAGE_WORKERS_ENV, "1")
+    monkeypatch.setattr("page_reader._map_page_run", lambda pdf, pages, func: calls.append(pages) or {})
+    map_pages_parallel("book.pdf", len, page_numbers=range(8))
+    assert calls == [list(range(8))]
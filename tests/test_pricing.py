@@ -0,0 +1,60 @@
+"""pricing.py against the results pricing.ts gives (JavaScript truthiness included)."""
+
+import os
+
+import numpy as np
+import pytest
+
+from grid_codec import read_products
+from pricing import batch_result, calculate_price, quote_batch
+
+EXTERNAL_GRIDS = os.path.join(os.path.dirname(__file__), "..", "mcb-quote-tool", "external_grids.json")
+
+LEGACY_GRID = [[100, 110], [120, 130]]
+
+
+def _product(category, **pricing_data):
+    pricing_data = {"width_steps": [1000, 2000], "drop_steps": [1000, 2000], **pricing_data}
+    return {"name": "p", "category": category, "pricing_type": "grid", "pricing_data": pricing_data}
+
+
+# (product, price group, fullness, width, drop, expected result of calculatePrice)
+TS_CASES = [
+    # grids = {} is truthy: the legacy grid beside it is never read
+    (_product("Roller Blinds", grids={}, grid=LEGACY_GRID), None, None, 1500, 900,
+     {"price": 0, "warning": "Price grid not found for Group 1"}),
+    (_product("Roller Blinds", grids=None, grid=LEGACY_GRID), None, None, 1500, 900,
+     {"price": 110.0, "note": "Priced @ 2000W x 1000D Bracket"}),
+    (_product("Roller Blinds", grids={"A": LEGACY_GRID}), {"group_code": "a", "multiplier": 2}, None, 1500, 900,
+     {"price": 220.0, "note": "Priced @ 2000W x 1000D Bracket"}),
+    (_product("Roller Blinds", grids={"1": None}, grid=LEGACY_GRID), None, None, 1500, 900,
+     {"price": 0, "warning": "Price grid not found for Group 1"}),
+    (_product("Roller Blinds"), None, None, 1500, 900, {"price": 0, "warning": "Invalid pricing data"}),
+    (_product("Curtains", grids={}), None, None, 1500, 900, {"price": 0, "warning": "Price grid not found for key: 1_100"}),
+    (_product("Curtains", grids={"2_160": LEGACY_GRID}), {"group_code": "2"}, "160", 1500, 900,
+     {"price": 110.0, "note": "Priced @ 2000W x 1000D Bracket"}),
+    (_product("External Blinds", grids={}), None, None, 1500, 900, {"price": 0, "warning": "Price grid not found for Group 1"}),
+    (_product("External Blinds", grids=None), None, None, 1500, 900, {"price": 0, "warning": "Invalid pricing data"}),
+    # NaN matches no step: findNextHighestIndex gives -1, i.e. out of range
+    (_product("Roller Blinds", grids={"1": LEGACY_GRID}), None, None, float("nan"), 900,
+     {"price": 0, "warning": "Width NaNmm exceeds max 2000mm"}),
+    (_product("External Blinds", grids={"1": LEGACY_GRID}), None, None, 1500, float("nan"),
+     {"price": 0, "warning": "Drop NaNmm exceeds max 2000mm"}),
+]
+
+
+@pytest.mark.parametrize("product, price_group, fullness, width, drop, expected", TS_CASES)
+def test_matches_pricing_ts(product, price_group, fullness, width, drop, expected):
+    assert calculate_price(product, width, drop, price_group, fullness) == expected
+    quote = quote_batch(product, [width], [drop], price_group, fullness)
+    assert batch_result(product, quote, 0, [width], [drop], price_group, fullness) == expected
+
+
+def test_batch_matches_single_quotes():
+    rng = np.random.default_rng(0)
+    widths, drops = rng.uniform(0, 6000, 500).round(), rng.uniform(0, 4000, 500).round()
+    for product in read_products(EXTERNAL_GRIDS):
+        product = dict(product, pricing_type="grid")
+        quote = quote_batch(product, widths, drops)
+        for i in range(len(widths)):
+            assert batch_result(product, quote, i, widths, drops) == calculate_price(product, widths[i], drops[i])
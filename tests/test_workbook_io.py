@@ -0,0 +1,78 @@
+import datetime
+import zipfile
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from workbook_io import CUSTOM_PROPS_PART, _sheet_parts, stored_hashes, write_workbook
+
+
+def _sheets(price):
+    return {
+        "Group 1": pd.DataFrame({"Width": [600, 1200], "Price": [price, 2.5]}),
+        "Group 2": pd.DataFrame({
+            "Name": ["Dawn", None],
+            "Updated": [pd.Timestamp("2024-03-01 09:30"), pd.NaT],
+            "Max": [np.inf, -np.inf],
+            "Count": pd.array([3, pd.NA], dtype="Int64"),
+        }),
+        "Notes": pd.DataFrame({"Note": ["a & <b>"], "Due": [datetime.date(2024, 3, 1)]}),
+    }
+
+
+def _read(path):
+    wb = load_workbook(path)
+    return {
+        ws.title: [[(cell.value, cell.number_format) for cell in row] for row in ws.iter_rows()]
+        for ws in wb.worksheets
+    }
+
+
+def _parts(path):
+    with zipfile.ZipFile(path) as zf:
+        parts = _sheet_parts(zf)
+        return {name: zf.read(part) for name, part in parts.items()}
+
+
+def test_replacing_a_sheet_reads_back_as_a_full_write(tmp_path):
+    path, full = tmp_path / "replaced.xlsx", tmp_path / "full.xlsx"
+    assert write_workbook(str(path), _sheets(1.5))
+    before = _parts(path)
+
+    # Only Group 2 changes: the zip-rewrite path
+    sheets = _sheets(1.5)
+    sheets["Group 2"].loc[1, "Updated"] = pd.Timestamp("2025-01-02 03:04:05")
+    assert write_workbook(str(path), sheets)
+    assert write_workbook(str(full), sheets)
+
+    assert _read(path) == _read(full)
+    assert _read(path)["Group 2"][1:] == [
+        [("Dawn", "General"), (datetime.datetime(2024, 3, 1, 9, 30), "yyyy-mm-dd h:mm:ss"),
+         ("inf", "General"), (3, "General")],
+        [(None, "General"), (datetime.datetime(2025, 1, 2, 3, 4, 5), "yyyy-mm-dd h:mm:ss"),
+         ("-inf", "General"), (None, "General")],
+    ]
+
+    after = _parts(path)
+    assert after["Group 1"] == before["Group 1"] and after["Notes"] == before["Notes"]
+    assert after["Group 2"] != before["Group 2"]
+    assert stored_hashes(str(path)) == stored_hashes(str(full))
+    with zipfile.ZipFile(path) as a, zipfile.ZipFile(full) as b:
+        assert a.read(CUSTOM_PROPS_PART) == b.read(CUSTOM_PROPS_PART)
+
+    assert not write_workbook(str(path), sheets)
+
+
+def test_replace_adds_date_styles_the_book_lacked(tmp_path):
+    path = tmp_path / "book.xlsx"
+    sheets = {"A": pd.DataFrame({"x": [1]}), "B": pd.DataFrame({"y": [2]})}
+    write_workbook(str(path), sheets)
+
+    sheets["B"] = pd.DataFrame({"y": [pd.Timestamp("2024-03-01"), datetime.time(12, 30), datetime.timedelta(hours=30)]})
+    write_workbook(str(path), sheets)
+    assert _read(path)["B"][1:] == [
+        [(datetime.datetime(2024, 3, 1), "yyyy-mm-dd h:mm:ss")],
+        [(datetime.time(12, 30), "h:mm:ss")],
+        [(datetime.timedelta(hours=30), "[hh]:mm:ss")],
+    ]
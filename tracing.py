@@ -0,0 +1,188 @@
+"""
+Stage-level tracing in Chrome trace-event format.
+
+Ingestion stages are wrapped in named spans with attributes:
+
+    with tracing.span("grid.detect", page=12) as s:
+        grid = ...
+        s.set(rows=len(grid.drop_steps))
+
+Tracing is off unless a run asks for it, and a disabled span costs one
+function call. Turn it on with `process_all.py --trace run.json`, or for any
+script by setting MCB_TRACE:
+
+    MCB_TRACE=run.json python process_nbs_batch3.py
+
+Every process (pool workers included) buffers its own events and appends them
+to <trace>.parts/<pid>.jsonl on flush(); when the main process exits the parts
+are merged into one trace file. Open it in chrome://tracing or
+https://ui.perfetto.dev: one row per process, spans nested by time.
+"""
+
+import atexit
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import threading
+import time
+
+TRACE_ENV = "MCB_TRACE"
+
+# Buffered events are written out once this many have accumulated
+FLUSH_EVENTS = 5000
+
+_path = None
+_events = []
+_named = False
+# Callables given (name, seconds, args) for every finished span (metrics.py)
+_observers = []
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One complete ("X") trace event, recorded when the block exits."""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.args = attrs
+        self.start = 0
+
+    def set(self, **attrs):
+        """Attach attributes known only once the work is done (rows found, ...)."""
+        self.args.update(attrs)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        for observer in _observers:
+            observer(self.name, (end - self.start) / 1e9, self.args)
+        if _path is None:
+            return False
+        _events.append({
+            "name": self.name,
+            "cat": self.name.split(".")[0],
+            "ph": "X",
+            "ts": self.start // 1000,
+            "dur": (end - self.start) // 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {k: _plain(v) for k, v in self.args.items()},
+        })
+        if len(_events) >= FLUSH_EVENTS:
+            flush()
+        return False
+
+
+def _plain(value):
+    """JSON-safe attribute value (NumPy scalars and paths included)."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def enabled():
+    return _path is not None
+
+
+def span(name, **attrs):
+    """Context manager timing a named stage; a no-op when tracing is off."""
+    if _path is None and not _observers:
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+def add_observer(observer):
+    """Also call observer(name, seconds, args) when a span ends, traced or not."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def _parts_dir(path):
+    return f"{path}.parts"
+
+
+def flush():
+    """Append this process's buffered events to its part file."""
+    global _named
+    if _path is None or not _events:
+        return
+    if not _named:
+        role = "main" if multiprocessing.parent_process() is None else "worker"
+        _events.insert(0, {"name": "process_name", "ph": "M", "pid": os.getpid(),
+                           "args": {"name": f"{os.path.basename(sys.argv[0]) or 'python'} ({role} {os.getpid()})"}})
+        _named = True
+    os.makedirs(_parts_dir(_path), exist_ok=True)
+    with open(os.path.join(_parts_dir(_path), f"{os.getpid()}.jsonl"), "a", encoding="utf-8") as f:
+        for event in _events:
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+    _events.clear()
+
+
+def finish():
+    """Flush, then merge every process's part file into the trace file."""
+    if _path is None:
+        return
+    flush()
+    events = []
+    for part in sorted(glob.glob(os.path.join(_parts_dir(_path), "*.jsonl"))):
+        with open(part, encoding="utf-8") as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    tmp = f"{_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    os.replace(tmp, _path)
+    shutil.rmtree(_parts_dir(_path), ignore_errors=True)
+    print(f"Trace: {_path} ({len(events)} events)", file=sys.stderr)
+
+
+def start(path):
+    """
+    Turn tracing on for this process and every process it starts (through
+    MCB_TRACE); the merged trace is written to path at exit.
+    """
+    global _path
+    _path = os.path.abspath(path)
+    os.environ[TRACE_ENV] = _path
+    shutil.rmtree(_parts_dir(_path), ignore_errors=True)
+    atexit.register(finish)
+
+
+def _after_fork():
+    # A forked worker must not re-emit the events its parent had buffered
+    global _named
+    _events.clear()
+    _named = False
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+if os.environ.get(TRACE_ENV):
+    if multiprocessing.parent_process() is None:
+        start(os.environ[TRACE_ENV])
+    else:
+        # Pool workers inherit the setting; the main process merges their parts
+        _path = os.environ[TRACE_ENV]
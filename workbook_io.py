@@ -0,0 +1,273 @@
+"""
+Workbook output for the Products/*.xlsx files.
+
+write_workbook() stamps each workbook with a hash of its sheet contents and a
+hash per sheet (custom document properties), then does the least work a
+re-run needs:
+
+    - nothing, when every sheet would come out identical;
+    - replace only the changed sheets' XML parts inside the existing file, when
+      the sheet names and order are unchanged;
+    - otherwise a full write.
+
+Both write paths stream rows (openpyxl write-only mode, or sheet XML written
+row by row), so memory stays flat however many sheets a book has, and the
+cost of a re-run follows the number of changed grids rather than the total.
+"""
+
+import hashlib
+import json
+import math
+import os
+import posixpath
+import shutil
+import zipfile
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell.cell import TIME_FORMATS, TIME_TYPES, get_time_format
+from openpyxl.packaging.custom import CustomPropertyList, StringProperty
+from openpyxl.styles.numbers import builtin_format_id
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
+from openpyxl.xml.functions import tostring
+
+import tracing
+
+CONTENT_HASH_PROPERTY = "content_sha256"
+SHEET_HASHES_PROPERTY = "sheet_sha256"
+
+CUSTOM_PROPS_PART = "docProps/custom.xml"
+STYLES_PART = "xl/styles.xml"
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# Serialise the rewritten stylesheet with an unprefixed main namespace
+ElementTree.register_namespace("", _MAIN_NS)
+
+
+def sheet_hash(name, df):
+    """sha256 over a sheet's name and its CSV rendering."""
+    digest = hashlib.sha256(name.encode("utf-8") + b"\x00")
+    digest.update(df.to_csv(index=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def content_hash(sheets, sheet_hashes=None):
+    """sha256 over every sheet hash, in order."""
+    sheet_hashes = sheet_hashes or {name: sheet_hash(name, df) for name, df in sheets.items()}
+    digest = hashlib.sha256()
+    for name in sheets:
+        digest.update(sheet_hashes[name].encode("ascii"))
+    return digest.hexdigest()
+
+
+def stored_hashes(path):
+    """(content hash, {sheet: hash}) recorded in an existing workbook, or (None, {})."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            tree = ElementTree.fromstring(zf.read(CUSTOM_PROPS_PART))
+    except (OSError, KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+        return None, {}
+
+    props = {prop.name: prop.value for prop in CustomPropertyList.from_tree(tree)}
+    sheet_hashes = json.loads(props.get(SHEET_HASHES_PROPERTY, "{}"), object_pairs_hook=dict)
+    return props.get(CONTENT_HASH_PROPERTY), sheet_hashes
+
+
+def stored_content_hash(path):
+    """Content hash recorded in an existing workbook, or None."""
+    return stored_hashes(path)[0]
+
+
+def _custom_props(digest, sheet_hashes):
+    props = CustomPropertyList()
+    props.append(StringProperty(name=CONTENT_HASH_PROPERTY, value=digest))
+    props.append(StringProperty(name=SHEET_HASHES_PROPERTY, value=json.dumps(sheet_hashes)))
+    return props
+
+
+def _cell_value(value):
+    """Plain Python value for a cell; None leaves the cell empty."""
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, float) and math.isinf(value):
+        # Excel has no infinity; written as to_excel's default inf_rep
+        return "inf" if value > 0 else "-inf"
+    return value
+
+
+def _rows(df):
+    """Header row then data rows, as the old index=False to_excel() laid them out."""
+    yield [_cell_value(c) for c in df.columns]
+    for row in df.itertuples(index=False, name=None):
+        yield [_cell_value(v) for v in row]
+
+
+def _write_full(path, sheets, props):
+    """Write every sheet with openpyxl's write-only (streaming) workbook."""
+    wb = Workbook(write_only=True)
+    for name, df in sheets.items():
+        ws = wb.create_sheet(title=name)
+        for row in _rows(df):
+            ws.append(row)
+    wb.custom_doc_props = props
+
+    tmp = f"{path}.{os.getpid()}.tmp.xlsx"
+    wb.save(tmp)
+    os.replace(tmp, path)
+
+
+def _time_styles(styles_xml):
+    """
+    (styles XML, {number format: cellXfs index}) with a cell format for each of
+    openpyxl's date/time number formats, added to the stylesheet where missing,
+    so replaced sheets style dates as a full write does. The XML is None when
+    nothing had to be added.
+    """
+    root = ElementTree.fromstring(styles_xml)
+    num_fmts = root.find(f"{{{_MAIN_NS}}}numFmts")
+    if num_fmts is None:
+        num_fmts = ElementTree.Element(f"{{{_MAIN_NS}}}numFmts")
+        root.insert(0, num_fmts)
+    cell_xfs = root.find(f"{{{_MAIN_NS}}}cellXfs")
+    fmt_ids = {fmt.get("formatCode"): int(fmt.get("numFmtId")) for fmt in num_fmts}
+    xfs = list(cell_xfs)
+
+    styles, added = {}, False
+    for code in TIME_FORMATS.values():
+        fmt_id = builtin_format_id(code)
+        if fmt_id is None:
+            fmt_id = fmt_ids.get(code)
+        if fmt_id is None:
+            # Custom formats are numbered from 164
+            fmt_id = max([163, *fmt_ids.values()]) + 1
+            ElementTree.SubElement(num_fmts, f"{{{_MAIN_NS}}}numFmt", numFmtId=str(fmt_id), formatCode=code)
+            fmt_ids[code] = fmt_id
+            added = True
+        index = next((i for i, xf in enumerate(xfs) if xf.get("numFmtId") == str(fmt_id)), None)
+        if index is None:
+            xf = ElementTree.SubElement(cell_xfs, f"{{{_MAIN_NS}}}xf", numFmtId=str(fmt_id), fontId="0",
+                                        fillId="0", borderId="0", applyNumberFormat="1", xfId="0")
+            xfs.append(xf)
+            index = len(xfs) - 1
+            added = True
+        styles[code] = index
+
+    if not added:
+        return None, styles
+    num_fmts.set("count", str(len(num_fmts)))
+    cell_xfs.set("count", str(len(cell_xfs)))
+    return ElementTree.tostring(root, encoding="UTF-8", xml_declaration=True), styles
+
+
+def _sheet_xml(df, time_styles):
+    """
+    Worksheet XML for a DataFrame, chunk by chunk (strings are inline; dates
+    and times are serial numbers styled from time_styles, as openpyxl writes them).
+    """
+    yield (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+           f'<worksheet xmlns="{_MAIN_NS}"><sheetData>').encode("utf-8")
+    for r, row in enumerate(_rows(df), start=1):
+        cells = []
+        for c, value in enumerate(row, start=1):
+            if value is None:
+                continue
+            ref = f"{get_column_letter(c)}{r}"
+            if isinstance(value, bool):
+                cells.append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+            elif isinstance(value, (int, float)):
+                cells.append(f'<c r="{ref}"><v>{value!r}</v></c>')
+            elif isinstance(value, TIME_TYPES):
+                style = time_styles[get_time_format(type(value))]
+                cells.append(f'<c r="{ref}" s="{style}"><v>{to_excel(value)!r}</v></c>')
+            else:
+                cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>')
+        yield f'<row r="{r}">{"".join(cells)}</row>'.encode("utf-8")
+    yield b"</sheetData></worksheet>"
+
+
+def _sheet_parts(zf):
+    """{sheet name: zip part path} from the workbook part and its relationships."""
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{{{_PKG_REL_NS}}}Relationship")}
+
+    parts = {}
+    for sheet in workbook.iter(f"{{{_MAIN_NS}}}sheet"):
+        target = targets[sheet.get(f"{{{_REL_NS}}}id")]
+        # Targets are relative to xl/ unless absolute
+        parts[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+    return parts
+
+
+def _replace_sheets(path, changed, props):
+    """
+    Rewrite the workbook zip with new XML for the changed sheets and new custom
+    properties (and date styles, if the stylesheet lacked them); every other
+    part is copied across unchanged.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp.xlsx"
+    with zipfile.ZipFile(path) as src, zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as dst:
+        parts = _sheet_parts(src)
+        replace = {parts[name]: df for name, df in changed.items()}
+        styles_xml, time_styles = _time_styles(src.read(STYLES_PART))
+        for item in src.infolist():
+            if item.filename in replace:
+                with dst.open(item.filename, "w") as out:
+                    for chunk in _sheet_xml(replace[item.filename], time_styles):
+                        out.write(chunk)
+            elif item.filename == CUSTOM_PROPS_PART:
+                dst.writestr(item, tostring(props.to_tree()))
+            elif item.filename == STYLES_PART and styles_xml is not None:
+                dst.writestr(item, styles_xml)
+            else:
+                with src.open(item) as data, dst.open(item, "w") as out:
+                    shutil.copyfileobj(data, out)
+    os.replace(tmp, path)
+
+
+def write_workbook(path, sheets):
+    """
+    Write {sheet name: DataFrame} to path (index=False, as every extractor does).
+    Returns False without touching the file when its contents would not change.
+    """
+    with tracing.span("write.xlsx", path=path, sheets=len(sheets)) as s:
+        written = _write_workbook(path, sheets, s)
+    return written
+
+
+def _write_workbook(path, sheets, s):
+    if not sheets:
+        print(f"Nothing to write: {path}")
+        return False
+
+    sheet_hashes = {name: sheet_hash(name, df) for name, df in sheets.items()}
+    digest = content_hash(sheets, sheet_hashes)
+    old_digest, old_sheet_hashes = stored_hashes(path)
+    if old_digest == digest:
+        print(f"Unchanged: {path}")
+        s.set(action="unchanged")
+        return False
+
+    props = _custom_props(digest, sheet_hashes)
+    if list(old_sheet_hashes) == list(sheet_hashes):
+        changed = {name: df for name, df in sheets.items() if old_sheet_hashes[name] != sheet_hashes[name]}
+        _replace_sheets(path, changed, props)
+        print(f"Replaced {len(changed)} of {len(sheets)} sheets: {path}")
+        s.set(action="replace", changed=len(changed))
+    else:
+        _write_full(path, sheets, props)
+        s.set(action="full")
+    return True